@@ -4,65 +4,90 @@ AI-to-AI Communication Template
 Use this template for sending instructions to Claude Desktop via MCP
 """
 
-import time
 import pyautogui as pg
 import pygetwindow as gw
-from pathlib import Path
+from answer_cache import AnswerCache
+from bridge_session import BridgeSession, unframe
+from bridge_spool import LOG_DIR, start_mirror, win_path
+from latency_stats import LatencyStats, ack_command, ack_path, wait_for_reply
+from send_timing import timer
 
 pg.FAILSAFE = False
 pg.PAUSE = 0.3
 
-def send_ai_message(question, log_filename, powershell_command=None):
-    """
-    Send a complete AI-to-AI message to Claude Desktop
-    
-    Args:
-        question (str): The question/task for Claude Desktop
-        log_filename (str): Name of log file for response  
-        powershell_command (str): Optional custom PowerShell command
-    """
-    
-    # Find Claude Desktop window
-    windows = gw.getAllWindows()
-    claude_window = None
+latency = LatencyStats()
+session = BridgeSession()
+cache = AnswerCache()
+pending = {}  # log filename -> what was asked, so monitor_response can cache the answer
+
+def focus_input(claude_window):
+    """Activate the window, click its input box and clear it"""
+    with timer.phase("activate"):
+        if claude_window.isMinimized:
+            claude_window.restore()
+            timer.sleep(0.5)
+        claude_window.activate()
+        timer.sleep(1)
     
-    for window in windows:
-        if window.visible and window.title and "claude" in window.title.lower():
-            if window.width > 500 and window.height > 400:
-                claude_window = window
-                break
+    input_x = claude_window.left + claude_window.width // 2
+    input_y = claude_window.top + claude_window.height - 80
+    with timer.phase("click", implied=pg.PAUSE):
+        pg.click(input_x, input_y)
+        timer.sleep(0.5)
     
-    if not claude_window:
-        print("❌ Claude Desktop window not found!")
-        return False
+    # Clear input
+    with timer.phase("clear", implied=2 * pg.PAUSE):
+        pg.hotkey('ctrl', 'a')
+        timer.sleep(0.2)
+        pg.press('backspace')
+        timer.sleep(0.5)
+
+def type_message(claude_window, message):
+    """Type one message into Claude Desktop and send it"""
+    focus_input(claude_window)
     
-    print(f"🎯 Found Claude Desktop: {claude_window.title}")
+    print(f"📝 Message length: {len(message)} characters")
     
-    # Activate window and focus input
-    claude_window.activate()
-    time.sleep(1)
+    # Type the ENTIRE message at once - DO NOT BREAK THIS UP
+    with timer.phase("type", implied=len(message) * 0.008 + pg.PAUSE):
+        pg.typewrite(message, interval=0.008)
+        timer.sleep(1)
     
-    input_x = claude_window.left + claude_window.width // 2
-    input_y = claude_window.top + claude_window.height - 80
-    pg.click(input_x, input_y)
-    time.sleep(0.5)
+    with timer.phase("send", implied=pg.PAUSE):
+        pg.press('enter')
+
+def ensure_handshake(claude_window):
+    """Send the protocol rules if this chat hasn't seen them yet"""
+    if not session.needs_handshake(claude_window):
+        return True
     
-    # Clear input
-    pg.hotkey('ctrl', 'a')
-    time.sleep(0.2)
-    pg.press('backspace')
-    time.sleep(0.5)
+    print("🤝 New chat - sending bridge protocol handshake...")
+    type_message(claude_window, session.handshake_message())
+    with timer.phase("confirm", wait=True):
+        confirmed = session.confirm(claude_window, stats=latency)
+    if not confirmed:
+        print("❌ Claude Desktop did not confirm the handshake")
+        return False
+    print("✅ Handshake confirmed")
+    return True
+
+def full_message(question, log_filename, log_path, powershell_command=None):
+    """Self-contained message with all the rules, for chats without a handshake"""
     
     # Default PowerShell command if not provided
     if not powershell_command:
-        powershell_command = f'Add-Content -Path "D:\\\\WarpAI_Portable\\\\logs\\\\{log_filename}" -Value "[your answer here]"'
+        powershell_command = f'Add-Content -Path "{win_path(log_filename)}" -Value "[your answer here]"'
     
     # Construct the complete message - CRITICAL: ALL IN ONE MESSAGE
-    complete_message = f"""Instructions:
+    return f"""Instructions:
+
+1. FIRST, before anything else, use Powershell-Tool to acknowledge:
 
-1. {question}
-2. Do NOT respond in this chat window at all
-3. Use ONLY the Powershell-Tool MCP to execute this exact command:
+{ack_command(ack_path(log_path))}
+
+2. {question}
+3. Do NOT respond in this chat window at all
+4. Use ONLY the Powershell-Tool MCP to execute this exact command:
 
 {powershell_command}
 
@@ -73,60 +98,138 @@ Requirements:
 - Execute the Powershell command immediately
 
 Execute the MCP Powershell command now."""
+
+def send_ai_message(question, log_filename, powershell_command=None, framed=True,
+                    task_type="question", use_cache=True):
+    """
+    Send an AI-to-AI message to Claude Desktop
     
-    print("⌨️ Typing complete message...")
-    print(f"📝 Message length: {len(complete_message)} characters")
+    Args:
+        question (str): The question/task for Claude Desktop
+        log_filename (str): Name of log file for response  
+        powershell_command (str): Optional custom PowerShell command
+        framed (bool): Use the session protocol (handshake once, then one-line requests);
+            False sends the full self-contained instructions every time
+        task_type (str): Latency and cache bucket; sets the cached answer's TTL
+        use_cache (bool): False always asks Claude Desktop (WARPAI_NO_CACHE=1 does the same globally)
+    """
     
-    # Type the ENTIRE message at once - DO NOT BREAK THIS UP
-    pg.typewrite(complete_message, interval=0.008)
-    time.sleep(1)
+    log_path = LOG_DIR / log_filename
+    # One timing record from here to the end of monitor_response; spans go to ~/.warpai/timing
+    record = timer.start("send_ai_message", task_type=task_type, log=log_filename, framed=framed)
+    with timer.phase("cache_lookup"):
+        cached = cache.get(question, powershell_command, log_filename) if use_cache else None
+    pending[log_filename] = {"question": question, "command": powershell_command, "framed": framed,
+                             "task_type": task_type, "cached": cached is not None, "timing": record}
+    if cached is not None:
+        # Same answer lands in the same log file, so readers of the log don't see a difference
+        log_path.parent.mkdir(parents=True, exist_ok=True)
+        log_path.write_text(cached, encoding='utf-8')
+        print("⚡ Cache hit - answer written to log without asking Claude Desktop")
+        timer.finish(record, "cached")
+        return True
+    
+    # Find Claude Desktop window
+    with timer.phase("find_window"):
+        windows = gw.getAllWindows()
+        claude_window = None
+        
+        for window in windows:
+            if window.visible and window.title and "claude" in window.title.lower():
+                if window.width > 500 and window.height > 400:
+                    claude_window = window
+                    break
+    
+    if not claude_window:
+        print("❌ Claude Desktop window not found!")
+        timer.finish(record, "no-window")
+        return False
+    
+    print(f"🎯 Found Claude Desktop: {claude_window.title}")
     
-    # Send the complete message
-    pg.press('enter')
+    if framed:
+        with timer.phase("handshake"):
+            ready = ensure_handshake(claude_window)
+        if not ready:
+            timer.finish(record, "no-handshake")
+            return False
     
-    print("✅ Complete message sent to Claude Desktop!")
+    # Clear the previous reply and ACK before sending, so the monitor can't race a fast reply
+    with timer.phase("clear_log"):
+        for path in (log_path, ack_path(log_path)):
+            if path.exists():
+                path.unlink()
+    
+    if framed:
+        message = session.frame(session.next_id(), log_filename, question, powershell_command)
+    else:
+        message = full_message(question, log_filename, log_path, powershell_command)
+    
+    print("⌨️ Typing message...")
+    type_message(claude_window, message)
+    
+    print("✅ Message sent to Claude Desktop!")
     return True
 
-def monitor_response(log_filename, timeout=60):
+def monitor_response(log_filename, timeout=60, task_type=None):
     """
     Monitor the log file for Claude Desktop's MCP response
     
     Args:
         log_filename (str): Name of log file to monitor
-        timeout (int): Seconds to wait for response
+        timeout (int): Upper bound in seconds; shortened from past latencies of task_type
+        task_type (str): Latency history bucket, e.g. "math" or "weather";
+            defaults to the one given to send_ai_message
     """
     
-    log_path = Path(f"D:/WarpAI_Portable/logs/{log_filename}")
+    log_path = LOG_DIR / log_filename
+    sent = pending.pop(log_filename, {"question": None, "task_type": "question", "cached": False})
+    task_type = task_type or sent["task_type"]
     
-    # Clear existing log
-    if log_path.exists():
-        log_path.unlink()
-        print("🗑️ Cleared existing log file")
+    if sent["cached"]:
+        content = log_path.read_text(encoding='utf-8').strip()
+        print(f"\n🎉 SUCCESS! Cached response:")
+        print(f"📝 {content}")
+        return True
     
     print(f"👁️ Monitoring: {log_path}")
     
-    start_time = time.time()
+    def read_reply():
+        try:
+            with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
+                return unframe(f.read().strip())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Error reading log: {e}")
+            return None
     
-    while time.time() - start_time < timeout:
-        time.sleep(2)
-        
-        if log_path.exists():
-            try:
-                with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read().strip()
-                
-                if content:
-                    print(f"\n🎉 SUCCESS! MCP Response received:")
-                    print(f"📝 {content}")
-                    return True
-                    
-            except Exception as e:
-                print(f"⚠️ Error reading log: {e}")
-        
-        elapsed = int(time.time() - start_time)
-        print(f"⏳ Waiting... {elapsed}s")
+    def progress(elapsed, acked):
+        print(f"⏳ Waiting... {elapsed}s" + (" (acknowledged)" if acked else ""))
+    
+    with timer.phase("wait_reply", wait=True, record=sent.get("timing")):
+        content, status = wait_for_reply(read_reply, task_type, timeout, read_ack=ack_path(log_path).exists,
+                                         stats=latency, progress=progress)
+    timer.finish(sent.get("timing"), status)
     
-    print(f"\n⏱️ Timeout ({timeout}s) - no MCP response")
+    if content:
+        print(f"\n🎉 SUCCESS! MCP Response received:")
+        print(f"📝 {content}")
+        if sent["question"]:
+            cache.put(sent["question"], content, sent["command"], log_filename, task_type)
+        return True
+    
+    if status == 'no-ack':
+        print("\n💀 No ACK - Claude Desktop never picked up the request")
+        # Most likely a new chat (same title) that hasn't seen the protocol; handshake again right away
+        session.invalidate()
+        if sent.get("framed") and not sent.get("resent"):
+            print("🔁 Re-sending after a new handshake...")
+            if send_ai_message(sent["question"], log_filename, sent["command"], task_type=task_type, use_cache=False):
+                pending[log_filename]["resent"] = True
+                return monitor_response(log_filename, timeout, task_type)
+    else:
+        print(f"\n⏱️ Timeout - no MCP response")
     return False
 
 # EXAMPLE USAGE FUNCTIONS
@@ -136,7 +239,7 @@ def test_simple_question():
     question = "What is 15 + 27?"
     log_file = "math_answer.log"
     
-    if send_ai_message(question, log_file):
+    if send_ai_message(question, log_file, task_type="math"):
         return monitor_response(log_file)
     return False
 
@@ -147,9 +250,9 @@ def test_weather_query():
     
     # Custom command that fetches weather and writes to log
     custom_cmd = f'''$weather = Invoke-RestMethod "http://wttr.in/NewYork?format=3"
-Add-Content -Path "D:\\\\WarpAI_Portable\\\\logs\\\\{log_file}" -Value "NYC Weather: $weather"'''
+Add-Content -Path "{win_path(log_file)}" -Value "NYC Weather: $weather"'''
     
-    if send_ai_message(question, log_file, custom_cmd):
+    if send_ai_message(question, log_file, custom_cmd, task_type="weather"):
         return monitor_response(log_file)
     return False
 
@@ -159,16 +262,32 @@ def test_file_operation():
     log_file = "directory_listing.log"
     
     custom_cmd = f'''$files = Get-ChildItem | Select-Object Name, Length | ConvertTo-Json
-Add-Content -Path "D:\\\\WarpAI_Portable\\\\logs\\\\{log_file}" -Value "Directory contents: $files"'''
+Add-Content -Path "{win_path(log_file)}" -Value "Directory contents: $files"'''
     
-    if send_ai_message(question, log_file, custom_cmd):
+    if send_ai_message(question, log_file, custom_cmd, task_type="file_operation"):
         return monitor_response(log_file)
     return False
 
+def test_parallel_questions():
+    """Example: several questions spread over every open Claude Desktop window"""
+    from bridge_pool import WorkerPool
+    
+    pool = WorkerPool(stats=latency)
+    for question in ["What is 15 + 27?", "Name three prime numbers", "What is the capital of Peru?"]:
+        pool.submit(question, task_type="math")
+    
+    results = pool.run()
+    for result in results:
+        print(f"[{result.worker}] {result.task.question} -> {result.reply or result.status}")
+    return all(result.reply for result in results)
+
 if __name__ == "__main__":
     print("🤖 AI-to-AI Communication Template")
     print("=" * 35)
     
+    # Replies land in the local spool; the mirror copies them to the USB drive in the background
+    start_mirror()
+    
     # Run a simple test
     print("Testing simple math question...")
     success = test_simple_question()
@@ -181,4 +300,6 @@ if __name__ == "__main__":
         print("- Claude Desktop is open") 
         print("- MCP server is running (uv run main.py)")
         print("- DXT extension is active")
-        print("- USB drive is accessible at D:\\WarpAI_Portable\\")
+        print(f"- Log directory is writable: {LOG_DIR} (WARPAI_LOG_DIR)")
+    
+    print(f"\n{timer.report()}")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Bridge Answer Cache
+Remembers answers to repeated bridge questions with per-entry TTLs, persisted to disk
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+# Default lifetime per task type; 0 means never cache (answers depend on live state)
+TTL_BY_TASK = {
+    'weather': 15 * 60,
+    'math': 30 * DAY,
+    'fact': 30 * DAY,
+    'question': DAY,
+    'file_operation': 0,
+}
+DEFAULT_TTL = HOUR
+
+
+def default_cache_path():
+    return Path(os.environ.get('WARPAI_ANSWER_CACHE', Path.home() / '.warpai' / 'answer_cache.json'))
+
+
+def normalize_question(text):
+    """Case-, whitespace- and trailing-punctuation-insensitive form of a question"""
+    text = re.sub(r'\s+', ' ', text.strip().lower())
+    text = re.sub(r'\s*([^\w\s])\s*', r'\1', text)  # '15 + 27' == '15+27'
+    return text.rstrip('?!.')
+
+
+def cache_key(question, command=None, log_filename=None):
+    # The reply file name is per-request plumbing, not part of what is being asked
+    template = (command or '').strip()
+    if log_filename:
+        template = template.replace(log_filename, '{log}')
+    return hashlib.sha1(f'{normalize_question(question)}\0{template}'.encode('utf-8')).hexdigest()
+
+
+class AnswerCache:
+    """
+    Question -> answer store keyed on the normalized question plus the
+    command template. Set WARPAI_NO_CACHE=1 (or bypass=True) to always ask.
+    """
+
+    def __init__(self, path=None, bypass=None):
+        self.path = Path(path) if path else default_cache_path()
+        self.bypass = os.environ.get('WARPAI_NO_CACHE') == '1' if bypass is None else bypass
+        self.entries = {}
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def _save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(temp_path, self.path)
+
+    def get(self, question, command=None, log_filename=None):
+        """Cached answer or None; expired entries are dropped on the way"""
+        if self.bypass:
+            return None
+        key = cache_key(question, command, log_filename)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry['expires'] <= time.time():
+                del self.entries[key]
+                self._save()
+                return None
+            return entry['answer']
+
+    def put(self, question, answer, command=None, log_filename=None, task_type='question', ttl=None):
+        ttl = TTL_BY_TASK.get(task_type, DEFAULT_TTL) if ttl is None else ttl
+        if ttl <= 0 or not answer:
+            return
+        with self._lock:
+            self.entries[cache_key(question, command, log_filename)] = {
+                'question': question, 'answer': answer, 'task_type': task_type,
+                'stored': time.time(), 'expires': time.time() + ttl}
+            self._save()
+
+    def purge(self):
+        """Drop every expired entry; returns how many were removed"""
+        now = time.time()
+        with self._lock:
+            expired = [key for key, entry in self.entries.items() if entry['expires'] <= now]
+            for key in expired:
+                del self.entries[key]
+            if expired:
+                self._save()
+        return len(expired)
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Installed Application Index
+Persistent Start Menu / registered app index with prefix and fuzzy lookup
+"""
+
+import json
+import os
+import re
+import subprocess
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from difflib import get_close_matches
+from pathlib import Path
+
+INDEX_VERSION = 1
+SHORTCUT_SUFFIXES = ('.lnk', '.url', '.appref-ms', '.exe')
+REGISTERED_TTL = 24 * 60 * 60  # Get-StartApps is slow, refresh it at most daily
+MISS_REFRESH_INTERVAL = 30.0   # A lookup miss re-lists changed Start Menu folders at most this often
+
+
+@dataclass(frozen=True)
+class AppEntry:
+    name: str
+    path: str = ''
+    app_id: str = ''
+
+    @property
+    def source(self):
+        return 'shortcut' if self.path else 'registered'
+
+
+def normalize(name):
+    """Lowercase, drop punctuation and collapse whitespace"""
+    return ' '.join(re.sub(r'[^0-9a-z]+', ' ', name.lower()).split())
+
+
+def fold(name):
+    """Case-folded name with punctuation kept, so Notepad++ and C# stay distinct"""
+    return ' '.join(name.casefold().split())
+
+
+def default_roots():
+    roots = []
+    for variable in ('ProgramData', 'APPDATA'):
+        base = os.environ.get(variable)
+        if base:
+            roots.append(os.path.join(base, 'Microsoft', 'Windows', 'Start Menu', 'Programs'))
+    return roots
+
+
+def default_index_path():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(Path.home(), '.cache')
+    return os.path.join(base, 'windows-mcp', 'app_index.json')
+
+
+def get_start_apps():
+    """Registered apps (including UWP/Store apps) as (name, app_id) pairs"""
+    if os.name != 'nt':
+        return []
+    command = 'Get-StartApps | Select-Object Name, AppID | ConvertTo-Json -Compress'
+    completed = subprocess.run(['powershell', '-NoProfile', '-Command', command],
+                               capture_output=True, text=True, timeout=30)
+    if completed.returncode != 0 or not completed.stdout.strip():
+        return []
+    apps = json.loads(completed.stdout)
+    if isinstance(apps, dict):
+        apps = [apps]
+    return [(app['Name'], app['AppID']) for app in apps if app.get('Name') and app.get('AppID')]
+
+
+class AppIndex:
+    """
+    Index of launchable applications keyed by normalized name.
+
+    Start Menu directories are tracked individually with their mtimes; a
+    refresh re-lists only directories whose mtime changed (new, removed or
+    renamed shortcuts always touch the parent directory). Registered apps come
+    from Get-StartApps and are re-queried once REGISTERED_TTL has passed.
+    The index is read from disk on first use, never at import time, and a
+    lookup with no exact or prefix match triggers one incremental refresh
+    (at most every MISS_REFRESH_INTERVAL seconds) so newly installed apps are
+    found without a restart.
+    """
+
+    def __init__(self, roots=None, index_path=None, registered=get_start_apps):
+        self.roots = [os.path.normpath(root) for root in (default_roots() if roots is None else roots)]
+        self.index_path = index_path or default_index_path()
+        self.registered = registered
+        self.dirs = {}
+        self.registered_apps = []
+        self.registered_at = 0.0
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._keys = []
+        self._by_key = {}
+        self._by_name = {}
+        self._miss_refreshed = 0.0
+
+    # Persistence
+
+    def _read(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION:
+            return
+        self.dirs = data.get('dirs', {})
+        self.registered_apps = [tuple(app) for app in data.get('registered', {}).get('apps', [])]
+        self.registered_at = data.get('registered', {}).get('refreshed', 0.0)
+
+    def save(self):
+        data = {
+            'version': INDEX_VERSION,
+            'dirs': self.dirs,
+            'registered': {'refreshed': self.registered_at, 'apps': self.registered_apps},
+        }
+        os.makedirs(os.path.dirname(self.index_path) or '.', exist_ok=True)
+        temp_path = f'{self.index_path}.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(temp_path, self.index_path)
+
+    def ensure_loaded(self):
+        """Load from disk and bring the index up to date on first use"""
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                self._read()
+                self._refresh_locked()
+                self._loaded = True
+
+    # Refresh
+
+    def _scan_dir(self, path, mtime):
+        apps, subdirs = [], []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.lower().endswith(SHORTCUT_SUFFIXES):
+                    apps.append([os.path.splitext(entry.name)[0], entry.path])
+        self.dirs[path] = {'mtime': mtime, 'subdirs': subdirs, 'apps': apps}
+        return subdirs
+
+    def refresh(self, force_registered=False):
+        """Re-list changed directories only; returns the number of directories re-listed"""
+        with self._lock:
+            return self._refresh_locked(force_registered)
+
+    def _refresh_locked(self, force_registered=False):
+        rescanned = 0
+        seen = set()
+        pending = list(self.roots)
+        while pending:
+            path = pending.pop()
+            if path in seen:
+                continue
+            seen.add(path)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            known = self.dirs.get(path)
+            if known and known['mtime'] == mtime:
+                pending.extend(known['subdirs'])
+                continue
+            pending.extend(self._scan_dir(path, mtime))
+            rescanned += 1
+
+        removed = [path for path in self.dirs if path not in seen]
+        for path in removed:
+            del self.dirs[path]
+
+        registered_changed = False
+        if self.registered and (force_registered or time.time() - self.registered_at > REGISTERED_TTL):
+            self.registered_apps = [tuple(app) for app in self.registered()]
+            self.registered_at = time.time()
+            registered_changed = True
+
+        if rescanned or removed or registered_changed or not self._keys:
+            self._rebuild_lookup()
+            self.save()
+        return rescanned
+
+    def _rebuild_lookup(self):
+        by_key = {}
+        for name, app_id in self.registered_apps:
+            by_key.setdefault(normalize(name), []).append(AppEntry(name, app_id=app_id))
+        for info in self.dirs.values():
+            for name, path in info['apps']:
+                by_key.setdefault(normalize(name), []).append(AppEntry(name, path=path))
+        by_name = {}
+        for key, entries in by_key.items():
+            # Within a key, a name that normalizes to itself (Notepad, not Notepad++) goes first,
+            # then Start Menu shortcuts ahead of registered apps, then by name for a stable order
+            entries.sort(key=lambda entry: (fold(entry.name) != key, entry.source != 'shortcut', entry.name))
+            for entry in entries:
+                by_name.setdefault(fold(entry.name), []).append(entry)
+        self._by_key = by_key
+        self._by_name = by_name
+        self._keys = sorted(key for key in by_key if key)
+
+    # Lookup
+
+    def __len__(self):
+        self.ensure_loaded()
+        return len(self._keys)
+
+    def lookup(self, name, limit=5):
+        """Best matches: exact name, exact key, then prefix, then word/substring, then fuzzy"""
+        self.ensure_loaded()
+        matches, strong = self._match(name, limit)
+        if not strong and time.monotonic() - self._miss_refreshed >= MISS_REFRESH_INTERVAL:
+            self._miss_refreshed = time.monotonic()
+            if self.refresh():
+                matches, _ = self._match(name, limit)
+        return matches
+
+    def _match(self, name, limit):
+        """(entries, strong) where strong means an exact or prefix match was found"""
+        query, folded = normalize(name), fold(name)
+        if not query:
+            return list(self._by_name.get(folded, []))[:limit], folded in self._by_name
+        keys, ranked = self._keys, []
+
+        def take(key):
+            if key not in ranked:
+                ranked.append(key)
+
+        if query in self._by_key:
+            take(query)
+        start = bisect_left(keys, query)
+        prefixed = []
+        for key in keys[start:]:
+            if not key.startswith(query):
+                break
+            prefixed.append(key)
+        for key in sorted(prefixed, key=len):
+            take(key)
+        strong = bool(ranked) or folded in self._by_name
+        if len(ranked) < limit:
+            # Substring hits, word-start matches ("code" in "visual studio code") first
+            hits = [key for key in keys if query in key]
+            for key in sorted(hits, key=lambda key: (f' {query}' not in f' {key}', len(key))):
+                take(key)
+        if len(ranked) < limit:
+            for key in get_close_matches(query, keys, n=limit, cutoff=0.6):
+                take(key)
+        results = list(self._by_name.get(folded, []))
+        for key in ranked:
+            for entry in self._by_key[key]:
+                if entry not in results:
+                    results.append(entry)
+        return results[:limit], strong
+
+    def resolve(self, name):
+        matches = self.lookup(name, limit=1)
+        return matches[0] if matches else None
+
+
+def launch(entry):
+    """Start an indexed application; returns 0 on success like Desktop.launch_app"""
+    try:
+        if entry.path:
+            os.startfile(entry.path)
+        else:
+            subprocess.Popen(['explorer.exe', f'shell:AppsFolder\\{entry.app_id}'])
+    except OSError:
+        return 1
+    return 0
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+State-Tool Encoding Benchmark
+Reports output size and formatting time for verbose and compact modes on the same snapshots
+"""
+
+import time
+
+from bench_tree_compact import APPS, build_compact, synthetic_rows
+from state_encoding import encode_compact, encode_verbose, estimate_tokens
+
+SIZES = (500, 5_000, 50_000)
+BUDGETS = (None, 4_000, 1_000)
+CURSOR = (960, 540)
+
+
+def timed(encode, repeat=3):
+    best, text = float('inf'), ''
+    for _ in range(repeat):
+        start = time.perf_counter()
+        text = encode()
+        best = min(best, time.perf_counter() - start)
+    return text, best
+
+
+def main():
+    apps_text = '\n'.join(f'{index + 1} - App Name: {app} Depth: 0 Status: Normal' for index, app in enumerate(APPS))
+    active_text = f'App Name: {APPS[0]} Depth: 0 Status: Maximized'
+
+    print("📦 STATE-TOOL ENCODING BENCHMARK")
+    print("=" * 72)
+    print(f"{'elements':>9} {'mode':>16} {'chars':>10} {'~tokens':>9} {'ratio':>7} {'format ms':>10}")
+    for size in SIZES:
+        tree = build_compact(synthetic_rows(size))
+        verbose, verbose_time = timed(lambda: encode_verbose(tree, apps_text, active_text))
+        print(f"{size:>9} {'verbose':>16} {len(verbose):>10} {estimate_tokens(verbose):>9} {1.0:>7.2f} {verbose_time * 1000:>10.1f}")
+        for budget in BUDGETS:
+            compact, compact_time = timed(lambda: encode_compact(tree, APPS, APPS[0], CURSOR, max_tokens=budget))
+            mode = 'compact' if budget is None else f'compact/{budget}'
+            print(f"{size:>9} {mode:>16} {len(compact):>10} {estimate_tokens(compact):>9} "
+                  f"{len(compact) / len(verbose):>7.2f} {compact_time * 1000:>10.1f}")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Tree Storage Benchmark
+Compares dataclass element nodes against CompactTree at 10k, 50k and 100k nodes,
+and times the State-Tool formatting paths on a TreeState-shaped snapshot
+"""
+
+import gc
+import random
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+
+from state_encoding import encode_compact, encode_verbose
+from tree_compact import CompactTree, TreeStateView
+
+SIZES = (10_000, 50_000, 100_000)
+APPS = ['Google Chrome', 'Visual Studio Code', 'File Explorer', 'Windows Terminal', 'Claude']
+CONTROL_TYPES = ['Button', 'Edit', 'Hyperlink', 'ListItem', 'MenuItem', 'TabItem', 'CheckBox', 'TreeItem']
+NAMES = ['Close', 'Minimize', 'Maximize', 'Back', 'Forward', 'Reload', 'Search', 'Settings', 'File', 'Edit']
+
+
+@dataclass
+class Center:
+    x: int
+    y: int
+
+    def to_string(self):
+        return f'({self.x},{self.y})'
+
+
+@dataclass
+class TreeElementNode:
+    name: str
+    control_type: str
+    shortcut: str
+    center: Center
+    app_name: str
+
+
+@dataclass
+class TextElementNode:
+    name: str
+    app_name: str
+
+
+@dataclass
+class ScrollElementNode:
+    name: str
+    control_type: str
+    app_name: str
+    center: Center
+    horizontal_scrollable: bool
+    vertical_scrollable: bool
+
+
+@dataclass
+class TreeState:
+    """Same shape and formatters as src.desktop's TreeState, which is what State-Tool receives"""
+    interactive_nodes: list = field(default_factory=list)
+    informative_nodes: list = field(default_factory=list)
+    scrollable_nodes: list = field(default_factory=list)
+
+    def interactive_elements_to_string(self):
+        return '\n'.join([f'Label: {index} App Name: {node.app_name} ControlType: {node.control_type} Control Name: {node.name} Shortcut: {node.shortcut} Cordinates: {node.center.to_string()}' for index, node in enumerate(self.interactive_nodes)])
+
+    def informative_elements_to_string(self):
+        return '\n'.join([f'App Name: {node.app_name} Name: {node.name}' for node in self.informative_nodes])
+
+    def scrollable_elements_to_string(self):
+        n = len(self.interactive_nodes)
+        return '\n'.join([f'Label: {n + index} App Name: {node.app_name} ControlType: {node.control_type} Control Name: {node.name} Cordinates: {node.center.to_string()} Horizontal Scrollable: {node.horizontal_scrollable} Vertical Scrollable: {node.vertical_scrollable}' for index, node in enumerate(self.scrollable_nodes)])
+
+
+def synthetic_rows(count, seed=7):
+    """Rows shaped like a browser/IDE tree: repeated names plus unique link texts"""
+    rng = random.Random(seed)
+    rows = []
+    for index in range(count):
+        name = rng.choice(NAMES) if rng.random() < 0.5 else f'Item {index} of the document outline'
+        rows.append((rng.choice(APPS), rng.choice(CONTROL_TYPES), name, '',
+                     rng.randrange(0, 1920), rng.randrange(0, 1080)))
+    return rows
+
+
+def build_dataclasses(rows):
+    interactive, informative, scrollable = [], [], []
+    for index, (app, ctype, name, shortcut, x, y) in enumerate(rows):
+        bucket = index % 10
+        if bucket < 6:
+            interactive.append(TreeElementNode(name, ctype, shortcut, Center(x, y), app))
+        elif bucket < 9:
+            informative.append(TextElementNode(name, app))
+        else:
+            scrollable.append(ScrollElementNode(name, ctype, app, Center(x, y), False, True))
+    return TreeState(interactive, informative, scrollable)
+
+
+def format_dataclasses(tree_state):
+    return (tree_state.interactive_elements_to_string(),
+            tree_state.informative_elements_to_string(),
+            tree_state.scrollable_elements_to_string())
+
+
+def build_compact(rows):
+    tree = CompactTree()
+    for index, (app, ctype, name, shortcut, x, y) in enumerate(rows):
+        bucket = index % 10
+        if bucket < 6:
+            tree.add_interactive(app, ctype, name, shortcut, x, y)
+        elif bucket < 9:
+            tree.add_informative(app, name)
+        else:
+            tree.add_scrollable(app, ctype, name, x, y, False, True)
+    return tree
+
+
+def format_compact(tree):
+    return (tree.interactive_elements_to_string(),
+            tree.informative_elements_to_string(),
+            tree.scrollable_elements_to_string())
+
+
+def measure(build, fmt, rows, repeat=3):
+    """Return (storage bytes, best format seconds, format peak bytes)"""
+    storage = build(rows)
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fmt(storage)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    del storage
+
+    # Memory is traced in a separate pass so tracemalloc overhead stays out of the timings
+    gc.collect()
+    tracemalloc.start()
+    storage = build(rows)
+    storage_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    output = fmt(storage)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del output, storage
+    return storage_bytes, elapsed, peak - before
+
+
+def measure_path(encode, tree_state, repeat=3):
+    """Return (best seconds, peak bytes) for one State-Tool formatting path over an existing snapshot"""
+    elapsed = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        encode(tree_state)
+        elapsed = min(elapsed, time.perf_counter() - start)
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    output = encode(tree_state)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del output
+    return elapsed, peak - before
+
+
+def state_tool_paths():
+    """The formats State-Tool returns, from the TreeState it gets, with and without a CompactTree conversion"""
+    apps, active = '\n'.join(APPS), APPS[0]
+    return (
+        ('verbose', lambda ts: encode_verbose(ts, apps, active)),
+        ('convert+verbose', lambda ts: encode_verbose(CompactTree.from_tree_state(ts), apps, active)),
+        ('compact', lambda ts: encode_compact(TreeStateView(ts), APPS, active, (960, 540))),
+        ('convert+compact', lambda ts: encode_compact(CompactTree.from_tree_state(ts), APPS, active, (960, 540))),
+    )
+
+
+def main():
+    print("🌳 TREE STORAGE BENCHMARK")
+    print("=" * 78)
+    print(f"{'nodes':>8} {'layout':>11} {'storage MB':>11} {'format ms':>10} {'format peak MB':>15}")
+    for size in SIZES:
+        rows = synthetic_rows(size)
+        for label, build, fmt in (('dataclass', build_dataclasses, format_dataclasses),
+                                  ('compact', build_compact, format_compact)):
+            storage, elapsed, peak = measure(build, fmt, rows)
+            print(f"{size:>8} {label:>11} {storage / 1e6:>11.2f} {elapsed * 1000:>10.1f} {peak / 1e6:>15.2f}")
+    print("=" * 78)
+
+    print("\n🧾 STATE-TOOL PATHS (snapshot already built, as in production)")
+    print("=" * 78)
+    print(f"{'nodes':>8} {'path':>16} {'ms':>10} {'peak MB':>10}")
+    for size in SIZES:
+        tree_state = build_dataclasses(synthetic_rows(size))
+        for label, encode in state_tool_paths():
+            elapsed, peak = measure_path(encode, tree_state)
+            print(f"{size:>8} {label:>16} {elapsed * 1000:>10.1f} {peak / 1e6:>10.2f}")
+    print("=" * 78)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Bridge Worker Pool
+Fans queued questions out to every open Claude Desktop window, one worker per window
+
+Usage:
+    python bridge_pool.py "What is 15 + 27?" "Name three primes" "Capital of Peru?"
+"""
+
+import itertools
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pygetwindow as gw
+
+from ai_to_ai_template import type_message
+from bridge_session import LOG_DIR, BridgeSession, default_state_path, unframe
+from latency_stats import LatencyStats, ack_path, wait_for_reply
+
+MAX_ATTEMPTS = 2
+
+
+def discover_windows(keywords=('claude',)):
+    """Every visible, chat-sized window whose title contains one of keywords"""
+    found = []
+    for window in gw.getAllWindows():
+        if window.visible and window.title and any(word in window.title.lower() for word in keywords):
+            if window.width > 500 and window.height > 400:
+                found.append(window)
+    return found
+
+
+@dataclass
+class BridgeTask:
+    question: str
+    command: str = None
+    task_type: str = 'question'
+    timeout: float = 60
+    attempts: int = 0
+    failed_on: set = field(default_factory=set)  # Workers whose chat did not ACK this task
+    id: int = field(default_factory=itertools.count(1).__next__)
+
+
+@dataclass
+class TaskResult:
+    task: BridgeTask
+    worker: str
+    reply: str
+    status: str
+    seconds: float
+
+
+class Worker:
+    """One Claude Desktop chat: its own handshake state and its own reply files"""
+
+    def __init__(self, worker_id, window, log_dir):
+        self.id = worker_id
+        self.window = window
+        self.log_dir = Path(log_dir)
+        state_path = default_state_path()
+        self.session = BridgeSession(log_dir, state_path.with_name(f'{state_path.stem}_{worker_id}.json'))
+
+    def reply_path(self, request_id):
+        return self.log_dir / f'{request_id}.log'
+
+
+class WorkerPool:
+    """
+    Dispatches queued BridgeTasks to idle workers.
+
+    Keyboard and mouse go to one window at a time, so typing is serialized
+    through input_lock; the lock is released before waiting, so the remote
+    side of every worker thinks and answers in parallel.
+
+    A chat that never acknowledges a task is handshaken again at once (a new
+    chat keeps the window title) and the task requeued; a chat that won't
+    confirm the handshake is retired and its task retried only by a
+    different worker. Workers leave once nothing left is theirs to take and
+    no running task can come back.
+    """
+
+    def __init__(self, windows=None, log_dir=LOG_DIR, stats=None):
+        windows = discover_windows() if windows is None else windows
+        self.workers = [Worker(f'w{number}', window, log_dir) for number, window in enumerate(windows, 1)]
+        self.stats = stats or LatencyStats()
+        self.tasks = []
+        self.results = []
+        self.input_lock = threading.Lock()
+        self._results_lock = threading.Lock()
+        self._tasks_changed = threading.Condition()
+        self._running = 0
+        self._live = set()
+        self.input_seconds = 0.0
+
+    def submit(self, question, command=None, task_type='question', timeout=60):
+        task = BridgeTask(question, command, task_type, timeout)
+        with self._tasks_changed:
+            self.tasks.append(task)
+            self._tasks_changed.notify_all()
+        return task
+
+    def _take(self, worker):
+        """Next task this worker may run, or None when it has nothing left to wait for"""
+        with self._tasks_changed:
+            while True:
+                for index, task in enumerate(self.tasks):
+                    if worker.id not in task.failed_on:
+                        self._running += 1
+                        return self.tasks.pop(index)
+                if not self._running:
+                    self._live.discard(worker.id)
+                    return None
+                self._tasks_changed.wait()
+
+    def _done(self, worker, task=None, retire=False):
+        """Finish the worker's current task, putting task back in the queue if given"""
+        with self._tasks_changed:
+            self._running -= 1
+            if retire:
+                self._live.discard(worker.id)
+            if task is not None:
+                self.tasks.append(task)
+            self._tasks_changed.notify_all()
+
+    def _retry_elsewhere(self, worker, task):
+        with self._tasks_changed:
+            task.failed_on.add(worker.id)
+            return task.attempts < MAX_ATTEMPTS and bool(self._live - task.failed_on)
+
+    def _inject(self, worker, text):
+        with self.input_lock:
+            start = time.perf_counter()
+            type_message(worker.window, text)
+            self.input_seconds += time.perf_counter() - start
+
+    def _handshake(self, worker):
+        if not worker.session.needs_handshake(worker.window):
+            return True
+        print(f"🤝 [{worker.id}] Sending protocol handshake...")
+        self._inject(worker, worker.session.handshake_message())
+        return worker.session.confirm(worker.window, stats=self.stats)
+
+    def _run_task(self, worker, task):
+        request_id = f'{worker.id}-{worker.session.next_id()}'
+        reply_path = worker.reply_path(request_id)
+        for path in (reply_path, ack_path(reply_path)):
+            if path.exists():
+                path.unlink()
+
+        start = time.perf_counter()
+        self._inject(worker, worker.session.frame(request_id, reply_path, task.question, task.command))
+        print(f"📤 [{worker.id}] {request_id}: {task.question[:50]}")
+
+        def read_reply():
+            try:
+                with open(reply_path, 'r', encoding='utf-8', errors='ignore') as f:
+                    return unframe(f.read().strip()) or None
+            except OSError:
+                return None
+
+        reply, status = wait_for_reply(read_reply, task.task_type, task.timeout,
+                                       read_ack=ack_path(reply_path).exists, stats=self.stats)
+        return TaskResult(task, worker.id, reply, status, time.perf_counter() - start)
+
+    def _worker_loop(self, worker):
+        while True:
+            task = self._take(worker)
+            if task is None:
+                return
+            requeue, retire = None, False
+            try:
+                if not self._handshake(worker):
+                    print(f"❌ [{worker.id}] Handshake not confirmed, worker retired")
+                    requeue, retire = task, True
+                    return
+                task.attempts += 1
+                result = self._run_task(worker, task)
+                if result.status == 'no-ack':
+                    # Usually a new chat under the same title: handshake it again right away, and
+                    # only if it still won't follow the protocol hand the task to another worker
+                    worker.session.invalidate()
+                    if self._handshake(worker):
+                        if task.attempts < MAX_ATTEMPTS:
+                            requeue = task
+                            continue
+                    else:
+                        print(f"❌ [{worker.id}] Handshake not confirmed, worker retired")
+                        retire = True
+                        if self._retry_elsewhere(worker, task):
+                            requeue = task
+                            return
+                with self._results_lock:
+                    self.results.append(result)
+                mark = "✅" if result.reply else "❌"
+                print(f"{mark} [{worker.id}] task {task.id} {result.status} in {result.seconds:.1f}s")
+                if retire:
+                    return
+            finally:
+                self._done(worker, requeue, retire)
+
+    def run(self):
+        """Drain the queue with one thread per worker; returns results in task order"""
+        if not self.workers:
+            raise RuntimeError('No Claude Desktop windows found')
+        self._live = {worker.id for worker in self.workers}
+        threads = [threading.Thread(target=self._worker_loop, args=(worker,), name=worker.id, daemon=True)
+                   for worker in self.workers]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Left over only if the workers that could still take them retired
+        for task in self.tasks:
+            self.results.append(TaskResult(task, None, None, 'no-worker', 0.0))
+        self.tasks = []
+        return sorted(self.results, key=lambda result: result.task.id)
+
+
+def main():
+    questions = sys.argv[1:] or ["What is 15 + 27?", "Name three prime numbers", "What is the capital of Peru?"]
+    pool = WorkerPool()
+    print(f"🧵 BRIDGE WORKER POOL - {len(pool.workers)} Claude Desktop window(s)")
+    for worker in pool.workers:
+        print(f"   {worker.id}: {worker.window.title}")
+    print("=" * 50)
+
+    for question in questions:
+        pool.submit(question)
+    start = time.perf_counter()
+    results = pool.run()
+    elapsed = time.perf_counter() - start
+
+    print("=" * 50)
+    for result in results:
+        print(f"[{result.worker}] {result.task.question[:40]:<40} -> {result.reply or result.status}")
+    print(f"\n⏱️ {len(results)} tasks in {elapsed:.1f}s ({pool.input_seconds:.1f}s holding the input lock)")
+
+
+if __name__ == "__main__":
+    main()
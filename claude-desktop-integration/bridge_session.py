@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Bridge Session Protocol
+Sends the reply rules to Claude Desktop once per chat, then frames requests as short one-liners
+"""
+
+import json
+import os
+import re
+import time
+import uuid
+from pathlib import Path, PureWindowsPath
+
+from bridge_spool import LOG_DIR
+from latency_stats import wait_for_reply
+
+SESSION_LOG = 'bridge_session.log'
+HANDSHAKE_TIMEOUT = 60
+
+FRAME_ID = re.compile(r'^#\S+\s+')
+
+
+def default_state_path():
+    return Path(os.environ.get('WARPAI_BRIDGE_SESSION', Path.home() / '.warpai' / 'bridge_session.json'))
+
+
+def unframe(content):
+    """Strip the '#<id> ' prefix the protocol puts in front of answers"""
+    return FRAME_ID.sub('', content, count=1)
+
+
+class BridgeSession:
+    """
+    Handshake state for one Claude Desktop chat.
+
+    The protocol rules are typed once; after the remote confirms with READY,
+    each request is a framed line '#<id> > <reply path> :: <task>', the reply
+    path in full so the remote never resolves it against its own directory.
+    The state is kept on disk so short-lived sender scripts share it, and is
+    tied to the chat window (handle + title). A new chat in the same window
+    usually keeps the title, so senders treat a missing ACK the same way:
+    invalidate, handshake again right away and resend.
+    """
+
+    def __init__(self, log_dir=LOG_DIR, state_path=None):
+        self.log_dir = Path(log_dir)
+        self.state_path = Path(state_path) if state_path else default_state_path()
+        self.state = {'chat': None, 'session': None, 'seq': 0}
+        self.pending = None
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                self.state.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    def _save(self):
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f)
+
+    def _win_path(self, filename):
+        return PureWindowsPath(str(self.log_dir / filename))
+
+    @staticmethod
+    def chat_key(window):
+        return f"{getattr(window, '_hWnd', None)}:{window.title}"
+
+    def needs_handshake(self, window):
+        return self.state['session'] is None or self.state['chat'] != self.chat_key(window)
+
+    def invalidate(self):
+        """Forget the handshake, e.g. after a framed request was never acknowledged"""
+        self.state['session'] = None
+        self._save()
+
+    def handshake_message(self):
+        self.pending = uuid.uuid4().hex[:8]
+        return f"""WARP BRIDGE PROTOCOL - read once, applies to every later message in this chat.
+
+Later messages look like:  #<id> > <reply-file> :: <task>
+<reply-file> is always a full path (normally in {PureWindowsPath(str(self.log_dir))}\\) - use it exactly as given.
+
+For each such message:
+1. FIRST run with Powershell-Tool: Add-Content -Path "<reply-file>.ack" -Value "ACK #<id>"
+2. Do the task.
+3. Write the answer with Powershell-Tool: Add-Content -Path "<reply-file>" -Value "#<id> <answer>"
+   If the message has a RUN: line, execute that exact command instead of step 3.
+
+Never answer in this chat window - ONLY use the Powershell-Tool.
+
+Confirm now with Powershell-Tool: Add-Content -Path "{self._win_path(SESSION_LOG)}" -Value "READY {self.pending}\""""
+
+    def confirm(self, window, timeout=HANDSHAKE_TIMEOUT, stats=None, progress=None):
+        """Wait for the READY line of the handshake just sent; on success the chat is marked"""
+        session_log = self.log_dir / SESSION_LOG
+        marker = f'READY {self.pending}'
+
+        def read_ready():
+            try:
+                with open(session_log, 'r', encoding='utf-8', errors='ignore') as f:
+                    return marker if marker in f.read() else None
+            except OSError:
+                return None
+
+        ready, _ = wait_for_reply(read_ready, 'handshake', timeout, stats=stats, progress=progress)
+        if not ready:
+            return False
+        self.state.update(chat=self.chat_key(window), session=self.pending, since=time.time())
+        self._save()
+        return True
+
+    def next_id(self, prefix='q'):
+        self.state['seq'] += 1
+        self._save()
+        return f"{prefix}{self.state['seq']}"
+
+    def frame(self, request_id, reply_file, task, command=None):
+        """
+        Compact request line; reply_file is a name in log_dir or a full path and
+        is sent as a full Windows path. command becomes a RUN: line replacing
+        the default answer write.
+        """
+        message = f"#{request_id} > {self._win_path(reply_file)} :: {task}"
+        if command:
+            message += f"\nRUN: {command}"
+        return message
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Bridge Log Spool
+Replies land in a fast local directory; a background mirror ships compressed segments to the USB log path
+
+Usage:
+    python bridge_spool.py mirror              # run the mirror until Ctrl+C
+    python bridge_spool.py flush               # ship whatever is pending once
+    python bridge_spool.py unpack OUT_DIR      # rebuild the log files from the USB segments
+"""
+
+import atexit
+import base64
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path, PureWindowsPath
+
+
+def default_spool_dir():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(Path.home(), '.cache')
+    return Path(base) / 'warpai' / 'logs'
+
+
+# Where Claude Desktop writes replies and where the senders poll them
+LOG_DIR = Path(os.environ.get('WARPAI_LOG_DIR') or default_spool_dir())
+# Portable copy on the USB drive; set WARPAI_MIRROR_DIR= (empty) to turn mirroring off
+MIRROR_DIR = os.environ.get('WARPAI_MIRROR_DIR', 'D:/WarpAI_Portable/logs')
+MIRROR_INTERVAL = 5.0
+CHECKPOINT = '.mirror_checkpoint.json'
+
+
+HEAD_BYTES = 64
+
+
+def file_id(stat):
+    # Inode plus creation time where the platform has one; st_ctime is a change time on POSIX
+    return f"{stat.st_ino}:{getattr(stat, 'st_birthtime_ns', '')}"
+
+
+def log_path(filename):
+    return LOG_DIR / filename
+
+
+def win_path(filename):
+    """Windows form of a spool file path, for Add-Content commands typed into Claude Desktop"""
+    return str(PureWindowsPath(str(LOG_DIR / filename)))
+
+
+class LogMirror:
+    """
+    Copies bytes appended to spool files into gzip segments on the mirror
+    directory. A checkpoint of per-file offsets (plus identity and first
+    bytes, since the senders delete and recreate reply files) is saved only after a
+    segment is safely renamed into place, so a crash re-sends at most the
+    last batch instead of losing it.
+    """
+
+    def __init__(self, spool_dir=None, mirror_dir=None, interval=MIRROR_INTERVAL):
+        self.spool_dir = Path(spool_dir or LOG_DIR)
+        self.mirror_dir = Path(mirror_dir) if mirror_dir is not None else (Path(MIRROR_DIR) if MIRROR_DIR else None)
+        self.interval = interval
+        self.checkpoint_path = self.spool_dir / CHECKPOINT
+        self.checkpoint = self._load_checkpoint()
+        self._stop = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._failing = None  # Last error reported by the mirror thread
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_checkpoint(self):
+        temp_path = self.checkpoint_path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.checkpoint, f)
+        os.replace(temp_path, self.checkpoint_path)
+
+    def pending(self):
+        """[(name, file id, head, offset, data)] for every spool file that grew since the checkpoint"""
+        batch = []
+        for path in sorted(self.spool_dir.iterdir()):
+            if not path.is_file() or path.name.startswith('.'):
+                continue
+            stat = path.stat()
+            seen = self.checkpoint.get(path.name, {})
+            offset = seen.get('offset', 0)
+            with open(path, 'rb') as f:
+                # A recreated file can reuse the inode, so its first bytes must match too
+                head = bytes.fromhex(seen.get('head', ''))
+                if seen.get('id') != file_id(stat) or stat.st_size < offset or f.read(len(head)) != head:
+                    offset, head = 0, b''  # Recreated or truncated: ship it from the start
+                if stat.st_size == offset:
+                    continue
+                f.seek(offset)
+                data = f.read()
+            batch.append((path.name, file_id(stat), head or data[:HEAD_BYTES], offset, data))
+        return batch
+
+    def flush(self):
+        """Ship one segment with everything new; returns the number of bytes mirrored"""
+        if self.mirror_dir is None or not self.spool_dir.exists():
+            return 0
+        with self._lock:
+            batch = self.pending()
+            if not batch:
+                return 0
+            self.mirror_dir.mkdir(parents=True, exist_ok=True)
+            segment = self.mirror_dir / f'segment-{time.strftime("%Y%m%d-%H%M%S")}-{time.time_ns() % 10**9:09d}.jsonl.gz'
+            temp_path = segment.with_suffix('.tmp')
+            with gzip.open(temp_path, 'wt', encoding='utf-8') as f:
+                for name, _, _, offset, data in batch:
+                    # Raw bytes, not text: PowerShell 5.1 writes ANSI, and any re-encoding would shift the offsets
+                    f.write(json.dumps({'file': name, 'offset': offset,
+                                        'b64': base64.b64encode(data).decode('ascii')}) + '\n')
+            os.replace(temp_path, segment)
+            for name, identity, head, offset, data in batch:
+                self.checkpoint[name] = {'id': identity, 'head': head.hex(), 'offset': offset + len(data)}
+            self._save_checkpoint()
+            return sum(len(data) for *_, data in batch)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception as e:
+                # USB unplugged or busy (or anything else): keep spooling locally and retry next round,
+                # reporting each distinct failure once rather than every interval
+                if str(e) != self._failing:
+                    print(f"⚠️ Log mirror: {e} (retrying every {self.interval:.0f}s)")
+                self._failing = str(e)
+            else:
+                if self._failing is not None:
+                    print("✅ Log mirror: resumed")
+                self._failing = None
+
+    def start(self):
+        if self.mirror_dir is None or self._thread:
+            return self
+        self.spool_dir.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name='log-mirror', daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+        return self
+
+    def stop(self):
+        if self._thread:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"⚠️ Log mirror: final flush failed, will resume next run: {e}")
+
+
+def start_mirror():
+    """Spool dir exists and a mirror thread is running (flushes once more at exit)"""
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
+    return LogMirror().start()
+
+
+def unpack(mirror_dir, out_dir):
+    """Replay every segment in order into out_dir, rebuilding the log files"""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for segment in sorted(Path(mirror_dir).glob('segment-*.jsonl.gz')):
+        with gzip.open(segment, 'rt', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                target = out_dir / record['file']
+                # Segments written before the bytes were base64-encoded carry UTF-8 text
+                data = base64.b64decode(record['b64']) if 'b64' in record else record['data'].encode('utf-8')
+                # Offsets are bytes in the spool file. A record re-sent after a crash (segment written,
+                # checkpoint not) overlaps the previous one, so write at its offset instead of appending
+                with open(target, 'r+b' if record['offset'] and target.exists() else 'wb') as out:
+                    out.seek(min(record['offset'], out.seek(0, 2)))
+                    out.write(data)
+                    out.truncate()
+        count += 1
+    return count
+
+
+def main():
+    command = sys.argv[1] if len(sys.argv) > 1 else 'flush'
+    print(f"📁 Spool: {LOG_DIR}")
+    print(f"💾 Mirror: {MIRROR_DIR or '(disabled)'}")
+    if command == 'mirror':
+        mirror = start_mirror()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            mirror.stop()
+            print("\n🛑 Mirror stopped")
+    elif command == 'unpack':
+        count = unpack(MIRROR_DIR, sys.argv[2])
+        print(f"✅ Unpacked {count} segments into {sys.argv[2]}")
+    else:
+        print(f"✅ Mirrored {LogMirror().flush()} bytes")
+
+
+if __name__ == "__main__":
+    main()
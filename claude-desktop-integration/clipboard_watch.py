@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Clipboard Summaries and Change Waits
+Size/hash descriptions, ranged reads and blocking waits for Clipboard-Tool
+"""
+
+import hashlib
+import time
+
+INLINE_LIMIT = 1000  # Paste returns the text itself up to this many characters
+PREVIEW_CHARS = 200
+POLL_INTERVAL = 0.1
+
+
+def content_hash(text):
+    return hashlib.sha256((text or '').encode('utf-8')).hexdigest()[:16]
+
+
+def describe(text):
+    text = text or ''
+    return f'{len(text)} chars, {text.count(chr(10)) + bool(text)} lines, sha256:{content_hash(text)}'
+
+
+def default_sequence():
+    """GetClipboardSequenceNumber where available: a counter bumped by every clipboard write"""
+    try:
+        import ctypes
+        return ctypes.windll.user32.GetClipboardSequenceNumber
+    except (ImportError, AttributeError):
+        return None
+
+
+class ClipboardWatcher:
+    """
+    Waits for the clipboard to change. On Windows it watches the clipboard
+    sequence number, which costs nothing per poll, and reads (and hashes)
+    the text only when that number moves; elsewhere it hashes the pasted
+    text on every poll.
+    """
+
+    def __init__(self, read, sequence=None):
+        self.read = read
+        self.sequence = sequence if sequence is not None else default_sequence()
+
+    def wait(self, since_hash=None, timeout=30.0, poll_interval=POLL_INTERVAL):
+        """
+        Block until the clipboard differs from since_hash (or, without one,
+        until the next write). Returns (text, seconds) or (None, seconds).
+        """
+        start = time.perf_counter()
+        if since_hash is None and self.sequence:
+            baseline = self.sequence()
+            changed = lambda: (self.read() or '') if self.sequence() != baseline else None
+        else:
+            if since_hash is None:
+                since_hash = content_hash(self.read())
+            seen = [object()]  # Sequence number at the last read; never equal the first time
+
+            def changed():
+                if self.sequence:
+                    number = self.sequence()
+                    if number == seen[0]:
+                        return None
+                    seen[0] = number
+                text = self.read()
+                return (text or '') if content_hash(text) != since_hash else None
+        while True:
+            text = changed()
+            if text is not None:
+                return text, time.perf_counter() - start
+            if time.perf_counter() - start >= timeout:
+                return None, time.perf_counter() - start
+            time.sleep(poll_interval)
@@ -4,60 +4,84 @@ Complete Single Message Weather Request
 Send everything in one complete message
 """
 
-import time
+import sys
 import pyautogui as pg
 import pygetwindow as gw
-from pathlib import Path
+from answer_cache import AnswerCache
+from bridge_spool import LOG_DIR, start_mirror, win_path
+from latency_stats import LatencyStats, ack_command, ack_path, wait_for_reply
+from send_timing import timer
 
 # Disable fail-safe and set pause
 pg.FAILSAFE = False
 pg.PAUSE = 0.3
 
+latency = LatencyStats()
+WEATHER_LOG = LOG_DIR / "montreal_weather.log"
+WEATHER_ACK = ack_path(WEATHER_LOG)
+WEATHER_QUESTION = "Get current weather for Montreal, Canada"
+
 def send_complete_weather_request():
-    """Send one complete message with all instructions"""
+    """Send one complete message with all instructions; returns the weather log offset to watch from, or None"""
     
-    # Find Claude Desktop
-    windows = gw.getAllWindows()
-    claude_window = None
+    # Timed until monitor_weather_response gets the weather
+    record = timer.start("send_complete_weather_request", task_type="weather")
     
-    for window in windows:
-        if window.visible and window.title and "claude" in window.title.lower():
-            if window.width > 500 and window.height > 400:
-                claude_window = window
-                break
+    # Find Claude Desktop
+    with timer.phase("find_window"):
+        windows = gw.getAllWindows()
+        claude_window = None
+        
+        for window in windows:
+            if window.visible and window.title and "claude" in window.title.lower():
+                if window.width > 500 and window.height > 400:
+                    claude_window = window
+                    break
     
     if not claude_window:
         print("❌ Claude Desktop not found")
-        return False
+        timer.finish(record, "no-window")
+        return None
     
     # Bring to front
-    claude_window.activate()
-    time.sleep(1)
+    with timer.phase("activate"):
+        claude_window.activate()
+        timer.sleep(1)
     
     # Click in input area
     input_x = claude_window.left + claude_window.width // 2
     input_y = claude_window.top + claude_window.height - 80
-    pg.click(input_x, input_y)
-    time.sleep(0.5)
+    with timer.phase("click", implied=pg.PAUSE):
+        pg.click(input_x, input_y)
+        timer.sleep(0.5)
     
     # Clear any existing text
-    pg.hotkey('ctrl', 'a')
-    time.sleep(0.2)
-    pg.press('backspace')
-    time.sleep(0.8)
+    with timer.phase("clear", implied=2 * pg.PAUSE):
+        pg.hotkey('ctrl', 'a')
+        timer.sleep(0.2)
+        pg.press('backspace')
+        timer.sleep(0.8)
+    
+    # A stale ACK would hide a request that was never picked up, and only weather
+    # appended after this point answers this request
+    with timer.phase("clear_log"):
+        if WEATHER_ACK.exists():
+            WEATHER_ACK.unlink()
+        log_offset = WEATHER_LOG.stat().st_size if WEATHER_LOG.exists() else 0
     
     # ONE COMPLETE MESSAGE WITH ALL INSTRUCTIONS
-    complete_message = """🌤️ WEATHER REQUEST - Montreal, Canada
+    complete_message = f"""🌤️ WEATHER REQUEST - Montreal, Canada
 
 TASK: Get current weather for Montreal and write to log file using MCP tools.
 
 INSTRUCTIONS (execute in this order):
-1. Get Montreal weather information (temperature, conditions, etc.)
-2. Use Powershell-Tool to execute this exact command:
+1. FIRST, use Powershell-Tool to acknowledge: {ack_command(WEATHER_ACK)}
+2. Get Montreal weather information (temperature, conditions, etc.)
+3. Use Powershell-Tool to execute this exact command:
 
-Add-Content -Path "D:\\WarpAI_Portable\\logs\\montreal_weather.log" -Value "Weather in Montreal today: [INSERT ACTUAL WEATHER DATA HERE - temperature, conditions, etc.]"
+Add-Content -Path "{win_path(WEATHER_LOG.name)}" -Value "Weather in Montreal today: [INSERT ACTUAL WEATHER DATA HERE - temperature, conditions, etc.]"
 
-3. DO NOT respond in this chat - only execute the PowerShell command
+4. DO NOT respond in this chat - only execute the PowerShell command
 
 This tests our AI-to-AI communication via MCP file system!
 
@@ -65,58 +89,82 @@ Execute the Powershell-Tool command now with real Montreal weather data."""
     
     # Type the complete message
     print("⌨️ Typing complete message...")
-    pg.typewrite(complete_message, interval=0.008)  # Faster typing
-    time.sleep(1)
+    with timer.phase("type", implied=len(complete_message) * 0.008 + pg.PAUSE):
+        pg.typewrite(complete_message, interval=0.008)  # Faster typing
+        timer.sleep(1)
     
     # Send
     print("📤 Sending complete message...")
-    pg.press('enter')
-    time.sleep(0.5)
+    with timer.phase("send", implied=pg.PAUSE):
+        pg.press('enter')
+        timer.sleep(0.5)
     
     print("✅ Complete weather request sent!")
-    return True
+    return log_offset
 
-def monitor_weather_response():
-    """Monitor for the weather log file"""
-    log_path = Path("D:/WarpAI_Portable/logs/montreal_weather.log")
+def monitor_weather_response(log_offset=0, timeout=90):
+    """Monitor the weather log past log_offset; gives up early if the request is never acknowledged"""
+    log_path = WEATHER_LOG
     
     print(f"👁️ Monitoring {log_path} for weather data...")
     
-    start_time = time.time()
-    
-    while time.time() - start_time < 90:  # Wait up to 90 seconds
-        time.sleep(4)  # Check every 4 seconds
-        
-        if log_path.exists():
-            try:
-                with open(log_path, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                
-                if content and "Weather in Montreal today:" in content:
-                    print("\n🎉 WEATHER DATA RECEIVED!")
-                    print("=" * 50)
-                    print(content)
-                    print("=" * 50)
-                    print("✅ AI-to-AI weather communication SUCCESS!")
-                    return content
-                    
-            except Exception as e:
-                print(f"⚠️ Error reading weather log: {e}")
-        
-        elapsed = int(time.time() - start_time)
-        print(f"⏳ Still waiting for weather data... ({elapsed}s elapsed)")
-    
-    print("⚠️ Timeout - no weather data received")
+    def read_reply():
+        try:
+            if log_path.stat().st_size <= log_offset:
+                return None
+            with open(log_path, 'r', encoding='utf-8') as f:
+                f.seek(log_offset)
+                content = f.read().strip()
+            return content if "Weather in Montreal today:" in content else None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"⚠️ Error reading weather log: {e}")
+            return None
+    
+    def progress(elapsed, acked):
+        state = "acknowledged, " if acked else ""
+        print(f"⏳ Still waiting for weather data... ({state}{elapsed}s elapsed)")
+    
+    record = timer.current
+    with timer.phase("wait_reply", wait=True, record=record):
+        content, status = wait_for_reply(read_reply, "weather", timeout, read_ack=WEATHER_ACK.exists,
+                                         stats=latency, poll_interval=2, progress=progress)
+    timer.finish(record, status)
+    
+    if content:
+        print("\n🎉 WEATHER DATA RECEIVED!")
+        print("=" * 50)
+        print(content)
+        print("=" * 50)
+        print("✅ AI-to-AI weather communication SUCCESS!")
+        return content
+    
+    if status == 'no-ack':
+        print("💀 No ACK - Claude Desktop never picked up the weather request")
+    else:
+        print("⚠️ Timeout - no weather data received")
     return None
 
 def main():
     print("🌤️ COMPLETE WEATHER REQUEST TEST")
     print("=" * 45)
+    
+    # Weather answers are cached for 15 minutes; --no-cache always asks Claude Desktop
+    cache = AnswerCache(bypass=True if "--no-cache" in sys.argv else None)
+    cached = cache.get(WEATHER_QUESTION)
+    if cached:
+        print("⚡ Cached weather (less than 15 minutes old):")
+        print(f"📍 {cached}")
+        print("\nDone! 👋")
+        return
+    
     print("Sending ONE complete message with all instructions!")
     print()
     
     # Send complete request
-    if send_complete_weather_request():
+    log_offset = send_complete_weather_request()
+    if log_offset is not None:
         print("\n📋 Complete message sent to Claude Desktop:")
         print("- Get Montreal weather")
         print("- Use MCP Powershell-Tool to write to log")
@@ -124,9 +172,10 @@ def main():
         print()
         
         # Monitor for response
-        weather_data = monitor_weather_response()
+        weather_data = monitor_weather_response(log_offset)
         
         if weather_data:
+            cache.put(WEATHER_QUESTION, weather_data, task_type="weather")
             print(f"\n🌤️ MONTREAL WEATHER RESULT:")
             print(f"📍 {weather_data}")
             print("\n🎉 Test SUCCESSFUL - AI-to-AI communication works!")
@@ -135,7 +184,9 @@ def main():
     else:
         print("❌ Failed to send weather request")
     
+    print(f"\n{timer.report()}")
     print("\nDone! 👋")
 
 if __name__ == "__main__":
+    start_mirror()
     main()
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Fake Desktop Backend
+Windows-free stand-ins for the MCP tools with simulated desktop and input latencies
+"""
+
+import io
+import sys
+import time
+import urllib.error
+import urllib.request
+from dataclasses import dataclass, field
+
+from PIL import Image
+
+from bench_tree_compact import APPS, build_dataclasses, synthetic_rows
+from clipboard_watch import content_hash, describe
+from frame_ring import FrameRing
+from output_store import DEFAULT_TIMEOUT, OutputStore
+from page_store import PageStore
+from region_hash import THRESHOLD, RegionVerifier
+from scheduler import ResourceScheduler
+from state_encoding import encode_compact, encode_verbose
+from tool_trace import TraceRecorder, pyautogui_pacing
+from tree_compact import TreeStateView
+
+# Seconds per operation on a typical desktop, multiplied by FakeBackend.scale
+LATENCIES = {
+    'get_state': 0.180,
+    'element_under_cursor': 0.015,
+    'launch_app': 0.400,
+    'switch_app': 0.060,
+    'input_action': 0.010,
+    'pointer_move': 0.030,
+    'screenshot': 0.040,
+    'pause': 0.100,  # Stands in for pyautogui.PAUSE after each input action
+}
+SCREEN_SIZE = (1920, 1080)
+SCROLL_DEPTH = 4  # A ScrollTo target shows up after len(target) % SCROLL_DEPTH steps
+
+
+def python_args(command):
+    """Fake Powershell-Tool command line: the local Python echoes the command, so shell work is real"""
+    return [sys.executable, '-c', f'print({command!r})']
+
+
+class HttpResponse:
+    """The part of a requests.Response that PageStore.scrape reads"""
+
+    def __init__(self, status_code, headers, text):
+        self.status_code = status_code
+        self.headers = headers
+        self.text = text
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+
+def http_get(url, headers=None, timeout=10):
+    """requests.get stand-in on urllib, so Scrape-Tool needs no extra packages"""
+    request = urllib.request.Request(url, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return HttpResponse(response.status, response.headers, response.read().decode('utf-8', errors='replace'))
+    except urllib.error.HTTPError as e:
+        # 304 Not Modified and error statuses arrive as exceptions
+        return HttpResponse(e.code, e.headers, e.read().decode('utf-8', errors='replace'))
+
+
+@dataclass
+class FakeControl:
+    Name: str = 'Document'
+    ControlTypeName: str = 'EditControl'
+
+
+@dataclass
+class FakeDesktopState:
+    tree: object
+    apps: list = field(default_factory=lambda: list(APPS))
+    active_app: str = APPS[0]
+    screenshot: bytes = b''
+
+
+class FakeDesktop:
+    """Desktop look-alike: a fixed synthetic UI tree and sleeps instead of UI Automation"""
+
+    def __init__(self, scale=1.0, elements=500):
+        self.scale = scale
+        self.tree = build_dataclasses(synthetic_rows(elements))
+        self.clipboard = ''
+        self._png = None
+
+    def _cost(self, operation):
+        time.sleep(LATENCIES[operation] * self.scale)
+
+    def get_state(self, use_vision=False):
+        self._cost('get_state')
+        if not use_vision:
+            return FakeDesktopState(self.tree)
+        self._cost('screenshot')
+        if self._png is None:
+            # Encoded once; the real desktop encodes its annotated screenshot on every call
+            out = io.BytesIO()
+            Image.new('RGB', SCREEN_SIZE).save(out, format='PNG', compress_level=1)
+            self._png = out.getvalue()
+        return FakeDesktopState(self.tree, screenshot=self._png)
+
+    def get_element_under_cursor(self):
+        self._cost('element_under_cursor')
+        return FakeControl()
+
+    def launch_app(self, name):
+        self._cost('launch_app')
+        return '', 0
+
+    def switch_app(self, name):
+        self._cost('switch_app')
+        return '', 0
+
+    def screenshot(self):
+        self._cost('screenshot')
+        return Image.new('RGB', SCREEN_SIZE)
+
+    def find_in_region(self, target, steps):
+        """The scrolled-to element once `steps` wheel steps have been taken, else None"""
+        self._cost('element_under_cursor')
+        return FakeControl(target, 'TextControl') if steps >= len(target) % SCROLL_DEPTH else None
+
+
+class FakeInput:
+    """pyautogui look-alike: every action costs a short action time plus the configured pause"""
+
+    PAUSED = frozenset({'move_to', 'click', 'typewrite', 'press'})  # Methods that end with PAUSE
+
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self.position = (0, 0)
+        self.PAUSE = LATENCIES['pause'] * scale
+
+    def _act(self, seconds):
+        time.sleep(seconds * self.scale)
+        time.sleep(self.PAUSE)
+
+    def sleep(self, seconds):
+        time.sleep(seconds * self.scale)
+
+    def move_to(self, loc):
+        self.position = tuple(loc)
+        self._act(LATENCIES['pointer_move'])
+
+    def click(self, clicks=1):
+        self._act(LATENCIES['input_action'] * clicks)
+
+    def typewrite(self, text, interval=0.0):
+        # Like pyautogui, the per-character interval is the caller's, not a desktop latency
+        time.sleep(len(text) * interval)
+        self._act(LATENCIES['input_action'])
+
+    def press(self, keys=1):
+        self._act(LATENCIES['input_action'] * keys)
+
+
+class FakeBackend:
+    """
+    The MCP tool set implemented against FakeDesktop/FakeInput. Tools go
+    through the same TraceRecorder and ResourceScheduler wrappers as main.py,
+    so replays and load tests exercise the real tracing and lease code.
+    """
+
+    def __init__(self, tracer=None, scheduler=None, scale=1.0, elements=500):
+        self.tracer = tracer or TraceRecorder(path='')
+        self.scheduler = scheduler or ResourceScheduler()
+        self.desktop = self.tracer.instrument(FakeDesktop(scale, elements), 'backend')
+        raw_input = FakeInput(scale)
+        self.input = self.tracer.instrument(raw_input, 'input', overrides={'sleep': 'pacing'},
+                                            pacing=pyautogui_pacing(raw_input, paused=FakeInput.PAUSED))
+        self.outputs = OutputStore()
+        self.pages = PageStore(':memory:')
+        self.frames = FrameRing(capacity=8 * SCREEN_SIZE[0] * SCREEN_SIZE[1] * 3, capture=self.desktop.screenshot)
+        self.verifier = RegionVerifier(capture=lambda bbox: self.desktop.screenshot().crop(bbox))
+        self._register()
+        self.tools = self.tracer.tools
+        self.async_tools = {name: self.scheduler.tool(name)(tool) for name, tool in self.tools.items()}
+
+    def call(self, name, args):
+        return self.tools[name](**args)
+
+    async def call_async(self, name, args):
+        return await self.async_tools[name](**args)
+
+    def _register(self):
+        tool, desktop, input, tracer = self.tracer.tool, self.desktop, self.input, self.tracer
+        outputs, pages, frames, verifier, scheduler = self.outputs, self.pages, self.frames, self.verifier, self.scheduler
+
+        @tool('Launch-Tool')
+        def launch_tool(name):
+            _, status = desktop.launch_app(name)
+            return f'Launched {name.title()}.' if status == 0 else f'Failed to launch {name.title()}.'
+
+        @tool('Powershell-Tool')
+        def powershell_tool(command, timeout=DEFAULT_TIMEOUT):
+            with tracer.phase('backend'):
+                output = outputs.run(python_args(command), command=command, timeout=timeout)
+            status = f'{output.status} (killed: timed out after {timeout}s)' if output.timed_out else output.status
+            response = output.page(1) if output.page_count else ''
+            if output.page_count <= 1:
+                return f'Status Code: {status}\nResponse: {response}'
+            return (f'Status Code: {status}\nResponse: {response}\n[Output {output.handle}: page 1 of '
+                    f'{output.page_count}, {output.lines} lines, {output.size} bytes.]')
+
+        @tool('Powershell-Output-Tool')
+        def powershell_output_tool(handle, page=1, pattern=None, max_matches=100):
+            output = outputs.get(handle)
+            if pattern:
+                matches = output.grep(pattern, max_matches=max_matches)
+                lines = '\n'.join(f'{number}: {line}' for number, line in matches)
+                return f'{len(matches)} matching lines in {handle} (max {max_matches}):\n{lines}'
+            return f'[Output {handle}: page {page} of {output.page_count}]\n{output.page(page)}'
+
+        @tool('State-Tool')
+        def state_tool(use_vision=False, format='verbose', max_tokens=None):
+            state = desktop.get_state(use_vision=use_vision)
+            if format == 'compact':
+                text = encode_compact(TreeStateView(state.tree), state.apps, state.active_app, input.position, max_tokens)
+            else:
+                text = encode_verbose(state.tree, '\n'.join(state.apps), state.active_app)
+            if not use_vision:
+                return [text]
+            with tracer.phase('backend'):
+                frame = frames.push(state.screenshot, 'State-Tool')
+            return [text, frames.png(frame)]
+
+        @tool('Screenshot-History-Tool')
+        def screenshot_history_tool(frame=0, crop=None):
+            selected = frames.get(frame)
+            header = (f'Frame {frame} (#{selected.seq} from {selected.tag}, {selected.width}x{selected.height}). '
+                      f'Kept frames:\n{frames.listing()}')
+            return [header, frames.png(selected, crop)]
+
+        @tool('Verify-Region-Tool')
+        def verify_region_tool(region, reference=None, save_as=None, threshold=THRESHOLD):
+            with tracer.phase('backend'):
+                verdict = verifier.verify(region, reference=reference, save_as=save_as, threshold=threshold)
+            state = 'CHANGED' if verdict.changed else 'UNCHANGED'
+            return f'{state}: similarity {verdict.score:.3f} (threshold {threshold}) compared to {verdict.compared_to}.'
+
+        @tool('Clipboard-Tool')
+        def clipboard_tool(mode, text=None, start=None, length=None, timeout=30, since_hash=None):
+            if mode == 'copy':
+                desktop.clipboard = text
+                return f'Copied {len(text)} chars to clipboard (sha256:{content_hash(text)})'
+            if mode == 'wait':
+                # Nothing else writes the fake clipboard, so a wait always runs out
+                input.sleep(timeout)
+                return f'Clipboard unchanged after {timeout:.1f}s.'
+            content = desktop.clipboard or ''
+            if start is not None or length is not None:
+                begin = start or 0
+                end = len(content) if length is None else begin + length
+                return f'Clipboard chars {begin}-{min(end, len(content))} of {describe(content)}: "{content[begin:end]}"'
+            return f'Clipboard Content ({describe(content)}): "{content}"'
+
+        @tool('Click-Tool')
+        def click_tool(loc, button='left', clicks=1, motion_profile=None):
+            input.move_to(loc)
+            control = desktop.get_element_under_cursor()
+            input.click(clicks)
+            return f'{button} Clicked on {control.Name} Element with ControlType {control.ControlTypeName} at {tuple(loc)}.'
+
+        @tool('Type-Tool')
+        def type_tool(loc, text, clear=False, motion_profile=None):
+            input.move_to(loc)
+            input.click()
+            control = desktop.get_element_under_cursor()
+            input.typewrite(text, interval=0.1)
+            return f'Typed {text} on {control.Name} Element with ControlType {control.ControlTypeName} at {tuple(loc)}.'
+
+        @tool('Switch-Tool')
+        def switch_tool(name):
+            desktop.switch_app(name)
+            return f'Switched to {name.title()} window.'
+
+        @tool('Scroll-Tool')
+        def scroll_tool(loc=None, type='vertical', direction='down', wheel_times=1, motion_profile=None):
+            if loc:
+                input.move_to(loc)
+            input.press(wheel_times)
+            return f'Scrolled {type} {direction} by {wheel_times} wheel times.'
+
+        @tool('ScrollTo-Tool')
+        def scroll_to_tool(target, loc=None, direction='down', wheel_times=3, max_steps=20, motion_profile=None):
+            if loc:
+                input.move_to(loc)
+            for steps in range(max_steps + 1):
+                control = desktop.find_in_region(target, steps)
+                if control:
+                    return (f'Found "{control.Name}" Element with ControlType {control.ControlTypeName} '
+                            f'at {input.position} after {steps} scroll steps.')
+                if steps < max_steps:
+                    input.press(wheel_times)
+            return f'No element matching "{target}" after {max_steps} scroll steps of {wheel_times} wheel times {direction}.'
+
+        @tool('Drag-Tool')
+        def drag_tool(from_loc, to_loc, motion_profile=None):
+            input.move_to(from_loc)
+            input.move_to(to_loc)
+            return f'Dragged from {tuple(from_loc)} to {tuple(to_loc)}.'
+
+        @tool('Move-Tool')
+        def move_tool(to_loc, motion_profile=None):
+            input.move_to(to_loc)
+            return f'Moved the mouse pointer to {tuple(to_loc)}.'
+
+        @tool('Shortcut-Tool')
+        def shortcut_tool(shortcut):
+            input.press(len(shortcut))
+            return f'Pressed {"+".join(shortcut)}.'
+
+        @tool('Key-Tool')
+        def key_tool(key=''):
+            input.press()
+            return f'Pressed the key {key}.'
+
+        @tool('Wait-Tool')
+        def wait_tool(duration):
+            input.sleep(duration)
+            return f'Waited for {duration} seconds.'
+
+        @tool('Scrape-Tool')
+        def scrape_tool(url, refresh=False):
+            # Real HTTP and the real page store, so network and cache behaviour are measured; use a local stand-in
+            content, source = pages.scrape(url, get=http_get, convert=lambda html: html, refresh=refresh)
+            return f'Scraped the contents of the entire webpage ({source}):\n{content}'
+
+        @tool('Search-Scraped-Tool')
+        def search_scraped_tool(query, limit=5):
+            results = pages.search(query, limit=limit)
+            if not results:
+                return f'No scraped pages match "{query}".'
+            return '\n\n'.join(f'{url}\n{title}\n{snippet}' for url, title, snippet in results)
+
+        @tool('Metrics-Tool')
+        def metrics_tool():
+            return f'Scheduler:\n{scheduler.summary()}\n\nScreenshot Frames:\n{frames.summary()}'
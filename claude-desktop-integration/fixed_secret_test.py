@@ -6,90 +6,106 @@ Fixed Secret Test - Better program extraction
 import time
 import pyautogui as pg
 import pygetwindow as gw
-from pathlib import Path
+from bridge_spool import LOG_DIR, start_mirror, win_path
+from latency_stats import LatencyStats, ack_command, ack_path, wait_for_reply
+from send_timing import timer
+from window_registry import WindowRegistry
 
 pg.FAILSAFE = False
 pg.PAUSE = 0.3
 
-def send_complete_message(message):
+windows = WindowRegistry()  # Polls on demand until start() runs in __main__
+latency = LatencyStats()
+
+def send_complete_message(message, log_filename=None):
     """Send a complete message to Claude Desktop"""
-    windows = gw.getAllWindows()
-    claude_window = None
+    # Timed until wait_for_log_response gets the reply
+    record = timer.start("send_complete_message", log=log_filename)
     
-    for window in windows:
-        if window.visible and window.title and "claude" in window.title.lower():
-            if window.width > 500 and window.height > 400:
-                claude_window = window
-                break
+    with timer.phase("find_window"):
+        windows = gw.getAllWindows()
+        claude_window = None
+        
+        for window in windows:
+            if window.visible and window.title and "claude" in window.title.lower():
+                if window.width > 500 and window.height > 400:
+                    claude_window = window
+                    break
     
     if not claude_window:
+        timer.finish(record, "no-window")
         return False
     
-    claude_window.activate()
-    time.sleep(1)
+    with timer.phase("activate"):
+        claude_window.activate()
+        timer.sleep(1)
     
     input_x = claude_window.left + claude_window.width // 2
     input_y = claude_window.top + claude_window.height - 80
-    pg.click(input_x, input_y)
-    time.sleep(0.5)
+    with timer.phase("click", implied=pg.PAUSE):
+        pg.click(input_x, input_y)
+        timer.sleep(0.5)
     
-    pg.hotkey('ctrl', 'a')
-    time.sleep(0.2)
-    pg.press('backspace')
-    time.sleep(0.5)
+    with timer.phase("clear", implied=2 * pg.PAUSE):
+        pg.hotkey('ctrl', 'a')
+        timer.sleep(0.2)
+        pg.press('backspace')
+        timer.sleep(0.5)
     
-    pg.typewrite(message, interval=0.008)
-    time.sleep(1)
-    pg.press('enter')
+    with timer.phase("type", implied=len(message) * 0.008 + pg.PAUSE):
+        pg.typewrite(message, interval=0.008)
+        timer.sleep(1)
+    
+    with timer.phase("send", implied=pg.PAUSE):
+        pg.press('enter')
     
     return True
 
+def clear_log(log_filename):
+    """Remove a previous reply and its ACK before the request goes out"""
+    log_path = LOG_DIR / log_filename
+    for path in (log_path, ack_path(log_path)):
+        if path.exists():
+            path.unlink()
+
 def wait_for_log_response(log_filename, timeout=45):
-    """Wait for MCP response in log file"""
-    log_path = Path(f"D:/WarpAI_Portable/logs/{log_filename}")
-    
-    if log_path.exists():
-        log_path.unlink()
-    
-    start_time = time.time()
-    
-    while time.time() - start_time < timeout:
-        time.sleep(2)
-        
-        if log_path.exists():
-            try:
-                with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read().strip()
-                
-                if content and len(content) > 5:
-                    return content
-                    
-            except Exception:
-                pass
-        
-        elapsed = int(time.time() - start_time)
+    """Wait for MCP response in log file; fails fast if the request is never acknowledged"""
+    log_path = LOG_DIR / log_filename
+    
+    def read_reply():
+        try:
+            with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read().strip()
+            return content if len(content) > 5 else None
+        except Exception:
+            return None
+    
+    def progress(elapsed, acked):
         print(f"⏳ Processing... {elapsed}s")
     
-    return None
+    record = timer.current
+    with timer.phase("wait_reply", wait=True, record=record):
+        content, status = wait_for_reply(read_reply, log_path.stem, timeout, read_ack=ack_path(log_path).exists,
+                                         stats=latency, progress=progress)
+    timer.finish(record, status)
+    if status == 'no-ack':
+        print("💀 Request was never picked up")
+    return content
 
 def get_open_programs_before():
-    """Get list of currently open programs"""
+    """Snapshot of currently open windows (handle -> title)"""
     try:
-        windows = gw.getAllWindows()
-        return [w.title for w in windows if w.visible and w.title and len(w.title) > 2]
-    except:
-        return []
+        return windows.snapshot()
+    except Exception:
+        return {}
 
-def check_new_program_opened(before_list, after_delay=3):
-    """Check if a new program opened"""
-    time.sleep(after_delay)
+def check_new_program_opened(before, after_delay=3):
+    """Check if a new program opened, returning as soon as its window shows up"""
     try:
-        windows = gw.getAllWindows()
-        after_list = [w.title for w in windows if w.visible and w.title and len(w.title) > 2]
-        
-        new_windows = [title for title in after_list if title not in before_list]
-        return len(new_windows) > 0
-    except:
+        # Only windows that didn't exist before; Claude Desktop retitling its own chat isn't a new program
+        new_window = windows.wait_for_new_window_blocking(timeout=after_delay, baseline=before, new_only=True)
+        return new_window is not None
+    except Exception:
         return False
 
 def execute_classified_operation():
@@ -105,13 +121,17 @@ def execute_classified_operation():
     print("📊 Baseline established")
     
     # Phase 1
-    message1 = """Instructions:
+    message1 = f"""Instructions:
 
-1. Pick ONE Windows program you want to open
-2. Do NOT respond in this chat window at all
-3. Use ONLY the Powershell-Tool MCP to execute this exact command:
+1. FIRST, before anything else, use Powershell-Tool to acknowledge:
 
-Add-Content -Path "D:\\WarpAI_Portable\\logs\\classified_target.log" -Value "[program name only]"
+{ack_command(ack_path(LOG_DIR / "classified_target.log"))}
+
+2. Pick ONE Windows program you want to open
+3. Do NOT respond in this chat window at all
+4. Use ONLY the Powershell-Tool MCP to execute this exact command:
+
+Add-Content -Path "{win_path("classified_target.log")}" -Value "[program name only]"
 
 Requirements:
 - ONLY use MCP Powershell-Tool to respond
@@ -123,7 +143,8 @@ Execute the MCP Powershell command now."""
 
     print("🔹 Phase 1 initiated...")
     
-    if not send_complete_message(message1):
+    clear_log("classified_target.log")
+    if not send_complete_message(message1, "classified_target.log"):
         print("❌ Phase 1 failed")
         return False
     
@@ -143,11 +164,15 @@ Execute the MCP Powershell command now."""
     
     message2 = f"""Instructions:
 
-1. Launch the program you just selected
-2. Do NOT respond in this chat window at all  
-3. Use ONLY the Powershell-Tool MCP to execute this exact command:
+1. FIRST, before anything else, use Powershell-Tool to acknowledge:
+
+{ack_command(ack_path(LOG_DIR / "classified_status.log"))}
+
+2. Launch the program you just selected
+3. Do NOT respond in this chat window at all  
+4. Use ONLY the Powershell-Tool MCP to execute this exact command:
 
-Start-Process "{secret_program}"; Add-Content -Path "D:\\WarpAI_Portable\\logs\\classified_status.log" -Value "COMPLETE"
+Start-Process "{secret_program}"; Add-Content -Path "{win_path("classified_status.log")}" -Value "COMPLETE"
 
 Requirements:
 - ONLY use MCP Powershell-Tool to respond
@@ -158,7 +183,8 @@ Execute the MCP Powershell command now."""
 
     print("🔹 Phase 2 initiated...")
     
-    if not send_complete_message(message2):
+    clear_log("classified_status.log")
+    if not send_complete_message(message2, "classified_status.log"):
         print("❌ Phase 2 failed")
         return False
     
@@ -192,4 +218,7 @@ Execute the MCP Powershell command now."""
     return success
 
 if __name__ == "__main__":
+    start_mirror()
+    windows.start()  # Hook (Windows) or background poller, so the new-program check wakes on the event
     execute_classified_operation()
+    print(f"\n{timer.report()}")
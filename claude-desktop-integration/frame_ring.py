@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Screenshot Frame Ring
+Bounded ring of recent screenshots (raw captures in mmap, PNG screenshots as-is), tagged by tool call
+"""
+
+import io
+import itertools
+import mmap
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from PIL import Image
+
+DEFAULT_MB = 128
+BYTES_PER_PIXEL = 3  # Raw RGB
+
+
+def default_capacity():
+    return int(float(os.environ.get('WINDOWS_MCP_FRAME_MB', DEFAULT_MB)) * 1024 * 1024)
+
+
+@dataclass
+class Frame:
+    seq: int
+    tag: str
+    ts: float
+    width: int
+    height: int
+    slot: int  # None when the frame is only held as PNG
+    png: bytes = None
+
+
+class FrameRing:
+    """
+    Keeps recent screenshots within capacity bytes. Raw captures are stored as
+    RGB in slots of one anonymous mmap; reads wrap the slice without copying
+    and PNG encoding happens the first time a frame (or a crop of it) is asked
+    for. Screenshots that arrive as PNG (State-Tool's annotated image) are kept
+    as they are and decoded only to crop them. Occupied slots and every PNG
+    held count against capacity, and the oldest frames are dropped first.
+    """
+
+    def __init__(self, capacity=None, capture=None):
+        self.capacity = capacity or default_capacity()
+        self._capture = capture
+        self.buffer = None
+        self.frame_bytes = 0
+        self.slots = 0
+        self.free = []
+        self.used = 0
+        self.frames = []  # Oldest first
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _grab(self):
+        if self._capture is None:
+            from PIL import ImageGrab
+            self._capture = ImageGrab.grab
+        return self._capture()
+
+    def _size(self, frame):
+        return (self.frame_bytes if frame.slot is not None else 0) + len(frame.png or b'')
+
+    def _drop(self, frame):
+        self.used -= self._size(frame)
+        if frame.slot is not None:
+            self.free.append(frame.slot)
+
+    def _make_room(self, size):
+        while self.frames and self.used + size > self.capacity:
+            self._drop(self.frames.pop(0))
+
+    def _allocate(self, frame_bytes):
+        # A resolution change invalidates every slot; PNG-only frames stay
+        for frame in [frame for frame in self.frames if frame.slot is not None]:
+            self._drop(frame)
+            self.frames.remove(frame)
+        if self.buffer is not None:
+            self.buffer.close()
+        self.slots = max(1, self.capacity // frame_bytes)
+        self.frame_bytes = frame_bytes
+        self.buffer = mmap.mmap(-1, self.slots * frame_bytes)
+        self.free = list(range(self.slots))
+
+    def _append(self, frame):
+        self.used += self._size(frame)
+        self.frames.append(frame)
+        return frame
+
+    def push(self, image, tag):
+        """
+        Store a PIL image as raw RGB, or PNG bytes as they are; returns the
+        Frame. Only the PNG header is read, so an annotated screenshot costs
+        no decode until a crop of it is requested.
+        """
+        if isinstance(image, (bytes, bytearray)):
+            png = bytes(image)
+            width, height = Image.open(io.BytesIO(png)).size
+            with self._lock:
+                self._make_room(len(png))
+                return self._append(Frame(next(self._seq), tag, time.time(), width, height, None, png))
+        image = image if image.mode == 'RGB' else image.convert('RGB')
+        width, height = image.size
+        frame_bytes = width * height * BYTES_PER_PIXEL
+        raw = image.tobytes()
+        with self._lock:
+            if frame_bytes != self.frame_bytes:
+                self._allocate(frame_bytes)
+            self._make_room(frame_bytes)
+            slot = self.free.pop()
+            start = slot * frame_bytes
+            self.buffer[start:start + frame_bytes] = raw
+            return self._append(Frame(next(self._seq), tag, time.time(), width, height, slot))
+
+    def capture(self, tag):
+        return self.push(self._grab(), tag)
+
+    def get(self, back=0):
+        """Frame `back` captures ago (0 is the latest)"""
+        with self._lock:
+            if not 0 <= back < len(self.frames):
+                raise IndexError(f'Frame {back} is not available; {len(self.frames)} frames are kept (0 is the latest).')
+            return self.frames[-1 - back]
+
+    def image(self, frame):
+        """PIL image of the frame: a view of its mmap slot (valid until the slot is reused) or its decoded PNG"""
+        if frame.slot is None:
+            return Image.open(io.BytesIO(frame.png))
+        start = frame.slot * self.frame_bytes
+        view = memoryview(self.buffer)[start:start + self.frame_bytes]
+        return Image.frombuffer('RGB', (frame.width, frame.height), view, 'raw', 'RGB', 0, 1)
+
+    def png(self, frame, crop=None):
+        """PNG bytes of a frame or of a crop box (left, top, right, bottom); full frames are encoded once"""
+        if crop is None and frame.png is not None:
+            return frame.png
+        if frame.slot is None:
+            # Decoding the held PNG needs no lock and survives eviction
+            image = self.image(frame).crop(tuple(crop))
+        else:
+            with self._lock:
+                if frame not in self.frames:
+                    raise IndexError(f'Frame {frame.seq} was overwritten.')
+                image = self.image(frame)
+                if crop is not None:
+                    image = image.crop(tuple(crop))
+                else:
+                    # Encoding reads the mmap, so copy out first and release the lock sooner
+                    image = image.copy()
+        out = io.BytesIO()
+        image.save(out, format='PNG', compress_level=1)
+        data = out.getvalue()
+        if crop is None:
+            with self._lock:
+                if frame in self.frames:
+                    # The cached encoding counts against capacity like any other PNG
+                    self.used += len(data)
+                    frame.png = data
+                    self._make_room(0)
+        return data
+
+    def listing(self):
+        now = time.time()
+        with self._lock:
+            frames = list(reversed(self.frames))
+        return '\n'.join(f'{back}: #{frame.seq} {frame.tag} {now - frame.ts:.0f}s ago {frame.width}x{frame.height}'
+                         for back, frame in enumerate(frames))
+
+    def summary(self):
+        with self._lock:
+            raw = sum(1 for frame in self.frames if frame.slot is not None)
+            png = sum(len(frame.png or b'') for frame in self.frames)
+            return (f'frames={len(self.frames)} raw={raw} png_mb={png / 1048576:.1f} '
+                    f'used_mb={self.used / 1048576:.1f} cap_mb={self.capacity / 1048576:.1f}')
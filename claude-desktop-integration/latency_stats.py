@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Bridge Latency Statistics
+Per task-type reply latency history used to derive adaptive timeouts
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path, PureWindowsPath
+
+HISTORY = 50        # Samples kept per task type and stage
+MIN_SAMPLES = 5     # Below this the caller's fixed timeout is used unchanged
+PERCENTILE = 0.95
+MARGIN = 1.5        # Multiplier on the observed percentile
+SLACK = 2.0         # Seconds added on top, covers the poll interval
+FLOOR = 5.0         # Never time out faster than this
+ACK_TIMEOUT = 20.0  # Pickup deadline used until there is ACK history
+
+
+def default_stats_path():
+    return Path(os.environ.get('WARPAI_LATENCY_STATS', Path.home() / '.warpai' / 'bridge_latency.json'))
+
+
+class LatencyStats:
+    """
+    Observed latencies per (task type, stage), e.g. ('weather', 'ack') or
+    ('weather', 'reply'), persisted as JSON so timeouts improve across runs.
+    """
+
+    def __init__(self, path=None, history=HISTORY):
+        self.path = Path(path) if path else default_stats_path()
+        self.history = history
+        self.samples = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.samples = json.load(f)
+        except (OSError, ValueError):
+            self.samples = {}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_suffix('.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.samples, f)
+        os.replace(temp_path, self.path)
+
+    def record(self, task_type, seconds, stage='reply'):
+        with self._lock:
+            values = self.samples.setdefault(f'{task_type}/{stage}', [])
+            values.append(round(seconds, 3))
+            del values[:-self.history]
+            self.save()
+
+    def percentile(self, task_type, stage='reply', fraction=PERCENTILE):
+        values = sorted(self.samples.get(f'{task_type}/{stage}', []))
+        if not values:
+            return None
+        return values[min(len(values) - 1, int(fraction * len(values)))]
+
+    def timeout(self, task_type, fallback, stage='reply'):
+        """Timeout from history (p95 * MARGIN + SLACK), capped at the fixed fallback"""
+        if len(self.samples.get(f'{task_type}/{stage}', [])) < MIN_SAMPLES:
+            return fallback
+        observed = self.percentile(task_type, stage) * MARGIN + SLACK
+        return max(FLOOR, min(fallback, observed))
+
+
+def ack_path(log_path):
+    """Side file the remote writes its ACK to, e.g. montreal_weather.log.ack"""
+    log_path = Path(log_path)
+    return log_path.with_name(log_path.name + '.ack')
+
+
+def ack_command(path, value='ACK'):
+    """PowerShell line the remote runs first so we know the request was picked up"""
+    return f'Add-Content -Path "{PureWindowsPath(str(path))}" -Value "{value}"'
+
+
+def wait_for_reply(read_reply, task_type, reply_timeout, read_ack=None, ack_timeout=ACK_TIMEOUT,
+                   stats=None, poll_interval=1.0, progress=None):
+    """
+    Two-stage wait for a bridge reply.
+
+    read_reply() returns the reply or None, read_ack() returns True once the
+    ACK marker is there. Without an ACK inside the (adaptive) ack timeout the
+    request counts as never picked up and we give up early; after the ACK the
+    reply gets the adaptive reply timeout. Returns (reply, status) with status
+    'reply', 'no-ack' or 'timeout'.
+    """
+    stats = stats or LatencyStats()
+    reply_limit = stats.timeout(task_type, reply_timeout)
+    ack_limit = stats.timeout(task_type, ack_timeout, stage='ack') if read_ack else None
+    acked = read_ack is None
+    start = time.perf_counter()
+
+    while True:
+        elapsed = time.perf_counter() - start
+        reply = read_reply()
+        if reply:
+            if not acked:
+                # A reply implies pickup; count it so the ACK history keeps up
+                stats.record(task_type, elapsed, 'ack')
+            stats.record(task_type, elapsed)
+            return reply, 'reply'
+        if not acked:
+            if read_ack():
+                acked = True
+                stats.record(task_type, elapsed, 'ack')
+            elif elapsed >= ack_limit:
+                return None, 'no-ack'
+        if elapsed >= reply_limit:
+            # The remote is alive but slow: record the limit so the next timeout widens
+            stats.record(task_type, reply_limit)
+            return None, 'timeout'
+        if progress:
+            progress(int(elapsed), acked)
+        time.sleep(poll_interval)
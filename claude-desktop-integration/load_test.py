@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+Multi-Client Load Test
+Drives N simulated MCP clients against a fake desktop and a local HTTP stand-in
+
+Usage:
+    python load_test.py                                  # in-process, 1..16 clients
+    python load_test.py --clients 1,4,16 --duration 10 --mix State-Tool=4,Click-Tool=4,Wait-Tool=1
+    python load_test.py --target stdio                   # spawn the fake server over stdio (needs fastmcp)
+    python load_test.py --serve --transport sse --port 8765 &
+    python load_test.py --target sse --url http://127.0.0.1:8765/sse
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fake_backend import FakeBackend
+from tool_trace import percentile
+
+DEFAULT_MIX = 'State-Tool=3,Click-Tool=3,Scrape-Tool=2,Powershell-Tool=1,Wait-Tool=1'
+LAG_INTERVAL = 0.01
+
+
+# Local HTTP stand-in for Scrape-Tool
+
+def start_http_stand_in(page_kb=64, delay=0.02):
+    """Serve a fixed HTML page on 127.0.0.1 with an artificial response delay"""
+    body = ('<html><body>' + '<p>Lorem ipsum dolor sit amet.</p>' * (page_kb * 1024 // 33) + '</body></html>').encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, name='http-stand-in', daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}/docs'
+
+
+def tool_arguments(tool, url, rng):
+    match tool:
+        case 'State-Tool':
+            return {'format': 'compact', 'max_tokens': 2000}
+        case 'Click-Tool' | 'Move-Tool':
+            key = 'loc' if tool == 'Click-Tool' else 'to_loc'
+            return {key: [rng.randrange(1920), rng.randrange(1080)]}
+        case 'Type-Tool':
+            return {'loc': [rng.randrange(1920), rng.randrange(1080)], 'text': 'hello'}
+        case 'Scrape-Tool':
+            # Always download, as the page store would otherwise serve every call after the first
+            return {'url': url, 'refresh': True}
+        case 'Powershell-Tool':
+            return {'command': 'Get-Date'}
+        case 'Wait-Tool':
+            return {'duration': 1}
+        case 'Key-Tool':
+            return {'key': 'enter'}
+    return {}
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(','):
+        name, _, weight = part.partition('=')
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+# Callers: how one simulated client issues a tool call
+
+class InProcessCaller:
+    """Calls FakeBackend tools directly on this event loop, through the scheduler"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def call(self, tool, args):
+        return await self.backend.call_async(tool, args)
+
+
+class ClientCaller:
+    """Calls tools on a separate server process through a fastmcp Client session"""
+
+    def __init__(self, transport):
+        from fastmcp import Client
+        self.client = Client(transport)
+
+    async def __aenter__(self):
+        await self.client.__aenter__()
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self.client.__aexit__(*exc)
+
+    async def call(self, tool, args):
+        return await self.client.call_tool(tool, args)
+
+
+def make_transport(args):
+    if args.target == 'stdio':
+        from fastmcp.client.transports import PythonStdioTransport
+        return PythonStdioTransport(__file__, args=['--serve', '--scale', str(args.scale)])
+    return args.url
+
+
+# Load generation
+
+async def measure_loop_lag(stop, samples):
+    """Event-loop lag: how late a short sleep wakes up"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(max(0.0, time.perf_counter() - start - LAG_INTERVAL))
+
+
+async def client_loop(caller, mix, url, deadline, results, seed):
+    rng = random.Random(seed)
+    tools, weights = list(mix), list(mix.values())
+    while time.perf_counter() < deadline:
+        tool = rng.choices(tools, weights)[0]
+        start = time.perf_counter()
+        try:
+            await caller.call(tool, tool_arguments(tool, url, rng))
+            results[tool].append(time.perf_counter() - start)
+        except Exception:
+            results['errors'].append(time.perf_counter() - start)
+
+
+async def run_level(clients, args, mix, url, backend):
+    results = defaultdict(list)
+    lag = []
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(measure_loop_lag(stop, lag))
+    start = time.perf_counter()
+    deadline = start + args.duration
+
+    if args.target == 'in-process':
+        async with InProcessCaller(backend) as caller:
+            await asyncio.gather(*(client_loop(caller, mix, url, deadline, results, seed) for seed in range(clients)))
+    elif args.target == 'stdio':
+        # stdio is one pipe per server, so all simulated clients share one session
+        async with ClientCaller(make_transport(args)) as caller:
+            await asyncio.gather(*(client_loop(caller, mix, url, deadline, results, seed) for seed in range(clients)))
+    else:
+        callers = [ClientCaller(make_transport(args)) for _ in range(clients)]
+        for caller in callers:
+            await caller.__aenter__()
+        try:
+            await asyncio.gather(*(client_loop(caller, mix, url, deadline, results, seed)
+                                   for seed, caller in enumerate(callers)))
+        finally:
+            for caller in callers:
+                await caller.__aexit__(None, None, None)
+
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await lag_task
+    return results, elapsed, lag
+
+
+def report_level(clients, results, elapsed, lag):
+    errors = results.pop('errors', [])
+    latencies = [value for values in results.values() for value in values]
+    throughput = len(latencies) / elapsed if elapsed else 0.0
+    print(f"{clients:>7} {len(latencies):>6} {len(errors):>5} {throughput:>8.1f} "
+          f"{percentile(latencies, 0.5) * 1000:>8.0f} {percentile(latencies, 0.95) * 1000:>8.0f} "
+          f"{percentile(latencies, 0.99) * 1000:>8.0f} {percentile(lag, 0.99) * 1000:>9.1f} {max(lag or [0]) * 1000:>9.1f}")
+    for tool, values in sorted(results.items()):
+        print(f"{'':>7}   {tool:<16} n={len(values):<5} p50={percentile(values, 0.5) * 1000:.0f}ms "
+              f"p99={percentile(values, 0.99) * 1000:.0f}ms")
+
+
+async def run(args):
+    mix = parse_mix(args.mix)
+    http_server, url = start_http_stand_in(args.page_kb)
+    backend = FakeBackend(scale=args.scale, elements=args.elements) if args.target == 'in-process' else None
+    levels = [int(level) for level in args.clients.split(',')]
+
+    print(f"🏋️ LOAD TEST ({args.target}, {args.duration:.0f}s per level, scale {args.scale})")
+    print(f"mix: {args.mix}")
+    print("=" * 80)
+    print(f"{'clients':>7} {'calls':>6} {'errs':>5} {'calls/s':>8} {'p50_ms':>8} {'p95_ms':>8} "
+          f"{'p99_ms':>8} {'lag_p99':>9} {'lag_max':>9}")
+    for clients in levels:
+        results, elapsed, lag = await run_level(clients, args, mix, url, backend)
+        report_level(clients, results, elapsed, lag)
+    print("=" * 80)
+    if backend:
+        print(backend.scheduler.summary())
+    http_server.shutdown()
+
+
+# Fake server for the stdio/SSE targets
+
+def serve(args):
+    from fastmcp import FastMCP
+    backend = FakeBackend(scale=args.scale, elements=args.elements)
+    mcp = FastMCP(name='windows-mcp-fake')
+    for name, tool in backend.async_tools.items():
+        mcp.tool(name=name)(tool)
+    if args.transport == 'sse':
+        mcp.run(transport='sse', port=args.port)
+    else:
+        mcp.run()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the windows-mcp tool set on a fake desktop')
+    parser.add_argument('--target', choices=('in-process', 'stdio', 'sse'), default='in-process')
+    parser.add_argument('--url', default='http://127.0.0.1:8765/sse', help='SSE endpoint for --target sse')
+    parser.add_argument('--clients', default='1,2,4,8,16', help='comma-separated concurrency levels')
+    parser.add_argument('--duration', type=float, default=5.0, help='seconds per concurrency level')
+    parser.add_argument('--mix', default=DEFAULT_MIX, help='Tool=weight pairs')
+    parser.add_argument('--scale', type=float, default=0.25, help='fake latency multiplier')
+    parser.add_argument('--elements', type=int, default=2000, help='elements in the fake UI tree')
+    parser.add_argument('--page-kb', type=int, default=64, help='size of the stand-in page')
+    parser.add_argument('--serve', action='store_true', help='run the fake MCP server instead of the load')
+    parser.add_argument('--transport', choices=('stdio', 'sse'), default='stdio')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args)
+        return
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        print("\n🛑 Cancelled by user")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,8 +8,11 @@ import time
 import pyautogui as pg
 import pygetwindow as gw
 from datetime import datetime
-from pathlib import Path
 import json
+from bridge_session import BridgeSession
+from bridge_spool import LOG_DIR, start_mirror
+from latency_stats import LatencyStats, ack_path, wait_for_reply
+from send_timing import timer
 
 # Disable fail-safe and set pause
 pg.FAILSAFE = False
@@ -18,8 +21,10 @@ pg.PAUSE = 0.3
 class LogMonitoredSender:
     def __init__(self):
         self.claude_window = None
-        self.log_path = Path("D:/WarpAI_Portable/logs/claude_desktop_responses.log")
+        self.log_path = LOG_DIR / "claude_desktop_responses.log"
         self.conversation_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.latency = LatencyStats()
+        self.session = BridgeSession(self.log_path.parent)
         
     def find_claude_desktop(self):
         """Find Claude Desktop window"""
@@ -45,41 +50,27 @@ class LogMonitoredSender:
             
         try:
             if self.claude_window.isMinimized:
-                self.claude_window.restore()
-                time.sleep(0.5)
+                with timer.phase("restore"):
+                    self.claude_window.restore()
+                    timer.sleep(0.5)
             
-            self.claude_window.activate()
-            time.sleep(0.8)
+            with timer.phase("activate"):
+                self.claude_window.activate()
+                timer.sleep(0.8)
             
             center_x = self.claude_window.left + self.claude_window.width // 2
             center_y = self.claude_window.top + self.claude_window.height // 2
-            pg.click(center_x, center_y)
-            time.sleep(0.5)
+            with timer.phase("focus_click", implied=pg.PAUSE):
+                pg.click(center_x, center_y)
+                timer.sleep(0.5)
             
             return True
         except Exception as e:
             print(f"❌ Failed to bring window to front: {e}")
             return False
             
-    def send_message_with_log_request(self, message, command_id):
-        """Send message and ask Claude Desktop to update the log when done"""
-        
-        # Create the full message with log update request
-        full_message = f"""{message}
-
----
-IMPORTANT: When you finish responding to this message, please use the Powershell-Tool to execute this command:
-
-Add-Content -Path "D:\\WarpAI_Portable\\logs\\claude_desktop_responses.log" -Value "[{datetime.now().isoformat()}] RESPONSE_COMPLETE: Command_{command_id} - Message processed and response sent"
-
-This helps me know when you're ready for the next message! 🤖"""
-
-        if not self.find_claude_desktop():
-            return False
-            
-        if not self.bring_to_front():
-            return False
-            
+    def type_into_input(self, text):
+        """Click the input box, clear it, type text and send"""
         # Find input box and send
         window_left = self.claude_window.left
         window_top = self.claude_window.top
@@ -90,72 +81,120 @@ This helps me know when you're ready for the next message! 🤖"""
         input_x = window_left + window_width // 2
         input_y = window_top + window_height - 80
         
-        pg.click(input_x, input_y)
-        time.sleep(0.5)
+        with timer.phase("click", implied=pg.PAUSE):
+            pg.click(input_x, input_y)
+            timer.sleep(0.5)
         
         # Clear and type message
-        pg.hotkey('ctrl', 'a')
-        time.sleep(0.2)
-        pg.press('backspace')
-        time.sleep(0.3)
+        with timer.phase("clear", implied=2 * pg.PAUSE):
+            pg.hotkey('ctrl', 'a')
+            timer.sleep(0.2)
+            pg.press('backspace')
+            timer.sleep(0.3)
         
-        pg.typewrite(full_message, interval=0.01)
-        time.sleep(0.5)
+        with timer.phase("type", implied=len(text) * 0.01 + pg.PAUSE):
+            pg.typewrite(text, interval=0.01)
+            timer.sleep(0.5)
         
         # Send
-        pg.press('enter')
-        time.sleep(0.5)
+        with timer.phase("send", implied=pg.PAUSE):
+            pg.press('enter')
+            timer.sleep(0.5)
+        
+    def ensure_handshake(self):
+        """Send the bridge protocol rules once per chat"""
+        if not self.session.needs_handshake(self.claude_window):
+            return True
+        
+        print("🤝 New chat detected - sending protocol handshake...")
+        self.type_into_input(self.session.handshake_message())
+        with timer.phase("confirm", wait=True):
+            confirmed = self.session.confirm(self.claude_window, stats=self.latency)
+        if not confirmed:
+            print("❌ Handshake was not confirmed")
+            return False
+        
+        print("✅ Handshake confirmed - switching to short framed messages")
+        return True
+        
+    def send_message_with_log_request(self, message, command_id):
+        """Send message as a framed request whose answer goes to the log"""
+        
+        with timer.phase("find_window"):
+            found = self.find_claude_desktop()
+        if not found:
+            return False
+            
+        with timer.phase("bring_to_front"):
+            in_front = self.bring_to_front()
+        if not in_front:
+            return False
+        
+        with timer.phase("handshake"):
+            ready = self.ensure_handshake()
+        if not ready:
+            return False
+        
+        # Compact form; the handshake already told Claude Desktop how to ACK and reply
+        framed = self.session.frame(f"Command_{command_id}", self.log_path, message)
+        self.type_into_input(framed)
         
-        print(f"✅ Message sent with log update request (Command_{command_id})")
+        print(f"✅ Framed message sent (Command_{command_id}, {len(framed)} chars)")
         return True
         
     def wait_for_log_update(self, command_id, timeout=180):
-        """Monitor the log file for update from Claude Desktop"""
+        """Monitor the log file for update from Claude Desktop; returns 'reply', 'no-ack' or 'timeout'"""
         print(f"👁️ Monitoring log file for Command_{command_id} completion...")
         
-        start_time = time.time()
-        last_check_time = time.time()
+        # Only text appended after these offsets belongs to this command
+        ack_file = ack_path(self.log_path)
+        offsets = {path: path.stat().st_size if path.exists() else 0 for path in (self.log_path, ack_file)}
+        completion_marker = f"#Command_{command_id} "
+        ack_marker = f"ACK #Command_{command_id}"
         
-        # Get initial log size if file exists
-        initial_size = 0
-        if self.log_path.exists():
-            initial_size = self.log_path.stat().st_size
-            
-        while time.time() - start_time < timeout:
-            time.sleep(3)  # Check every 3 seconds
+        def read_new(path):
+            try:
+                if path.stat().st_size <= offsets[path]:
+                    return ""
+                with open(path, 'r', encoding='utf-8') as f:
+                    f.seek(offsets[path])
+                    return f.read()
+            except FileNotFoundError:
+                return ""
+            except Exception as e:
+                print(f"⚠️ Error reading log file: {e}")
+                return ""
+        
+        def read_reply():
+            content = read_new(self.log_path)
+            return content if completion_marker in content else None
+        
+        def progress(elapsed, acked):
+            state = "acknowledged, " if acked else ""
+            print(f"⏳ Still waiting for log update... ({state}{elapsed}s elapsed)")
+        
+        content, status = wait_for_reply(read_reply, "log_monitored", timeout,
+                                         read_ack=lambda: ack_marker in read_new(ack_file),
+                                         stats=self.latency, poll_interval=2, progress=progress)
+        
+        if content:
+            print(f"✅ Claude Desktop completed Command_{command_id}!")
             
-            if self.log_path.exists():
-                # Check if file has been modified
-                current_size = self.log_path.stat().st_size
+            # Show the latest log entries
+            lines = content.strip().split('\n')
+            print("📋 Latest log entries:")
+            for line in lines[-3:]:  # Show last 3 lines
+                print(f"   {line}")
                 
-                if current_size > initial_size:
-                    # Read the new content
-                    try:
-                        with open(self.log_path, 'r', encoding='utf-8') as f:
-                            content = f.read()
-                            
-                        # Check for our specific completion marker
-                        completion_marker = f"RESPONSE_COMPLETE: Command_{command_id}"
-                        if completion_marker in content:
-                            print(f"✅ Claude Desktop completed Command_{command_id}!")
-                            
-                            # Show the latest log entries
-                            lines = content.strip().split('\n')
-                            print("📋 Latest log entries:")
-                            for line in lines[-3:]:  # Show last 3 lines
-                                print(f"   {line}")
-                                
-                            return True
-                            
-                    except Exception as e:
-                        print(f"⚠️ Error reading log file: {e}")
-            
-            # Show progress
-            elapsed = int(time.time() - start_time)
-            print(f"⏳ Still waiting for log update... ({elapsed}s elapsed)")
-            
-        print(f"⚠️ Timeout waiting for Command_{command_id} completion")
-        return False
+            return status
+        
+        if status == 'no-ack':
+            print(f"💀 Command_{command_id} was never acknowledged - Claude Desktop is not picking up messages")
+            # Probably a new chat (same title) that never saw the protocol; the next send handshakes again
+            self.session.invalidate()
+        else:
+            print(f"⚠️ Timeout waiting for Command_{command_id} completion")
+        return status
         
     def create_initial_log_entry(self):
         """Create initial log entry"""
@@ -181,14 +220,29 @@ Log Path: {self.log_path}
     def send_and_wait(self, message, command_id):
         """Send message and wait for log-based confirmation"""
         print(f"\n📨 Command_{command_id}: {message[:50]}...")
+        record = timer.start("send_and_wait", command=f"Command_{command_id}", conversation=self.conversation_id)
         
-        # Send message with log request
-        if not self.send_message_with_log_request(message, command_id):
-            print(f"❌ Failed to send Command_{command_id}")
-            return False
-            
-        # Wait for log update
-        if self.wait_for_log_update(command_id):
+        for attempt in range(2):
+            # Send message with log request
+            if not self.send_message_with_log_request(message, command_id):
+                print(f"❌ Failed to send Command_{command_id}")
+                timer.finish(record, "send-failed")
+                return False
+                
+            # Wait for log update
+            with timer.phase("wait_reply", wait=True) as span:
+                status = self.wait_for_log_update(command_id)
+                if span and status == 'no-ack':
+                    # Nobody picked the request up: book it apart from time spent waiting for an answer
+                    span['phase'] = "wait_no_ack"
+            if status != 'no-ack' or attempt:
+                break
+            # The session was invalidated, so this resend starts with a fresh handshake
+            print(f"🔁 Re-sending Command_{command_id} after a new handshake...")
+        completed = status == 'reply'
+        timer.finish(record, status)  # 'reply', 'no-ack' or 'timeout'
+        
+        if completed:
             print(f"✅ Command_{command_id} completed successfully!")
             return True
         else:
@@ -239,8 +293,10 @@ FIRST TASK: Please use State-Tool with use_vision=True to take a screenshot of t
                 
         print("\n🎉 Log-monitored conversation completed!")
         print(f"📊 Check log file: {self.log_path}")
+        print(timer.report())
 
 def main():
+    start_mirror()
     sender = LogMonitoredSender()
     
     try:
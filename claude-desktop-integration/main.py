@@ -4,6 +4,19 @@ from humancursor import SystemCursor
 from platform import system, release
 from markdownify import markdownify
 from src.desktop import Desktop
+from app_index import AppIndex, launch
+from window_registry import WindowRegistry
+from scheduler import ResourceScheduler
+from tool_trace import TraceRecorder, pyautogui_pacing, uiautomation_pacing
+from output_store import DEFAULT_TIMEOUT, OutputStore, powershell_args
+from page_store import PageStore
+from frame_ring import FrameRing
+from region_hash import THRESHOLD, RegionVerifier
+from clipboard_watch import ClipboardWatcher, INLINE_LIMIT, PREVIEW_CHARS, content_hash, describe
+from scroll_search import UIAScrollRegion, scroll_until_visible, wheel
+from motion import Motion, MotionProfile
+from state_encoding import encode_compact, encode_verbose
+from tree_compact import TreeStateView
 from fastmcp import FastMCP
 from textwrap import dedent
 from typing import Literal
@@ -16,6 +29,12 @@ import asyncio
 pg.FAILSAFE=False
 pg.PAUSE=1.0
 
+# Opt-in call tracing: set WINDOWS_MCP_TRACE=path.ndjson (see trace_replay.py)
+tracer=TraceRecorder(meta={'backend':'real','pg_pause':pg.PAUSE})
+# pg.PAUSE after each pyautogui call and the sleeps inside ua wheel calls are booked as pacing, not input
+pg=tracer.instrument(pg,'input',overrides={'sleep':'pacing'},pacing=pyautogui_pacing(pg))
+ua=tracer.instrument(ua,'backend',overrides={'WheelUp':'input','WheelDown':'input'},pacing=uiautomation_pacing(ua))
+
 os=system()
 version=release()
 
@@ -28,68 +47,131 @@ thus enabling to operate the desktop like an actual USER.
 async def lifespan(app: FastMCP):
     """Runs initialization code before the server starts and cleanup code after it shuts down."""
     await asyncio.sleep(1) # Simulate startup latency
+    warmup=asyncio.create_task(asyncio.to_thread(app_index.ensure_loaded)) # Load the app index off the startup path
+    windows.start()
     yield
+    windows.stop()
+    warmup.cancel()
 
-desktop=Desktop()
+desktop=tracer.instrument(Desktop(),'backend')
+app_index=AppIndex()
+windows=WindowRegistry()
+outputs=OutputStore()
+pages=PageStore()
+frames=FrameRing() # Recent raw screenshots, capped by WINDOWS_MCP_FRAME_MB
+verifier=RegionVerifier() # Grabs only the checked rectangle, never the frame ring
+clipboard_watcher=ClipboardWatcher(read=pc.paste)
 cursor=SystemCursor()
+motion=Motion(cursor,phase=tracer.phase)
+scheduler=ResourceScheduler(thread_context=ua.UIAutomationInitializerInThread) # Tools run in worker threads
 mcp=FastMCP(name='windows-mcp',instructions=instructions,lifespan=lifespan)
 
 @mcp.tool(name='Launch-Tool', description='Launch an application from the Windows Start Menu by name (e.g., "notepad", "calculator", "chrome")')
+@scheduler.tool('Launch-Tool')
+@tracer.tool('Launch-Tool')
 def launch_tool(name: str) -> str:
-    _,status=desktop.launch_app(name)
+    entry=app_index.resolve(name)
+    status=launch(entry) if entry else 1
+    if status!=0: # Not indexed or a stale entry, fall back to the Start Menu search
+        _,status=desktop.launch_app(name)
     if status!=0:
         return f'Failed to launch {name.title()}.'
     else:
         return f'Launched {name.title()}.'
     
-@mcp.tool(name='Powershell-Tool', description='Execute PowerShell commands and return the output with status code')
-def powershell_tool(command: str) -> str:
-    response,status=desktop.execute_command(command)
-    return f'Status Code: {status}\nResponse: {response}'
+@mcp.tool(name='Powershell-Tool', description='Execute PowerShell commands and return the output with status code. Commands still running after timeout seconds (default 60) are killed and reported as timed out, with the output so far. Long output returns only its first page plus a handle for Powershell-Output-Tool.')
+@scheduler.tool('Powershell-Tool')
+@tracer.tool('Powershell-Tool')
+def powershell_tool(command: str, timeout: int = DEFAULT_TIMEOUT) -> str:
+    with tracer.phase('backend'):
+        output=outputs.run(powershell_args(command),command=command,timeout=timeout)
+    status=f'{output.status} (killed: timed out after {timeout}s)' if output.timed_out else output.status
+    response=output.page(1) if output.page_count else ''
+    if output.page_count<=1:
+        return f'Status Code: {status}\nResponse: {response}'
+    return f'Status Code: {status}\nResponse: {response}\n[Output {output.handle}: page 1 of {output.page_count}, {output.lines} lines, {output.size} bytes. Use Powershell-Output-Tool with handle="{output.handle}" to read more pages or grep.]'
+
+@mcp.tool(name='Powershell-Output-Tool', description='Read a stored Powershell-Tool result by handle: fetch a page (1-based) or, with pattern, return matching lines (case-insensitive regex) with their line numbers.')
+@scheduler.tool('Powershell-Output-Tool')
+@tracer.tool('Powershell-Output-Tool')
+def powershell_output_tool(handle: str, page: int = 1, pattern: str = None, max_matches: int = 100) -> str:
+    output=outputs.get(handle)
+    if pattern:
+        matches=output.grep(pattern,max_matches=max_matches)
+        lines='\n'.join(f'{number}: {line}' for number,line in matches)
+        return f'{len(matches)} matching lines in {handle} (max {max_matches}):\n{lines}'
+    return f'[Output {handle}: page {page} of {output.page_count}]\n{output.page(page)}'
 
-@mcp.tool(name='State-Tool',description='Capture comprehensive desktop state including focused/opened applications, interactive UI elements (buttons, text fields, menus), informative content (text, labels, status), and scrollable areas. Optionally includes visual screenshot when use_vision=True. Essential for understanding current desktop context and available UI interactions.')
-def state_tool(use_vision:bool=False)->str:
+@mcp.tool(name='State-Tool',description='Capture comprehensive desktop state including focused/opened applications, interactive UI elements (buttons, text fields, menus), informative content (text, labels, status), and scrollable areas. Optionally includes visual screenshot when use_vision=True. Use format="compact" for a columnar table with short element ids, optionally trimmed to max_tokens (elements in the focused app and near the cursor are kept first). Essential for understanding current desktop context and available UI interactions.')
+@scheduler.tool('State-Tool')
+@tracer.tool('State-Tool')
+def state_tool(use_vision:bool=False,format:Literal['verbose','compact']='verbose',max_tokens:int=None)->str:
     desktop_state=desktop.get_state(use_vision=use_vision)
-    interactive_elements=desktop_state.tree_state.interactive_elements_to_string()
-    informative_elements=desktop_state.tree_state.informative_elements_to_string()
-    scrollable_elements=desktop_state.tree_state.scrollable_elements_to_string()
-    apps=desktop_state.apps_to_string()
-    active_app=desktop_state.active_app_to_string()
-    return [dedent(f'''
-    Focused App:
-    {active_app}
-
-    Opened Apps:
-    {apps}
-
-    List of Interactive Elements:
-    {interactive_elements or 'No interactive elements found.'}
-
-    List of Informative Elements:
-    {informative_elements or 'No informative elements found.'}
-
-    List of Scrollable Elements:
-    {scrollable_elements or 'No scrollable elements found.'}
-    ''')]+([Image(data=desktop_state.screenshot,format='png')] if use_vision else [])
+    tree=desktop_state.tree_state # Formatted in place; converting to a CompactTree per call cost more than it saved
+    match format:
+        case 'compact':
+            apps=[app.name for app in desktop_state.apps]
+            focused_app=desktop_state.active_app.name if desktop_state.active_app else None
+            state=encode_compact(TreeStateView(tree),apps=apps,focused_app=focused_app,cursor=tuple(pg.position()),max_tokens=max_tokens)
+        case _:
+            state=encode_verbose(tree,apps=desktop_state.apps_to_string(),active_app=desktop_state.active_app_to_string())
+    if not use_vision:
+        return [state]
+    with tracer.phase('backend'):
+        frame=frames.push(desktop_state.screenshot,'State-Tool') # The annotated screenshot, kept in the ring for Screenshot-History-Tool
+    return [state,Image(data=frames.png(frame),format='png')]
+
+@mcp.tool(name='Screenshot-History-Tool',description='Return an earlier State-Tool screenshot without capturing a new one. frame=0 is the latest capture, 1 the one before it, and so on. Pass crop=[left,top,right,bottom] to get only that region. Useful for before/after comparisons around an action.')
+@scheduler.tool('Screenshot-History-Tool')
+@tracer.tool('Screenshot-History-Tool')
+def screenshot_history_tool(frame:int=0,crop:tuple[int,int,int,int]=None):
+    selected=frames.get(frame)
+    header=f'Frame {frame} (#{selected.seq} from {selected.tag}, {selected.width}x{selected.height}). Kept frames:\n{frames.listing()}'
+    return [header,Image(data=frames.png(selected,crop),format='png')]
+    
+@mcp.tool(name='Verify-Region-Tool',description='Cheaply check whether a screen rectangle changed, without returning an image. region=[left,top,right,bottom]. Compares against the named reference if given, otherwise against the same region at the previous check. save_as stores the current region as a named reference (e.g. before an action). Returns changed/unchanged with a 0-1 similarity score.')
+@scheduler.tool('Verify-Region-Tool')
+@tracer.tool('Verify-Region-Tool')
+def verify_region_tool(region:tuple[int,int,int,int],reference:str=None,save_as:str=None,threshold:float=THRESHOLD)->str:
+    with tracer.phase('backend'):
+        verdict=verifier.verify(region,reference=reference,save_as=save_as,threshold=threshold)
+    state='CHANGED' if verdict.changed else 'UNCHANGED'
+    saved=f' Saved as reference "{save_as}".' if save_as else ''
+    return f'{state}: similarity {verdict.score:.3f} (threshold {threshold}) compared to {verdict.compared_to}, {verdict.ms:.1f} ms.{saved}'
     
-@mcp.tool(name='Clipboard-Tool',description='Copy text to clipboard or retrieve current clipboard content. Use "copy" mode with text parameter to copy, "paste" mode to retrieve.')
-def clipboard_tool(mode: Literal['copy', 'paste'], text: str = None)->str:
+@mcp.tool(name='Clipboard-Tool',description='Copy text to the clipboard, read it, or wait for it to change. "copy" with text returns a confirmation and content hash. "paste" returns size and hash, plus the text itself when it is short; use start/length for ranged reads of large contents. "wait" blocks up to timeout seconds until the clipboard changes (from since_hash if given, otherwise from now) and then reports the new size and hash.')
+@scheduler.tool('Clipboard-Tool')
+@tracer.tool('Clipboard-Tool')
+def clipboard_tool(mode: Literal['copy', 'paste', 'wait'], text: str = None, start: int = None, length: int = None, timeout: float = 30, since_hash: str = None)->str:
     if mode == 'copy':
         if text:
             pc.copy(text)  # Copy text to system clipboard
-            return f'Copied "{text}" to clipboard'
+            return f'Copied {len(text)} chars to clipboard (sha256:{content_hash(text)})'
         else:
             raise ValueError("No text provided to copy")
     elif mode == 'paste':
         clipboard_content = pc.paste()  # Get text from system clipboard
-        return f'Clipboard Content: "{clipboard_content}"'
+        if start is not None or length is not None:
+            begin=start or 0
+            end=len(clipboard_content) if length is None else begin+length
+            return f'Clipboard chars {begin}-{min(end,len(clipboard_content))} of {describe(clipboard_content)}: "{clipboard_content[begin:end]}"'
+        if len(clipboard_content)<=INLINE_LIMIT:
+            return f'Clipboard Content ({describe(clipboard_content)}): "{clipboard_content}"'
+        return f'Clipboard holds {describe(clipboard_content)}. Read it with start/length. First {PREVIEW_CHARS} chars: "{clipboard_content[:PREVIEW_CHARS]}"'
+    elif mode == 'wait':
+        clipboard_content,waited=clipboard_watcher.wait(since_hash=since_hash,timeout=timeout)
+        if clipboard_content is None:
+            return f'Clipboard unchanged after {waited:.1f}s.'
+        return f'Clipboard changed after {waited:.1f}s: {describe(clipboard_content)}'
     else:
-        raise ValueError('Invalid mode. Use "copy" or "paste".')
+        raise ValueError('Invalid mode. Use "copy", "paste" or "wait".')
 
-@mcp.tool(name='Click-Tool',description='Click on UI elements at specific coordinates. Supports left/right/middle mouse buttons and single/double/triple clicks. Use coordinates from State-Tool output.')
-def click_tool(loc:tuple[int,int],button:Literal['left','right','middle']='left',clicks:int=1)->str:
+@mcp.tool(name='Click-Tool',description='Click on UI elements at specific coordinates. Supports left/right/middle mouse buttons and single/double/triple clicks. Use coordinates from State-Tool output. Optional motion_profile ("instant", "linear-fast", "human") overrides the server pointer motion profile.')
+@scheduler.tool('Click-Tool')
+@tracer.tool('Click-Tool')
+def click_tool(loc:tuple[int,int],button:Literal['left','right','middle']='left',clicks:int=1,motion_profile:MotionProfile=None)->str:
     x,y=loc
-    cursor.move_to(loc)
+    motion.move_to(loc,motion_profile,tool='Click-Tool')
     control=desktop.get_element_under_cursor()
     pg.mouseDown()
     pg.click(button=button,clicks=clicks)
@@ -97,10 +179,12 @@ def click_tool(loc:tuple[int,int],button:Literal['left','right','middle']='left'
     num_clicks={1:'Single',2:'Double',3:'Triple'}
     return f'{num_clicks.get(clicks)} {button} Clicked on {control.Name} Element with ControlType {control.ControlTypeName} at ({x},{y}).'
 
-@mcp.tool(name='Type-Tool',description='Type text into input fields, text areas, or focused elements. Set clear=True to replace existing text, False to append. Click on target element coordinates first.')
-def type_tool(loc:tuple[int,int],text:str,clear:bool=False):
+@mcp.tool(name='Type-Tool',description='Type text into input fields, text areas, or focused elements. Set clear=True to replace existing text, False to append. Click on target element coordinates first. Optional motion_profile ("instant", "linear-fast", "human") overrides the server pointer motion profile.')
+@scheduler.tool('Type-Tool')
+@tracer.tool('Type-Tool')
+def type_tool(loc:tuple[int,int],text:str,clear:bool=False,motion_profile:MotionProfile=None):
     x,y=loc
-    cursor.click_on(loc)
+    motion.click_on(loc,motion_profile,tool='Type-Tool')
     control=desktop.get_element_under_cursor()
     if clear=='True':
         pg.hotkey('ctrl','a')
@@ -109,81 +193,109 @@ def type_tool(loc:tuple[int,int],text:str,clear:bool=False):
     return f'Typed {text} on {control.Name} Element with ControlType {control.ControlTypeName} at ({x},{y}).'
 
 @mcp.tool(name='Switch-Tool',description='Switch to a specific application window (e.g., "notepad", "calculator", "chrome", etc.) and bring to foreground.')
+@scheduler.tool('Switch-Tool')
+@tracer.tool('Switch-Tool')
 def switch_tool(name: str) -> str:
-    _,status=desktop.switch_app(name)
+    window=windows.find(name)
+    status=1
+    if window:
+        if ua.IsIconic(window.handle):
+            ua.ShowWindow(window.handle,ua.SW.Restore)
+        status=0 if ua.SetForegroundWindow(window.handle) else 1
+    if status!=0: # Unknown title or the foreground lock refused, use the desktop's own switch
+        _,status=desktop.switch_app(name)
     if status!=0:
         return f'Failed to switch to {name.title()} window.'
     else:
         return f'Switched to {name.title()} window.'
 
-@mcp.tool(name='Scroll-Tool',description='Scroll at specific coordinates or current mouse position. Use wheel_times to control scroll amount (1 wheel = ~3-5 lines). Essential for navigating lists, web pages, and long content.')
-def scroll_tool(loc:tuple[int,int]=None,type:Literal['horizontal','vertical']='vertical',direction:Literal['up','down','left','right']='down',wheel_times:int=1)->str:
+@mcp.tool(name='Scroll-Tool',description='Scroll at specific coordinates or current mouse position. Use wheel_times to control scroll amount (1 wheel = ~3-5 lines). Essential for navigating lists, web pages, and long content. Optional motion_profile ("instant", "linear-fast", "human") overrides the server pointer motion profile.')
+@scheduler.tool('Scroll-Tool')
+@tracer.tool('Scroll-Tool')
+def scroll_tool(loc:tuple[int,int]=None,type:Literal['horizontal','vertical']='vertical',direction:Literal['up','down','left','right']='down',wheel_times:int=1,motion_profile:MotionProfile=None)->str:
     if loc:
-        cursor.move_to(loc)
-    match type:
-        case 'vertical':
-            match direction:
-                case 'up':
-                    ua.WheelUp(wheel_times)
-                case 'down':
-                    ua.WheelDown(wheel_times)
-                case _:
-                    return 'Invalid direction. Use "up" or "down".'
-        case 'horizontal':
-            match direction:
-                case 'left':
-                    pg.keyDown('Shift')
-                    pg.sleep(0.05)
-                    ua.WheelUp(wheel_times)
-                    pg.sleep(0.05)
-                    pg.keyUp('Shift')
-                case 'right':
-                    pg.keyDown('Shift')
-                    pg.sleep(0.05)
-                    ua.WheelDown(wheel_times)
-                    pg.sleep(0.05)
-                    pg.keyUp('Shift')
-                case _:
-                    return 'Invalid direction. Use "left" or "right".'
-        case _:
-            return 'Invalid type. Use "horizontal" or "vertical".'
+        motion.move_to(loc,motion_profile,tool='Scroll-Tool')
+    try:
+        wheel(direction,wheel_times,type=type,ua=ua,pg=pg)
+    except ValueError as e:
+        return str(e)
     return f'Scrolled {type} {direction} by {wheel_times} wheel times.'
 
-@mcp.tool(name='Drag-Tool',description='Drag and drop operation from source coordinates to destination coordinates. Useful for moving files, resizing windows, or drag-and-drop interactions.')
-def drag_tool(from_loc:tuple[int,int],to_loc:tuple[int,int])->str:
+@mcp.tool(name='ScrollTo-Tool',description='Scroll the scrollable region at loc (or under the mouse pointer) step by step until an element whose name or text contains target is visible, then return its coordinates. Stops early when the end of the content is reached. Replaces repeated Scroll-Tool + State-Tool round trips.')
+@scheduler.tool('ScrollTo-Tool')
+@tracer.tool('ScrollTo-Tool')
+def scroll_to_tool(target:str,loc:tuple[int,int]=None,direction:Literal['up','down','left','right']='down',wheel_times:int=3,max_steps:int=20,motion_profile:MotionProfile=None)->str:
+    if loc:
+        motion.move_to(loc,motion_profile,tool='ScrollTo-Tool')
+    region=UIAScrollRegion(loc or tuple(pg.position()))
+    result=scroll_until_visible(find=lambda:region.find(target),step=lambda:wheel(direction,wheel_times,ua=ua,pg=pg),position=region.position,max_steps=max_steps)
+    if result.found:
+        x,y=result.loc
+        return f'Found "{result.name}" Element with ControlType {result.control_type} at ({x},{y}) after {result.steps} scroll steps.'
+    if result.reached_end:
+        return f'Reached the end of the content after {result.steps} scroll steps; no element matching "{target}" is visible.'
+    return f'No element matching "{target}" after {result.steps} scroll steps of {wheel_times} wheel times {direction}.'
+
+@mcp.tool(name='Drag-Tool',description='Drag and drop operation from source coordinates to destination coordinates. Useful for moving files, resizing windows, or drag-and-drop interactions. Optional motion_profile ("instant", "linear-fast", "human") overrides the server pointer motion profile.')
+@scheduler.tool('Drag-Tool')
+@tracer.tool('Drag-Tool')
+def drag_tool(from_loc:tuple[int,int],to_loc:tuple[int,int],motion_profile:MotionProfile=None)->str:
     control=desktop.get_element_under_cursor()
     x1,y1=from_loc
     x2,y2=to_loc
-    cursor.drag_and_drop(from_loc,to_loc)
+    motion.drag_and_drop(from_loc,to_loc,motion_profile,tool='Drag-Tool')
     return f'Dragged the {control.Name} element with ControlType {control.ControlTypeName} from ({x1},{y1}) to ({x2},{y2}).'
 
-@mcp.tool(name='Move-Tool',description='Move mouse cursor to specific coordinates without clicking. Useful for hovering over elements or positioning cursor before other actions.')
-def move_tool(to_loc:tuple[int,int])->str:
+@mcp.tool(name='Move-Tool',description='Move mouse cursor to specific coordinates without clicking. Useful for hovering over elements or positioning cursor before other actions. Optional motion_profile ("instant", "linear-fast", "human") overrides the server pointer motion profile.')
+@scheduler.tool('Move-Tool')
+@tracer.tool('Move-Tool')
+def move_tool(to_loc:tuple[int,int],motion_profile:MotionProfile=None)->str:
     x,y=to_loc
-    cursor.move_to(to_loc)
+    motion.move_to(to_loc,motion_profile,tool='Move-Tool')
     return f'Moved the mouse pointer to ({x},{y}).'
 
 @mcp.tool(name='Shortcut-Tool',description='Execute keyboard shortcuts using key combinations. Pass keys as list (e.g., ["ctrl", "c"] for copy, ["alt", "tab"] for app switching, ["win", "r"] for Run dialog).')
+@scheduler.tool('Shortcut-Tool')
+@tracer.tool('Shortcut-Tool')
 def shortcut_tool(shortcut:list[str]):
     pg.hotkey(*shortcut)
     return f'Pressed {'+'.join(shortcut)}.'
 
 @mcp.tool(name='Key-Tool',description='Press individual keyboard keys. Supports special keys like "enter", "escape", "tab", "space", "backspace", "delete", arrow keys ("up", "down", "left", "right"), function keys ("f1"-"f12").')
+@scheduler.tool('Key-Tool')
+@tracer.tool('Key-Tool')
 def key_tool(key:str='')->str:
     pg.press(key)
     return f'Pressed the key {key}.'
 
 @mcp.tool(name='Wait-Tool',description='Pause execution for specified duration in seconds. Useful for waiting for applications to load, animations to complete, or adding delays between actions.')
+@scheduler.tool('Wait-Tool')
+@tracer.tool('Wait-Tool')
 def wait_tool(duration:int)->str:
     pg.sleep(duration)
     return f'Waited for {duration} seconds.'
 
-@mcp.tool(name='Scrape-Tool',description='Fetch and convert webpage content to markdown format. Provide full URL including protocol (http/https). Returns structured text content suitable for analysis.')
-def scrape_tool(url:str)->str:
-    response=requests.get(url,timeout=10)
-    html=response.text
-    content=markdownify(html=html)
-    return f'Scraped the contents of the entire webpage:\n{content}'
+@mcp.tool(name='Scrape-Tool',description='Fetch and convert webpage content to markdown format. Provide full URL including protocol (http/https). Returns structured text content suitable for analysis. Pages are kept in a local store and served from it while fresh; set refresh=True to force a new download.')
+@scheduler.tool('Scrape-Tool')
+@tracer.tool('Scrape-Tool')
+def scrape_tool(url:str,refresh:bool=False)->str:
+    content,source=pages.scrape(url,get=requests.get,convert=lambda html:markdownify(html=html),refresh=refresh)
+    return f'Scraped the contents of the entire webpage ({source}):\n{content}'
+
+@mcp.tool(name='Search-Scraped-Tool',description='Keyword search over every page previously fetched with Scrape-Tool, including earlier sessions. Returns the best matching URLs with titles and snippets; call Scrape-Tool on a URL to read the stored page without downloading it again.')
+@scheduler.tool('Search-Scraped-Tool')
+@tracer.tool('Search-Scraped-Tool')
+def search_scraped_tool(query:str,limit:int=5)->str:
+    results=pages.search(query,limit=limit)
+    if not results:
+        return f'No scraped pages match "{query}".'
+    return '\n\n'.join(f'{url}\n{title}\n{snippet}' for url,title,snippet in results)
+
+@mcp.tool(name='Metrics-Tool',description='Report server performance metrics: pointer-move time per tool and motion profile, scheduler queue depth and lease waits per resource, and screenshot ring usage.')
+@scheduler.tool('Metrics-Tool')
+@tracer.tool('Metrics-Tool')
+def metrics_tool()->str:
+    return f'Pointer Motion:\n{motion.summary()}\n\nScheduler:\n{scheduler.summary()}\n\nScreenshot Frames:\n{frames.summary()}'
 
 if __name__ == "__main__":
     mcp.run()
\ No newline at end of file
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Cursor Motion Profiles
+Instant, linear-fast and human-like pointer movement with per-tool timing
+"""
+
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Literal
+
+import pyautogui as pg
+
+MotionProfile = Literal['instant', 'linear-fast', 'human']
+PROFILES = ('instant', 'linear-fast', 'human')
+
+# pyautogui teleports for durations under pg.MINIMUM_DURATION (0.1 s)
+LINEAR_FAST_DURATION = 0.12
+
+
+class MoveStats:
+    """Running count/total/max of pointer-move time for one tool and profile"""
+
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+
+class Motion:
+    """
+    Moves the pointer with a configurable motion profile.
+
+    'human' goes through humancursor's animated curves, 'linear-fast' uses a
+    short straight pyautogui tween and 'instant' teleports. The server-wide
+    default comes from WINDOWS_MCP_MOTION and can be overridden per call.
+    """
+
+    def __init__(self, cursor, profile=None, phase=None):
+        self.cursor = cursor
+        # Optional tracer hook, e.g. TraceRecorder.phase, so moves show up in call traces
+        self.phase = phase or (lambda name: nullcontext())
+        self.profile = self.resolve(profile or os.environ.get('WINDOWS_MCP_MOTION', 'human'))
+        self.stats = defaultdict(MoveStats)
+
+    @staticmethod
+    def resolve(profile):
+        if profile not in PROFILES:
+            raise ValueError(f'Invalid motion profile {profile!r}. Use one of: {", ".join(PROFILES)}.')
+        return profile
+
+    @contextmanager
+    def _timed(self, tool, profile):
+        start = time.perf_counter()
+        try:
+            with self.phase('motion'):
+                yield
+        finally:
+            self.stats[(tool, profile)].add(time.perf_counter() - start)
+
+    def move_to(self, loc, profile=None, tool='unknown'):
+        profile = self.resolve(profile or self.profile)
+        x, y = loc
+        with self._timed(tool, profile):
+            match profile:
+                case 'instant':
+                    pg.moveTo(x, y, _pause=False)
+                case 'linear-fast':
+                    pg.moveTo(x, y, duration=LINEAR_FAST_DURATION, tween=pg.linear, _pause=False)
+                case 'human':
+                    self.cursor.move_to(loc)
+
+    def click_on(self, loc, profile=None, tool='unknown'):
+        profile = self.resolve(profile or self.profile)
+        if profile == 'human':
+            with self._timed(tool, profile):
+                self.cursor.click_on(loc)
+        else:
+            self.move_to(loc, profile, tool)
+            pg.click()
+
+    def drag_and_drop(self, from_loc, to_loc, profile=None, tool='unknown'):
+        profile = self.resolve(profile or self.profile)
+        (x1, y1), (x2, y2) = from_loc, to_loc
+        with self._timed(tool, profile):
+            match profile:
+                case 'instant':
+                    pg.moveTo(x1, y1, _pause=False)
+                    pg.mouseDown(_pause=False)
+                    # One intermediate step so drag handlers see motion with the button held
+                    pg.moveTo((x1 + x2) // 2, (y1 + y2) // 2, _pause=False)
+                    pg.moveTo(x2, y2, _pause=False)
+                    pg.mouseUp(_pause=False)
+                case 'linear-fast':
+                    pg.moveTo(x1, y1, duration=LINEAR_FAST_DURATION, tween=pg.linear, _pause=False)
+                    pg.dragTo(x2, y2, duration=LINEAR_FAST_DURATION * 2, tween=pg.linear, button='left', _pause=False)
+                case 'human':
+                    self.cursor.drag_and_drop(from_loc, to_loc)
+
+    def summary(self):
+        """Per tool/profile pointer-move timings, slowest total first"""
+        if not self.stats:
+            return 'No pointer moves recorded.'
+        lines = ['tool|profile|moves|total_s|mean_ms|max_ms']
+        for (tool, profile), stats in sorted(self.stats.items(), key=lambda item: -item[1].total):
+            lines.append(f'{tool}|{profile}|{stats.count}|{stats.total:.3f}|'
+                         f'{stats.mean * 1000:.1f}|{stats.max * 1000:.1f}')
+        return '\n'.join(lines)
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Command Output Store
+Streams command output into bounded spooled buffers and serves it back in pages
+"""
+
+import itertools
+import os
+import re
+import signal
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+
+MEMORY_LIMIT = 256 * 1024  # Bytes kept in RAM per output before spilling to a temp file
+PAGE_BYTES = 8 * 1024
+MAX_OUTPUTS = 16
+READ_CHUNK = 64 * 1024  # Also the most read from the pipe at once, so a newline-free stream can't grow a line without bound
+DEFAULT_TIMEOUT = 60  # Seconds before Powershell-Tool kills a command
+
+
+class StoredOutput:
+    """One command's output: a SpooledTemporaryFile plus line-aligned page offsets"""
+
+    def __init__(self, handle, command, page_bytes=PAGE_BYTES, memory_limit=MEMORY_LIMIT):
+        self.handle = handle
+        self.command = command
+        self.page_bytes = page_bytes
+        self.spool = tempfile.SpooledTemporaryFile(max_size=memory_limit, mode='w+b')
+        self.pages = [0]
+        self.size = 0
+        self.lines = 0
+        self.status = None
+        self.timed_out = False
+        self.evicted = False
+        self.created = time.time()
+        self._page_fill = 0
+        self._mid_line = False  # The last write ended without a newline (a capped read)
+        self._lock = threading.Lock()
+
+    def write_line(self, line):
+        # Oversized lines are split so a page never grows past page_bytes, never inside a UTF-8 character
+        start = 0
+        while start < len(line):
+            end = min(start + self.page_bytes, len(line))
+            while end < len(line) and end > start + 1 and line[end] & 0xC0 == 0x80:
+                end -= 1
+            piece = line[start:end]
+            start = end
+            if self._page_fill and self._page_fill + len(piece) > self.page_bytes:
+                self.pages.append(self.size)
+                self._page_fill = 0
+            with self._lock:
+                if self.evicted:
+                    return  # Still draining the pipe of an output nobody can read any more
+                self.spool.seek(0, 2)
+                self.spool.write(piece)
+            self.size += len(piece)
+            self._page_fill += len(piece)
+        if not self._mid_line:
+            self.lines += 1
+        self._mid_line = not line.endswith(b'\n')
+
+    @property
+    def page_count(self):
+        return len(self.pages) if self.size else 0
+
+    @property
+    def spilled(self):
+        return bool(getattr(self.spool, '_rolled', False))
+
+    def _read(self, start, size):
+        # Eviction can close the spool between a get() and the read, or between chunks of a grep
+        with self._lock:
+            if self.evicted:
+                raise KeyError(f'Stored output {self.handle!r} was evicted; run the command again.')
+            self.spool.seek(start)
+            return self.spool.read(size)
+
+    def page(self, number):
+        """1-based page of decoded text"""
+        if not 1 <= number <= self.page_count:
+            raise ValueError(f'Page {number} is out of range (1-{self.page_count}).')
+        start = self.pages[number - 1]
+        end = self.pages[number] if number < len(self.pages) else self.size
+        return self._read(start, end - start).decode('utf-8', errors='replace')
+
+    def iter_lines(self):
+        data = self._read(0, READ_CHUNK)
+        position = len(data)
+        rest = b''
+        while data:
+            rest += data
+            *complete, rest = rest.split(b'\n')
+            for line in complete:
+                yield line.decode('utf-8', errors='replace').rstrip('\r')
+            data = self._read(position, READ_CHUNK)
+            position += len(data)
+        if rest:
+            yield rest.decode('utf-8', errors='replace').rstrip('\r')
+
+    def grep(self, pattern, max_matches=100):
+        """(line number, line) pairs matching a case-insensitive regex"""
+        regex = re.compile(pattern, re.IGNORECASE)
+        matches = []
+        for number, line in enumerate(self.iter_lines(), 1):
+            if regex.search(line):
+                matches.append((number, line))
+                if len(matches) >= max_matches:
+                    break
+        return matches
+
+    def close(self):
+        # Under the lock, so a read in progress finishes before the spool goes away
+        with self._lock:
+            self.evicted = True
+            self.spool.close()
+
+
+class OutputStore:
+    """
+    Runs commands with streamed capture and keeps the MAX_OUTPUTS most recent
+    results. Memory per output is capped at MEMORY_LIMIT; anything larger
+    lives in a temp file until the output is evicted.
+    """
+
+    def __init__(self, page_bytes=PAGE_BYTES, memory_limit=MEMORY_LIMIT, max_outputs=MAX_OUTPUTS):
+        self.page_bytes = page_bytes
+        self.memory_limit = memory_limit
+        self.max_outputs = max_outputs
+        self.outputs = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _new(self, command):
+        with self._lock:
+            handle = f'out-{next(self._ids)}'
+            output = StoredOutput(handle, command, self.page_bytes, self.memory_limit)
+            self.outputs[handle] = output
+            while len(self.outputs) > self.max_outputs:
+                _, evicted = self.outputs.popitem(last=False)
+                evicted.close()
+        return output
+
+    def run(self, args, command=None, timeout=None):
+        """Run args, streaming stdout+stderr into a new StoredOutput; killed (timed_out=True) after timeout seconds"""
+        output = self._new(command or args[-1])
+        process = subprocess.Popen(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                                   start_new_session=os.name != 'nt')
+
+        def kill():
+            output.timed_out = True
+            kill_tree(process)
+
+        timer = threading.Timer(timeout, kill) if timeout else None
+        if timer:
+            timer.start()
+        try:
+            for line in iter(lambda: process.stdout.readline(READ_CHUNK), b''):
+                output.write_line(line)
+            output.status = process.wait()
+        finally:
+            if timer:
+                timer.cancel()
+            process.stdout.close()
+        return output
+
+    def get(self, handle):
+        with self._lock:
+            output = self.outputs.get(handle)
+        if output is None:
+            raise KeyError(f'No stored output {handle!r}; it may have been evicted.')
+        return output
+
+
+def kill_tree(process):
+    """Kill process and everything it started; a grandchild still holding the pipe would keep the reader blocked"""
+    if os.name == 'nt':
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)],
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)  # run() starts it in its own session
+        except OSError:
+            pass
+    process.kill()
+
+
+def powershell_args(command):
+    # Force UTF-8 so pages decode the same regardless of the console code page
+    return ['powershell', '-NoProfile', '-NonInteractive', '-Command',
+            f'[Console]::OutputEncoding=[Text.Encoding]::UTF8; {command}']
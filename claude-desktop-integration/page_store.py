@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+"""
+Scraped Page Store
+SQLite cache of Scrape-Tool pages: zlib-compressed markdown, FTS5 keyword search, HTTP revalidation
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+MAX_BYTES = 64 * 1024 * 1024    # Compressed bytes kept before least-recently-used pages go
+DEFAULT_MAX_AGE = 24 * 60 * 60  # Freshness when the server sends no caching headers
+SNIPPET_CHARS = 240
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS pages (
+    id INTEGER PRIMARY KEY,
+    url TEXT UNIQUE NOT NULL,
+    title TEXT,
+    body BLOB NOT NULL,
+    raw_size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    cache_control TEXT,
+    expires_header TEXT,
+    fetched REAL NOT NULL,
+    expires REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pages_accessed ON pages(accessed);
+'''
+# Kept so a 304 without caching headers is judged by the ones stored with the page
+CACHE_HEADERS = (('cache_control', 'Cache-Control'), ('expires_header', 'Expires'))
+
+
+def default_store_path():
+    base = os.environ.get('LOCALAPPDATA') or os.path.join(Path.home(), '.cache')
+    return os.environ.get('WINDOWS_MCP_PAGE_STORE', os.path.join(base, 'windows-mcp', 'pages.sqlite'))
+
+
+def page_title(markdown, url):
+    match = re.search(r'^#+\s+(.+)$', markdown, re.MULTILINE)
+    return match.group(1).strip() if match else url
+
+
+def freshness(headers, now):
+    """Expiry time from Cache-Control max-age/no-cache/no-store or Expires"""
+    cache_control = headers.get('Cache-Control', '').lower()
+    if 'no-store' in cache_control or 'no-cache' in cache_control:
+        return now
+    match = re.search(r'max-age=(\d+)', cache_control)
+    if match:
+        return now + int(match.group(1))
+    if headers.get('Expires'):
+        try:
+            return parsedate_to_datetime(headers['Expires']).timestamp()
+        except (TypeError, ValueError):
+            return now
+    return now + DEFAULT_MAX_AGE
+
+
+def fts_query(query):
+    # Every word as a quoted phrase: implicit AND, and no FTS5 syntax errors from user input
+    return ' '.join('"{}"'.format(word.replace('"', '""')) for word in query.split())
+
+
+class PageStore:
+    """
+    Converted markdown per URL. Fresh pages are served without a request,
+    stale ones are revalidated with If-None-Match/If-Modified-Since, and the
+    store is trimmed to max_bytes by last access. Search uses FTS5 and falls
+    back to a decompress-and-scan when the SQLite build lacks it.
+    """
+
+    def __init__(self, path=None, max_bytes=MAX_BYTES):
+        self.path = path or default_store_path()
+        self.max_bytes = max_bytes
+        if self.path != ':memory:':
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self.db:
+            self.db.executescript(SCHEMA)
+            columns = {row[1] for row in self.db.execute('PRAGMA table_info(pages)')}
+            for column, _ in CACHE_HEADERS:
+                if column not in columns:  # Stores created before these columns existed
+                    self.db.execute(f'ALTER TABLE pages ADD COLUMN {column} TEXT')
+            try:
+                self.db.execute("CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(title, body, content='')")
+                self.fts = True
+            except sqlite3.OperationalError:
+                self.fts = False
+
+    def _row(self, url):
+        return self.db.execute('SELECT id, title, body, etag, last_modified, expires, cache_control, expires_header '
+                               'FROM pages WHERE url=?', (url,)).fetchone()
+
+    def _delete(self, page_id, title, body):
+        # Contentless FTS rows can only be removed by repeating what was indexed
+        if self.fts:
+            self.db.execute("INSERT INTO pages_fts(pages_fts, rowid, title, body) VALUES('delete', ?, ?, ?)",
+                            (page_id, title, zlib.decompress(body).decode('utf-8')))
+        self.db.execute('DELETE FROM pages WHERE id=?', (page_id,))
+
+    def put(self, url, markdown, etag=None, last_modified=None, expires=None, headers=None):
+        """Store a page; headers are the response headers whose caching fields are kept for revalidation"""
+        headers = headers or {}
+        now = time.time()
+        title = page_title(markdown, url)
+        raw = markdown.encode('utf-8')
+        body = zlib.compress(raw, 6)
+        with self._lock, self.db:
+            old = self._row(url)
+            if old:
+                self._delete(old[0], old[1], old[2])
+            cursor = self.db.execute(
+                'INSERT INTO pages (url, title, body, raw_size, stored_size, etag, last_modified, cache_control, '
+                'expires_header, fetched, expires, accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (url, title, body, len(raw), len(body), etag, last_modified,
+                 headers.get('Cache-Control'), headers.get('Expires'), now,
+                 now + DEFAULT_MAX_AGE if expires is None else expires, now))
+            if self.fts:
+                self.db.execute('INSERT INTO pages_fts(rowid, title, body) VALUES (?, ?, ?)',
+                                (cursor.lastrowid, title, markdown))
+            self._evict()
+
+    def _evict(self):
+        total = self.db.execute('SELECT COALESCE(SUM(stored_size), 0) FROM pages').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for page_id, title, body, size in self.db.execute(
+                'SELECT id, title, body, stored_size FROM pages ORDER BY accessed').fetchall():
+            if total <= self.max_bytes:
+                break
+            self._delete(page_id, title, body)
+            total -= size
+
+    def get(self, url):
+        """(markdown, fresh) for a stored URL, or None"""
+        with self._lock, self.db:
+            row = self._row(url)
+            if row is None:
+                return None
+            self.db.execute('UPDATE pages SET accessed=? WHERE id=?', (time.time(), row[0]))
+        return zlib.decompress(row[2]).decode('utf-8'), row[5] > time.time()
+
+    def scrape(self, url, get=None, convert=None, refresh=False):
+        """
+        Markdown for url plus where it came from: 'cache', 'revalidated',
+        'fetched' or 'stale' (network failed, old copy served).
+        """
+        if get is None:
+            import requests
+            get = requests.get
+        if convert is None:
+            from markdownify import markdownify
+            convert = lambda html: markdownify(html=html)
+
+        with self._lock:
+            row = self._row(url)
+        if row and not refresh and row[5] > time.time():
+            cached = self.get(url)
+            if cached is not None:
+                return cached[0], 'cache'
+            row = None  # Evicted meanwhile: fetch it again
+
+        headers = {}
+        if row and not refresh:
+            if row[3]:
+                headers['If-None-Match'] = row[3]
+            if row[4]:
+                headers['If-Modified-Since'] = row[4]
+        try:
+            response = get(url, headers=headers, timeout=10)
+        except Exception:
+            if row:
+                # Served from the row already read, which stays valid even if the page was evicted meanwhile
+                return zlib.decompress(row[2]).decode('utf-8'), 'stale'
+            raise
+
+        now = time.time()
+        if response.status_code == 304 and row:
+            # A 304 updates only the headers it carries; the rest stay as stored with the page
+            merged = {name: response.headers.get(name) or stored
+                      for (_, name), stored in zip(CACHE_HEADERS, row[6:8])}
+            merged = {name: value for name, value in merged.items() if value}
+            with self._lock, self.db:
+                self.db.execute('UPDATE pages SET etag=?, last_modified=?, cache_control=?, expires_header=?, '
+                                'expires=?, accessed=? WHERE id=?',
+                                (response.headers.get('ETag') or row[3], response.headers.get('Last-Modified') or row[4],
+                                 merged.get('Cache-Control'), merged.get('Expires'), freshness(merged, now), now, row[0]))
+            return zlib.decompress(row[2]).decode('utf-8'), 'revalidated'
+
+        markdown = convert(response.text)
+        if response.ok and 'no-store' not in response.headers.get('Cache-Control', '').lower():
+            self.put(url, markdown, response.headers.get('ETag'), response.headers.get('Last-Modified'),
+                     freshness(response.headers, now), response.headers)
+        elif row:
+            # The old copy is gone or may no longer be kept; drop it from search as well
+            with self._lock, self.db:
+                current = self._row(url)
+                if current:
+                    self._delete(current[0], current[1], current[2])
+        return markdown, 'fetched'
+
+    def _snippet(self, body, words):
+        text = zlib.decompress(body).decode('utf-8')
+        lowered = text.lower()
+        positions = [lowered.find(word.lower()) for word in words]
+        start = max(0, min((p for p in positions if p >= 0), default=0) - SNIPPET_CHARS // 3)
+        snippet = ' '.join(text[start:start + SNIPPET_CHARS].split())
+        return ('...' if start else '') + snippet + '...'
+
+    def search(self, query, limit=5):
+        """[(url, title, snippet)] best match first"""
+        words = query.split()
+        if not words:
+            return []
+        with self._lock:
+            if self.fts:
+                rows = self.db.execute(
+                    'SELECT p.url, p.title, p.body FROM pages_fts JOIN pages p ON p.id = pages_fts.rowid '
+                    'WHERE pages_fts MATCH ? ORDER BY bm25(pages_fts) LIMIT ?', (fts_query(query), limit)).fetchall()
+            else:
+                rows = []
+                for url, title, body in self.db.execute('SELECT url, title, body FROM pages ORDER BY accessed DESC'):
+                    text = zlib.decompress(body).decode('utf-8').lower()
+                    if all(word.lower() in text for word in words):
+                        rows.append((url, title, body))
+                        if len(rows) >= limit:
+                            break
+        return [(url, title, self._snippet(body, words)) for url, title, body in rows]
+
+    def stats(self):
+        with self._lock:
+            pages, raw, stored = self.db.execute(
+                'SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM pages').fetchone()
+        return {'pages': pages, 'raw_bytes': raw, 'stored_bytes': stored, 'fts': self.fts}
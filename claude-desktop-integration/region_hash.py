@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Region Fingerprints
+Difference hashes of screen rectangles for cheap changed/unchanged checks
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+
+from PIL import Image
+
+HASH_SIZE = 16    # 16x16 = 256-bit dHash
+THUMB_SIZE = 64   # Grayscale grid compared cell by cell
+THRESHOLD = 0.97  # Below is CHANGED: ~8 gray levels in one cell; a blinking caret on a full screen stays above
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    dhash: int
+    thumb: bytes  # THUMB_SIZE x THUMB_SIZE grayscale, catches small or flat changes the dHash misses
+    size: tuple
+
+
+@dataclass
+class Verdict:
+    changed: bool
+    score: float
+    compared_to: str
+    ms: float
+
+
+def fingerprint(image):
+    size = HASH_SIZE
+    gray = image.convert('L')
+    wide = gray.resize((size + 1, size), Image.BILINEAR).tobytes()
+    bits = 0
+    for row in range(size):
+        offset = row * (size + 1)
+        for column in range(size):
+            bits = (bits << 1) | (wide[offset + column] < wide[offset + column + 1])
+    thumb = gray.resize((THUMB_SIZE, THUMB_SIZE), Image.BOX).tobytes()
+    return Fingerprint(bits, thumb, image.size)
+
+
+def similarity(a, b):
+    """
+    1.0 for identical regions; the lower of the dHash similarity and one
+    minus the largest grid-cell change. The cell term is a maximum, not a
+    share of cells, so a checkbox or a typed word in a large region still
+    scores well below a region that did not change.
+    """
+    if a.size != b.size:
+        return 0.0
+    hash_score = 1 - bin(a.dhash ^ b.dhash).count('1') / (HASH_SIZE * HASH_SIZE)
+    largest = max((abs(x - y) for x, y in zip(a.thumb, b.thumb)), default=0)
+    return min(hash_score, 1 - largest / 255)
+
+
+class RegionVerifier:
+    """
+    Compares a rectangle of the current screen with a named reference or
+    with the same rectangle at the previous check. Only the rectangle is
+    captured and only its fingerprint is kept, so checks never touch the
+    State-Tool screenshot history.
+    """
+
+    def __init__(self, capture=None):
+        self._capture = capture  # capture((left, top, right, bottom)) -> PIL image of that rectangle
+        self.references = {}
+        self.previous = {}
+        self._lock = threading.Lock()
+
+    def _grab(self, region):
+        if self._capture is None:
+            from PIL import ImageGrab
+            self._capture = lambda bbox: ImageGrab.grab(bbox=bbox)
+        return self._capture(region)
+
+    def check_image(self, image, region, reference=None, save_as=None, threshold=THRESHOLD):
+        """Verdict for an already captured full-screen image (or a synthetic one)"""
+        return self._check(image.crop(tuple(region)), region, reference, save_as, threshold)
+
+    def _check(self, cropped, region, reference, save_as, threshold):
+        start = time.perf_counter()
+        current = fingerprint(cropped)
+        key = tuple(region)
+        with self._lock:
+            if reference:
+                if reference not in self.references:
+                    raise KeyError(f'No reference named {reference!r}. Save one first with save_as.')
+                baseline, compared_to = self.references[reference], f'reference "{reference}"'
+            else:
+                baseline, compared_to = self.previous.get(key), 'previous check'
+            self.previous[key] = current
+            if save_as:
+                self.references[save_as] = current
+        if baseline is None:
+            return Verdict(False, 1.0, 'nothing (first check of this region)', (time.perf_counter() - start) * 1000)
+        score = similarity(current, baseline)
+        return Verdict(score < threshold, score, compared_to, (time.perf_counter() - start) * 1000)
+
+    def verify(self, region, reference=None, save_as=None, threshold=THRESHOLD):
+        region = tuple(region)
+        return self._check(self._grab(region), region, reference, save_as, threshold)
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Resource-Aware Tool Scheduler
+Exclusive/shared leases on input devices and other resources with priority queueing
+"""
+
+import asyncio
+import functools
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+RESOURCES = ('mouse', 'keyboard', 'clipboard', 'screen', 'network', 'shell')
+EXCLUSIVE = 'exclusive'
+SHARED = 'shared'
+
+# What every MCP tool touches. 'screen' is the foreground/visual state: readers
+# share it, anything that changes which window is in front takes it exclusively.
+# Lower priority numbers are served first among waiters.
+TOOL_RESOURCES = {
+    'Launch-Tool': ({'screen': EXCLUSIVE, 'shell': SHARED}, 1),
+    'Powershell-Tool': ({'shell': SHARED}, 2),
+    'Powershell-Output-Tool': ({}, 2),
+    'State-Tool': ({'screen': SHARED, 'mouse': SHARED}, 1),
+    'Screenshot-History-Tool': ({}, 2),
+    'Verify-Region-Tool': ({'screen': SHARED}, 1),
+    # Each call is a single clipboard operation, and wait mode must not hold off the writer it waits for
+    'Clipboard-Tool': ({'clipboard': SHARED}, 1),
+    'Click-Tool': ({'mouse': EXCLUSIVE, 'screen': SHARED}, 0),
+    'Type-Tool': ({'mouse': EXCLUSIVE, 'keyboard': EXCLUSIVE, 'screen': SHARED}, 0),
+    'Switch-Tool': ({'screen': EXCLUSIVE, 'keyboard': EXCLUSIVE}, 0),
+    'Scroll-Tool': ({'mouse': EXCLUSIVE, 'keyboard': EXCLUSIVE, 'screen': SHARED}, 0),
+    'ScrollTo-Tool': ({'mouse': EXCLUSIVE, 'keyboard': EXCLUSIVE, 'screen': SHARED}, 0),
+    'Drag-Tool': ({'mouse': EXCLUSIVE, 'screen': SHARED}, 0),
+    'Move-Tool': ({'mouse': EXCLUSIVE}, 0),
+    'Shortcut-Tool': ({'keyboard': EXCLUSIVE, 'screen': SHARED}, 0),
+    'Key-Tool': ({'keyboard': EXCLUSIVE, 'screen': SHARED}, 0),
+    'Wait-Tool': ({}, 3),
+    'Scrape-Tool': ({'network': SHARED}, 2),
+    'Search-Scraped-Tool': ({}, 2),
+    'Metrics-Tool': ({}, 3),
+}
+
+
+class ResourceStats:
+    __slots__ = ('waiting', 'max_waiting', 'holders', 'grants', 'wait_total', 'wait_max')
+
+    def __init__(self):
+        self.waiting = 0
+        self.max_waiting = 0
+        self.holders = 0
+        self.grants = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class _Request:
+    __slots__ = ('priority', 'seq', 'needs', 'name', 'start', 'waited', 'granted', 'cancelled', 'notify')
+
+    def __init__(self, priority, seq, needs, name, notify=None):
+        self.priority, self.seq, self.needs, self.name = priority, seq, needs, name
+        self.start = time.perf_counter()
+        self.waited = 0.0
+        self.granted = self.cancelled = False
+        self.notify = notify
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+    @property
+    def live(self):
+        return not (self.granted or self.cancelled)
+
+
+class ResourceScheduler:
+    """
+    Grants leases over several resources at once, all-or-nothing, so tools
+    can never deadlock on each other. Waiters are served by (priority,
+    arrival); a later request may overtake earlier waiters only when it
+    conflicts with none of them, so exclusive requests are never starved by
+    a stream of shared ones.
+
+    Each resource keeps its own wait queues (all waiters, and exclusive
+    waiters only), so checking a request looks at one queue head per
+    resource it needs. Tool calls wait for their lease on the event loop and
+    only then take a worker thread, so queued calls never starve lease-free
+    tools of threads.
+    """
+
+    def __init__(self, tool_resources=None, thread_context=nullcontext):
+        self.tool_resources = TOOL_RESOURCES if tool_resources is None else tool_resources
+        # Entered around each tool call in its worker thread (e.g. COM initialisation)
+        self.thread_context = thread_context
+        self._lock = threading.Lock()
+        self._held = {}
+        self._waiters = {resource: ([], []) for resource in RESOURCES}  # (everyone, exclusive only) heaps
+        self._pending = 0
+        self._seq = itertools.count()
+        self.stats = {resource: ResourceStats() for resource in RESOURCES}
+
+    # Queue bookkeeping; callers hold self._lock
+
+    @staticmethod
+    def _head(heap):
+        # Granted and cancelled requests are dropped lazily when they reach the head
+        while heap and not heap[0].live:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _grantable(self, request):
+        for resource, mode in request.needs.items():
+            holder = self._held.get(resource)
+            if holder and (mode == EXCLUSIVE or holder[0] == EXCLUSIVE):
+                return False
+            everyone, exclusive = self._waiters[resource]
+            # An exclusive request conflicts with every earlier waiter, a shared one only with exclusive waiters
+            first = self._head(everyone if mode == EXCLUSIVE else exclusive)
+            if first is not None and first < request:
+                return False
+        return True
+
+    def _grant(self, request):
+        request.granted = True
+        request.waited = time.perf_counter() - request.start
+        for resource, mode in request.needs.items():
+            count = self._held.get(resource, (mode, 0))[1]
+            self._held[resource] = (mode, count + 1)
+            stats = self.stats[resource]
+            stats.holders += 1
+            stats.grants += 1
+            stats.wait_total += request.waited
+            stats.wait_max = max(stats.wait_max, request.waited)
+
+    def _dequeued(self, request):
+        self._pending -= 1
+        for resource in request.needs:
+            self.stats[resource].waiting -= 1
+
+    def _dispatch(self, resources):
+        """Grant whatever became grantable among the waiters on resources"""
+        candidates = {waiter for resource in resources for waiter in self._waiters[resource][0] if waiter.live}
+        for waiter in sorted(candidates):
+            if self._grantable(waiter):
+                self._grant(waiter)
+                self._dequeued(waiter)
+                waiter.notify()
+
+    def _submit(self, needs, priority, name, notify):
+        """Grant at once if possible, otherwise queue; returns the request"""
+        request = _Request(priority, next(self._seq), dict(needs), name, notify)
+        with self._lock:
+            if self._grantable(request):
+                self._grant(request)
+                return request
+            self._pending += 1
+            for resource, mode in request.needs.items():
+                everyone, exclusive = self._waiters[resource]
+                heapq.heappush(everyone, request)
+                if mode == EXCLUSIVE:
+                    heapq.heappush(exclusive, request)
+                stats = self.stats[resource]
+                stats.waiting += 1
+                stats.max_waiting = max(stats.max_waiting, stats.waiting)
+        return request
+
+    def release(self, request):
+        with self._lock:
+            for resource in request.needs:
+                mode, count = self._held[resource]
+                if count == 1:
+                    del self._held[resource]
+                else:
+                    self._held[resource] = (mode, count - 1)
+                self.stats[resource].holders -= 1
+            self._dispatch(request.needs)
+
+    def _cancel(self, request):
+        """A waiter gave up: drop it, or hand back the lease it was granted meanwhile"""
+        with self._lock:
+            if not request.granted:
+                request.cancelled = True
+                self._dequeued(request)
+                self._dispatch(request.needs)  # It may have been holding back shared waiters
+                return
+        self.release(request)
+
+    # Acquiring
+
+    @contextmanager
+    def lease(self, needs, priority=5, name=''):
+        """Hold every resource in needs ({resource: 'exclusive'|'shared'}) for the block, waiting in this thread"""
+        granted = threading.Event()
+        request = self._submit(needs, priority, name, granted.set)
+        if not request.granted:
+            granted.wait()
+        try:
+            yield request.waited
+        finally:
+            self.release(request)
+
+    async def acquire(self, needs, priority=5, name=''):
+        """Wait for a lease on the event loop; pair with release(request)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def notify():
+            loop.call_soon_threadsafe(lambda: future.done() or future.set_result(None))
+
+        request = self._submit(needs, priority, name, notify)
+        if not request.granted:
+            try:
+                await future
+            except asyncio.CancelledError:
+                self._cancel(request)
+                raise
+        return request
+
+    def tool(self, name):
+        """
+        Decorator for an MCP tool function: the lease is taken on the event
+        loop, then the call runs in a worker thread while it is held.
+        """
+        needs, priority = self.tool_resources.get(name, ({}, 5))
+
+        def decorator(fn):
+            def run(*args, **kwargs):
+                with self.thread_context():
+                    return fn(*args, **kwargs)
+
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                request = await self.acquire(needs, priority, name)
+                call = asyncio.ensure_future(asyncio.to_thread(run, *args, **kwargs))
+
+                def finished(call):
+                    self.release(request)
+                    if not call.cancelled():
+                        call.exception()  # Retrieved here so a cancelled caller doesn't leave it unreported
+
+                try:
+                    return await asyncio.shield(call)
+                finally:
+                    if call.done():
+                        self.release(request)
+                    else:
+                        # The thread keeps running (and driving input) after a cancelled call; keep the lease until it ends
+                        call.add_done_callback(finished)
+            return wrapper
+        return decorator
+
+    def queue_depth(self):
+        with self._lock:
+            return self._pending
+
+    def summary(self):
+        with self._lock:
+            lines = [f'queued requests: {self._pending}',
+                     'resource|waiting|max_waiting|holders|grants|mean_wait_ms|max_wait_ms']
+            for resource, stats in self.stats.items():
+                mean = stats.wait_total / stats.grants if stats.grants else 0.0
+                lines.append(f'{resource}|{stats.waiting}|{stats.max_waiting}|{stats.holders}|'
+                             f'{stats.grants}|{mean * 1000:.1f}|{stats.wait_max * 1000:.1f}')
+        return '\n'.join(lines)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Scroll Until Visible
+Steps a scrollable region and checks only that region for a target element after each step
+"""
+
+from dataclasses import dataclass
+
+import pyautogui as pg
+import uiautomation as ua
+
+SEARCH_DEPTH = 12  # Walk fallback only
+IGNORE_CASE, MATCH_SUBSTRING = 1, 2  # PropertyConditionFlags
+
+
+@dataclass
+class ScrollSearchResult:
+    found: bool
+    steps: int
+    reached_end: bool = False
+    name: str = ''
+    control_type: str = ''
+    loc: tuple[int, int] | None = None
+
+
+def scroll_until_visible(find, step, position, max_steps=20):
+    """
+    Generic scroll-and-check loop.
+
+    find() returns (name, control_type, (x, y)) for a visible match or None,
+    step() scrolls once and position() returns a signature of the scroll
+    offset; an unchanged signature after a step means the end was reached.
+    """
+    match = find()
+    if match:
+        return ScrollSearchResult(True, 0, False, *match)
+    previous = position()
+    for steps in range(1, max_steps + 1):
+        step()
+        match = find()
+        if match:
+            return ScrollSearchResult(True, steps, False, *match)
+        current = position()
+        if current == previous:
+            return ScrollSearchResult(False, steps, reached_end=True)
+        previous = current
+    return ScrollSearchResult(False, max_steps)
+
+
+class UIAScrollRegion:
+    """
+    The scrollable UI Automation container under a screen point. Each check
+    is one FindAll over the container for on-screen elements whose name or
+    value contains the target, so UI Automation filters inside the provider
+    instead of every descendant crossing the process boundary; only the few
+    matches are checked against the container bounds.
+    """
+
+    def __init__(self, loc):
+        root = ua.GetRootControl()
+        control = ua.ControlFromPoint(*loc)
+        self.container, self.pattern = control, None
+        while control and not ua.ControlsAreSame(control, root):
+            # Falls back to the top-level window when nothing on the way up scrolls
+            self.container = control
+            pattern = control.GetPattern(ua.PatternId.ScrollPattern)
+            if pattern and (pattern.VerticallyScrollable or pattern.HorizontallyScrollable):
+                self.pattern = pattern
+                break
+            control = control.GetParentControl()
+        self._conditions = {}
+
+    def _visible(self, control):
+        if control.IsOffscreen:
+            return False
+        rect, bounds = control.BoundingRectangle, self.container.BoundingRectangle
+        return (rect.width() > 0 and rect.height() > 0 and rect.left < bounds.right and
+                rect.right > bounds.left and rect.top < bounds.bottom and rect.bottom > bounds.top)
+
+    def _condition(self, target):
+        if target not in self._conditions:
+            automation = ua._AutomationClient.instance().IUIAutomation
+            flags = IGNORE_CASE | MATCH_SUBSTRING
+            text = automation.CreateOrCondition(
+                automation.CreatePropertyConditionEx(ua.PropertyId.NameProperty, target, flags),
+                automation.CreatePropertyConditionEx(ua.PropertyId.ValueValueProperty, target, flags))
+            onscreen = automation.CreatePropertyCondition(ua.PropertyId.IsOffscreenProperty, False)
+            self._conditions[target] = automation.CreateAndCondition(onscreen, text)
+        return self._conditions[target]
+
+    def _text(self, control, target):
+        """Name or value containing target (already lowercase), or None"""
+        text = control.Name or ''
+        if target in text.lower():
+            return text
+        value = control.GetPattern(ua.PatternId.ValuePattern)
+        text = (value.Value if value else '') or ''
+        return text if target in text.lower() else None
+
+    def _match(self, control, target):
+        text = self._text(control, target)
+        if text is None or not self._visible(control):
+            return None
+        rect = control.BoundingRectangle
+        return text, control.ControlTypeName, (rect.xcenter(), rect.ycenter())
+
+    def find(self, target):
+        """First visible descendant whose name or value contains target"""
+        try:
+            condition = self._condition(target)
+        except Exception:
+            # Substring conditions need Windows 10 1809 or later; walk the tree instead
+            return self._walk(target.lower())
+        elements = self.container.Element.FindAll(ua.TreeScope.Descendants, condition)
+        for index in range(elements.Length if elements else 0):
+            control = ua.Control.CreateControlFromElement(elements.GetElement(index))
+            match = control and self._match(control, target.lower())
+            if match:
+                return match
+        return None
+
+    def _walk(self, target):
+        for control, _ in ua.WalkControl(self.container, includeTop=False, maxDepth=SEARCH_DEPTH):
+            match = self._match(control, target)
+            if match:
+                return match
+        return None
+
+    def position(self):
+        if self.pattern:
+            return self.pattern.HorizontalScrollPercent, self.pattern.VerticalScrollPercent
+        # Without ScrollPattern, use the visible children's names as the position signature
+        return tuple(child.Name for child in self.container.GetChildren() if not child.IsOffscreen)
+
+
+AXES = {'vertical': ('up', 'down'), 'horizontal': ('left', 'right')}
+
+
+def wheel(direction, wheel_times, type=None, ua=ua, pg=pg):
+    """
+    Scroll the wheel at the current pointer position; left/right hold Shift.
+    type limits direction to one axis, as Scroll-Tool does. Callers pass
+    their traced ua/pg proxies so the wheel and key presses show up as input.
+    """
+    if type is not None:
+        if type not in AXES:
+            raise ValueError('Invalid type. Use "horizontal" or "vertical".')
+        if direction not in AXES[type]:
+            raise ValueError('Invalid direction. Use "{}" or "{}".'.format(*AXES[type]))
+    match direction:
+        case 'up':
+            ua.WheelUp(wheel_times)
+        case 'down':
+            ua.WheelDown(wheel_times)
+        case 'left' | 'right':
+            pg.keyDown('Shift')
+            pg.sleep(0.05)
+            (ua.WheelUp if direction == 'left' else ua.WheelDown)(wheel_times)
+            pg.sleep(0.05)
+            pg.keyUp('Shift')
+        case _:
+            raise ValueError('Invalid direction. Use "up", "down", "left" or "right".')
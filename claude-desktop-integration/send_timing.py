@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Send Path Timing
+Per-phase spans for the sender scripts, split into fixed sleeps, reply waits and useful work
+"""
+
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+
+def default_timing_dir():
+    # Set WARPAI_TIMING_DIR= (empty) to keep timings in memory only
+    value = os.environ.get('WARPAI_TIMING_DIR')
+    if value is None:
+        return Path.home() / '.warpai' / 'timing'
+    return Path(value) if value else None
+
+
+class SendRecord:
+    """
+    Spans for one send: each phase has its wall time, the part spent in
+    fixed sleeps (explicit timer.sleep calls plus pauses known to happen
+    inside a GUI call) and the part spent waiting for Claude Desktop.
+    Nested phases are named parent/child and roll up into their parent.
+    """
+
+    def __init__(self, name, **meta):
+        self.name = name
+        self.meta = meta
+        self.started = time.time()
+        self._t0 = time.perf_counter()
+        self.spans = []
+        self.stack = []
+        self.status = None
+        self.wall = None
+
+    def _elapsed(self):
+        return time.perf_counter() - self._t0
+
+    @contextmanager
+    def phase(self, name, wait=False, implied=0.0):
+        """implied: seconds the wrapped call sleeps internally, e.g. pyautogui.PAUSE"""
+        started = self._elapsed()
+        span = {'phase': '/'.join([s['phase'] for s in self.stack[-1:]] + [name]),
+                'start': round(started, 4), 'sleep': 0.0, 'waited': 0.0, 'wait': wait}
+        self.stack.append(span)
+        try:
+            yield span
+        finally:
+            self.stack.pop()
+            span['seconds'] = round(self._elapsed() - started, 4)
+            # Inner sleeps already count towards this span; implied pauses come on top, up to the span's length
+            span['sleep'] = round(min(span['seconds'], span['sleep'] + implied), 4)
+            if wait:
+                span['waited'] = span['seconds']
+            for parent in reversed(self.stack):
+                if wait:
+                    parent['waited'] += span['seconds']
+                else:
+                    parent['sleep'] += implied
+                if parent['wait']:
+                    break
+            span['waited'] = round(span['waited'], 4)
+            self.spans.append(span)
+
+    def sleep(self, seconds):
+        started = time.perf_counter()
+        time.sleep(seconds)
+        seconds = time.perf_counter() - started
+        # A wait phase absorbs the sleeps inside it, so they aren't counted twice further out
+        for span in reversed(self.stack):
+            span['sleep'] += seconds
+            if span['wait']:
+                break
+        if not self.stack:
+            self.spans.append({'phase': 'unphased', 'start': round(self._elapsed() - seconds, 4),
+                               'seconds': round(seconds, 4), 'sleep': round(seconds, 4), 'waited': 0.0, 'wait': False})
+
+    def totals(self):
+        """Wall, fixed sleep, wait and work seconds from the top-level spans"""
+        wall = self.wall if self.wall is not None else self._elapsed()
+        top = [s for s in self.spans if '/' not in s['phase']]
+        wait = sum(s['waited'] for s in top)
+        sleep = sum(s['sleep'] for s in top if not s['wait'])
+        return {'wall': round(wall, 3), 'sleep': round(sleep, 3), 'wait': round(wait, 3),
+                'work': round(max(0.0, wall - sleep - wait), 3)}
+
+    def summary(self):
+        return {'name': self.name, 'status': self.status, 'started': self.started, **self.meta,
+                **self.totals(), 'spans': sorted(self.spans, key=lambda s: s['start'])}
+
+
+class SendTimer:
+    """
+    Tracks the send in progress on each thread, appends every finished
+    send to requests.jsonl and writes one run-*.json with per-phase totals
+    when the script exits.
+    """
+
+    def __init__(self, out_dir=None, script=None):
+        # out_dir='' keeps everything in memory, like an empty WARPAI_TIMING_DIR
+        self.out_dir = default_timing_dir() if out_dir is None else (Path(out_dir) if out_dir else None)
+        self.script = script or Path(sys.argv[0] or 'python').stem
+        self.records = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._registered = False
+
+    @property
+    def current(self):
+        return getattr(self._local, 'record', None)
+
+    def start(self, name, **meta):
+        """Begin a send; the record stays current on this thread until finish()"""
+        record = SendRecord(name, **meta)
+        self._local.record = record
+        with self._lock:
+            if not self._registered:
+                atexit.register(self.write_run)
+                self._registered = True
+        return record
+
+    def finish(self, record, status='ok'):
+        if record is None or record.status is not None:
+            return record
+        record.status = status
+        record.wall = record._elapsed()
+        if self.current is record:
+            self._local.record = None
+        with self._lock:
+            self.records.append(record)
+        if self.out_dir is not None:
+            try:
+                self.out_dir.mkdir(parents=True, exist_ok=True)
+                with open(self.out_dir / 'requests.jsonl', 'a', encoding='utf-8') as f:
+                    f.write(json.dumps({'script': self.script, **record.summary()}) + '\n')
+            except OSError as e:
+                print(f"⚠️ Could not write send timing: {e}")
+        return record
+
+    @contextmanager
+    def phase(self, name, wait=False, implied=0.0, record=None):
+        """Span in the given or current send; a no-op outside one"""
+        record = record or self.current
+        if record is None:
+            yield None
+            return
+        with record.phase(name, wait, implied) as span:
+            yield span
+
+    def sleep(self, seconds):
+        """time.sleep that is booked as fixed delay in the current send"""
+        record = self.current
+        if record is None:
+            time.sleep(seconds)
+        else:
+            record.sleep(seconds)
+
+    def run_summary(self):
+        with self._lock:
+            records = list(self.records)
+        phases = {}
+        for record in records:
+            for span in record.spans:
+                entry = phases.setdefault(span['phase'], {'count': 0, 'seconds': 0.0, 'sleep': 0.0, 'waited': 0.0,
+                                                          'max': 0.0, 'wait': span['wait']})
+                entry['count'] += 1
+                entry['seconds'] += span['seconds']
+                entry['sleep'] += span['sleep']
+                entry['waited'] += span['waited']
+                entry['max'] = max(entry['max'], span['seconds'])
+        for entry in phases.values():
+            entry['mean'] = round(entry['seconds'] / entry['count'], 4)
+            entry['work'] = round(0.0 if entry['wait'] else max(0.0, entry['seconds'] - entry['sleep'] - entry['waited']), 4)
+            for key in ('seconds', 'sleep', 'waited', 'max'):
+                entry[key] = round(entry[key], 4)
+        totals = {key: round(sum(r.totals()[key] for r in records), 3) for key in ('wall', 'sleep', 'wait', 'work')}
+        return {'script': self.script, 'pid': os.getpid(), 'requests': len(records),
+                'statuses': {s: sum(r.status == s for r in records) for s in {r.status for r in records}},
+                'totals': totals, 'phases': dict(sorted(phases.items(), key=lambda kv: -kv[1]['seconds']))}
+
+    def report(self, top=5):
+        """A few lines for the console: totals and the phases that cost the most fixed sleep"""
+        summary = self.run_summary()
+        if not summary['requests']:
+            return "⏱️ No sends timed"
+        totals = summary['totals']
+        lines = [f"⏱️ {summary['requests']} sends: {totals['wall']:.1f}s total = "
+                 f"{totals['sleep']:.1f}s fixed sleep + {totals['wait']:.1f}s waiting + {totals['work']:.1f}s work"]
+        # Innermost phases only, so a parent doesn't repeat its children's sleeps
+        names = summary['phases']
+        leaves = [(name, p) for name, p in names.items()
+                  if not p['wait'] and not any(other.startswith(name + '/') for other in names)]
+        for name, p in sorted(leaves, key=lambda kv: -kv[1]['sleep'])[:top]:
+            lines.append(f"   {name:<24} {p['seconds']:6.2f}s ({p['sleep']:.2f}s sleep) x{p['count']}")
+        return '\n'.join(lines)
+
+    def write_run(self):
+        if self.out_dir is None or not self.records:
+            return None
+        path = self.out_dir / f"run-{time.strftime('%Y%m%d-%H%M%S')}-{self.script}-{os.getpid()}.json"
+        try:
+            self.out_dir.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.run_summary(), f, indent=2)
+        except OSError as e:
+            print(f"⚠️ Could not write run timing: {e}")
+            return None
+        return path
+
+
+timer = SendTimer()
@@ -7,7 +7,8 @@ Sends ALL instructions in ONE complete message to prevent partial responses
 import time
 import pyautogui as pg
 import pygetwindow as gw
-from pathlib import Path
+from bridge_spool import LOG_DIR, start_mirror, win_path
+from send_timing import timer
 
 pg.FAILSAFE = False
 pg.PAUSE = 0.3
@@ -15,46 +16,54 @@ pg.PAUSE = 0.3
 def send_complete_sky_test():
     """Send the ENTIRE sky color test instruction in ONE message"""
     
-    # Find Claude Desktop window
-    windows = gw.getAllWindows()
-    claude_window = None
+    # Timed until monitor_response sees the answer
+    record = timer.start("send_complete_sky_test")
     
-    for window in windows:
-        if window.visible and window.title and "claude" in window.title.lower():
-            if window.width > 500 and window.height > 400:
-                claude_window = window
-                break
+    # Find Claude Desktop window
+    with timer.phase("find_window"):
+        windows = gw.getAllWindows()
+        claude_window = None
+        
+        for window in windows:
+            if window.visible and window.title and "claude" in window.title.lower():
+                if window.width > 500 and window.height > 400:
+                    claude_window = window
+                    break
     
     if not claude_window:
         print("❌ Claude Desktop window not found!")
+        timer.finish(record, "no-window")
         return False
     
     print(f"🎯 Found Claude Desktop: {claude_window.title}")
     
     # Bring window to front and focus
-    claude_window.activate()
-    time.sleep(1)
+    with timer.phase("activate"):
+        claude_window.activate()
+        timer.sleep(1)
     
     # Click input area
     input_x = claude_window.left + claude_window.width // 2
     input_y = claude_window.top + claude_window.height - 80
-    pg.click(input_x, input_y)
-    time.sleep(0.5)
+    with timer.phase("click", implied=pg.PAUSE):
+        pg.click(input_x, input_y)
+        timer.sleep(0.5)
     
     # Clear input
-    pg.hotkey('ctrl', 'a')
-    time.sleep(0.2)
-    pg.press('backspace')
-    time.sleep(0.5)
+    with timer.phase("clear", implied=2 * pg.PAUSE):
+        pg.hotkey('ctrl', 'a')
+        timer.sleep(0.2)
+        pg.press('backspace')
+        timer.sleep(0.5)
     
     # THE COMPLETE MESSAGE - EVERYTHING IN ONE GO
-    complete_message = """Instructions:
+    complete_message = f"""Instructions:
 
 1. Answer this question: What color is the sky?
 2. Do NOT respond in this chat window at all
 3. Use ONLY the Powershell-Tool MCP to execute this exact command:
 
-Add-Content -Path "D:\\WarpAI_Portable\\logs\\sky_color_response.log" -Value "Sky color answer: [put your actual answer here]"
+Add-Content -Path "{win_path("sky_color_response.log")}" -Value "Sky color answer: [put your actual answer here]"
 
 Requirements:
 - ONLY use MCP Powershell-Tool to respond
@@ -68,12 +77,14 @@ Execute the MCP Powershell command now."""
     print("📝 Message length:", len(complete_message), "characters")
     
     # Type the ENTIRE message at once
-    pg.typewrite(complete_message, interval=0.008)  # Slightly faster typing
-    time.sleep(1)  # Give a moment before sending
+    with timer.phase("type", implied=len(complete_message) * 0.008 + pg.PAUSE):
+        pg.typewrite(complete_message, interval=0.008)  # Slightly faster typing
+        timer.sleep(1)  # Give a moment before sending
     
     # Send the complete message
     print("📤 Sending complete message...")
-    pg.press('enter')
+    with timer.phase("send", implied=pg.PAUSE):
+        pg.press('enter')
     
     print("✅ COMPLETE sky color test message sent in ONE message!")
     return True
@@ -81,7 +92,8 @@ Execute the MCP Powershell command now."""
 def monitor_response():
     """Monitor for the MCP response in the log file"""
     
-    log_path = Path("D:/WarpAI_Portable/logs/sky_color_response.log")
+    log_path = LOG_DIR / "sky_color_response.log"
+    record = timer.current
     
     # Clear existing log
     if log_path.exists():
@@ -93,33 +105,40 @@ def monitor_response():
     start_time = time.time()
     timeout = 60  # 60 seconds
     
-    while time.time() - start_time < timeout:
-        time.sleep(2)
-        
-        if log_path.exists():
-            try:
-                with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read().strip()
-                
-                if content:
-                    print(f"\n🎉 SUCCESS! MCP Response received:")
-                    print(f"📝 {content}")
+    with timer.phase("wait_reply", wait=True, record=record):
+        while time.time() - start_time < timeout:
+            time.sleep(2)
+            
+            if log_path.exists():
+                try:
+                    with open(log_path, 'r', encoding='utf-8', errors='ignore') as f:
+                        content = f.read().strip()
                     
-                    # Validate response
-                    sky_colors = ['blue', 'gray', 'grey', 'white', 'clear', 'cloudy', 'overcast']
-                    if any(color in content.lower() for color in sky_colors):
-                        print("✅ Valid sky color response detected!")
-                        return True
-                    else:
-                        print("⚠️ Response received but no clear sky color")
-                        return True
+                    if content:
+                        print(f"\n🎉 SUCCESS! MCP Response received:")
+                        print(f"📝 {content}")
                         
-            except Exception as e:
-                print(f"⚠️ Error reading log: {e}")
-        
-        elapsed = int(time.time() - start_time)
-        print(f"⏳ Waiting... {elapsed}s")
-    
+                        # Validate response
+                        sky_colors = ['blue', 'gray', 'grey', 'white', 'clear', 'cloudy', 'overcast']
+                        if any(color in content.lower() for color in sky_colors):
+                            print("✅ Valid sky color response detected!")
+                        else:
+                            print("⚠️ Response received but no clear sky color")
+                        break
+                            
+                except Exception as e:
+                    print(f"⚠️ Error reading log: {e}")
+            
+            elapsed = int(time.time() - start_time)
+            print(f"⏳ Waiting... {elapsed}s")
+        else:
+            content = None
+    
+    if content:
+        timer.finish(record, "reply")
+        return True
+    
+    timer.finish(record, "timeout")
     print("\n⏱️ Timeout reached - no MCP response")
     return False
 
@@ -156,7 +175,9 @@ def main():
         print("\n❌ TEST FAILED!")
         print("💬 Check if Claude responded in chat instead of using MCP")
     
+    print(f"\n{timer.report()}")
     print("\n👋 Test complete!")
 
 if __name__ == "__main__":
+    start_mirror()
     main()
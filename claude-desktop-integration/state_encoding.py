@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+State-Tool Output Encodings
+Verbose prose block and a token-budgeted columnar table built from a CompactTree or TreeStateView
+"""
+
+from math import hypot
+from textwrap import dedent
+
+CHARS_PER_TOKEN = 4
+LABEL_WIDTH = 40
+SECTION_HEADERS = (
+    '#interactive id|app|type|name|x,y|shortcut',
+    '#scrollable id|app|type|name|x,y|axes',
+    '#informative id|app|text',
+)
+
+
+def estimate_tokens(text):
+    """Rough token count used for budgeting (about four characters per token)"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def encode_verbose(tree, apps, active_app):
+    """The original State-Tool prose block"""
+    interactive_elements = tree.interactive_elements_to_string()
+    informative_elements = tree.informative_elements_to_string()
+    scrollable_elements = tree.scrollable_elements_to_string()
+    return dedent(f'''
+    Focused App:
+    {active_app}
+
+    Opened Apps:
+    {apps}
+
+    List of Interactive Elements:
+    {interactive_elements or 'No interactive elements found.'}
+
+    List of Informative Elements:
+    {informative_elements or 'No informative elements found.'}
+
+    List of Scrollable Elements:
+    {scrollable_elements or 'No scrollable elements found.'}
+    ''')
+
+
+def short_id(prefix, index):
+    """Base36 element id such as i0, i1z or s3"""
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    text = ''
+    while True:
+        index, rest = divmod(index, 36)
+        text = digits[rest] + text
+        if not index:
+            return prefix + text
+
+
+def truncate(label, width=LABEL_WIDTH):
+    label = ' '.join((label or '').split()).replace('|', '/')
+    if len(label) > width:
+        return label[:width - 1] + '…'
+    return label
+
+
+class CompactEncoder:
+    """
+    Columnar State-Tool encoding.
+
+    App names are written once in a legend and referenced as a0, a1, ...;
+    every element gets a short id (i* interactive, t* informative, s* scrollable).
+    With max_tokens set, rows are kept in priority order (focused app first,
+    then by distance to the cursor) until the budget is spent, and are then
+    printed in their original order.
+    """
+
+    def __init__(self, tree, apps=(), focused_app=None, cursor=None, label_width=LABEL_WIDTH):
+        self.tree = tree
+        self.focused_app = focused_app
+        self.cursor = cursor
+        self.label_width = label_width
+        self.app_ids = {}
+        for name in apps:
+            self._app_id(name)
+        if focused_app:
+            self._app_id(focused_app)
+
+    def _app_id(self, name):
+        name = name or ''
+        if name not in self.app_ids:
+            self.app_ids[name] = f'a{len(self.app_ids)}'
+        return self.app_ids[name]
+
+    def _distance(self, x, y):
+        if self.cursor is None:
+            return 0.0
+        return hypot(x - self.cursor[0], y - self.cursor[1])
+
+    def _rows(self):
+        """Yield (priority, section, index, row text) for every element"""
+        tree = self.tree
+        focused = self.focused_app
+        width = self.label_width
+
+        for index, (app, control_type, name, shortcut, x, y) in enumerate(tree.iter_interactive()):
+            row = (f'{short_id("i", index)}|{self._app_id(app)}|{control_type}|'
+                   f'{truncate(name, width)}|{x},{y}|{shortcut or ""}')
+            yield (app != focused, 0, self._distance(x, y)), 0, index, row
+
+        for index, (app, control_type, name, x, y, horizontal, vertical) in enumerate(tree.iter_scrollable()):
+            axes = ('h' if horizontal else '') + ('v' if vertical else '')
+            row = (f'{short_id("s", index)}|{self._app_id(app)}|{control_type}|'
+                   f'{truncate(name, width)}|{x},{y}|{axes}')
+            yield (app != focused, 1, self._distance(x, y)), 1, index, row
+
+        for index, (app, name) in enumerate(tree.iter_informative()):
+            row = f'{short_id("t", index)}|{self._app_id(app)}|{truncate(name, width)}'
+            yield (app != focused, 2, float(index)), 2, index, row
+
+    def encode(self, max_tokens=None):
+        rows = list(self._rows())
+        total = len(rows)
+        if max_tokens is not None:
+            rows.sort(key=lambda item: item[0])
+            # Headers and the app legend are always sent, so reserve them first
+            budget = max_tokens * CHARS_PER_TOKEN - len(self._header(total, total))
+            budget -= sum(len(header) + 1 for header in SECTION_HEADERS)
+            kept = []
+            for item in rows:
+                cost = len(item[3]) + 1
+                if cost > budget:
+                    continue
+                budget -= cost
+                kept.append(item)
+            rows = kept
+        rows.sort(key=lambda item: (item[1], item[2]))
+        sections = ([], [], [])
+        for _, section, _, row in rows:
+            sections[section].append(row)
+        omitted = total - len(rows)
+
+        lines = [self._header(total, omitted)]
+        for header, section in zip(SECTION_HEADERS, sections):
+            lines.append(header)
+            lines.extend(section)
+        return '\n'.join(lines)
+
+    def _header(self, total, omitted):
+        legend = ' '.join(f'{app_id}={truncate(name, self.label_width)}{"*" if name == self.focused_app else ""}'
+                          for name, app_id in self.app_ids.items())
+        header = f'#apps (*=focused) {legend}'
+        if self.cursor is not None:
+            header += f'\n#cursor {self.cursor[0]},{self.cursor[1]}'
+        if omitted:
+            header += f'\n#omitted {omitted} of {total} elements over token budget'
+        return header
+
+
+def encode_compact(tree, apps=(), focused_app=None, cursor=None, max_tokens=None, label_width=LABEL_WIDTH):
+    """Columnar State-Tool encoding, optionally trimmed to max_tokens"""
+    return CompactEncoder(tree, apps, focused_app, cursor, label_width).encode(max_tokens)
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+App Index Tests
+Builds AppIndex over a temporary Start Menu tree (python -m pytest test_app_index.py, or run directly)
+"""
+
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import app_index
+from app_index import AppIndex, normalize
+
+
+class AppIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        base = Path(self.temp.name)
+        self.root = base / 'Start Menu' / 'Programs'
+        self.shortcut('Notepad++.lnk')
+        self.shortcut('Accessories', 'Notepad.lnk')
+        self.shortcut('Accessories', 'Paint.lnk')
+        self.shortcut('Visual Studio Code', 'Visual Studio Code.lnk')
+        self.shortcut('C#.lnk')
+        self.shortcut('C.lnk')
+        self.registered = [('Calculator', 'Microsoft.WindowsCalculator_8wekyb3d8bbwe!App')]
+        self.index = AppIndex(roots=[str(self.root)], index_path=str(base / 'app_index.json'),
+                              registered=lambda: self.registered)
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def shortcut(self, *parts):
+        path = self.root.joinpath(*parts)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text('')
+        return path
+
+    def touch_dir(self, path):
+        # Some filesystems only have second resolution; push the mtime forward explicitly
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+    def test_exact_prefix_and_fuzzy(self):
+        self.assertEqual(self.index.resolve('paint').name, 'Paint')
+        self.assertEqual(self.index.resolve('calculator').app_id, 'Microsoft.WindowsCalculator_8wekyb3d8bbwe!App')
+        self.assertEqual(self.index.resolve('calc').name, 'Calculator')
+        self.assertEqual(self.index.resolve('code').name, 'Visual Studio Code')
+        self.assertEqual(self.index.resolve('visual studo code').name, 'Visual Studio Code')
+
+    def test_punctuation_collisions(self):
+        self.assertEqual(normalize('Notepad++'), normalize('Notepad'))
+        self.assertEqual(self.index.resolve('notepad').name, 'Notepad')
+        self.assertEqual(self.index.resolve('Notepad++').name, 'Notepad++')
+        self.assertEqual(self.index.resolve('c#').name, 'C#')
+        self.assertEqual(self.index.resolve('C').name, 'C')
+        # Exact name first, the other app under the same key after it
+        self.assertEqual([entry.name for entry in self.index.lookup('notepad', limit=2)], ['Notepad', 'Notepad++'])
+
+    def test_incremental_refresh(self):
+        self.index.ensure_loaded()
+        self.assertEqual(self.index.refresh(), 0)
+        self.shortcut('Accessories', 'WordPad.lnk')
+        self.touch_dir(self.root / 'Accessories')
+        self.assertEqual(self.index.refresh(), 1)  # Only the changed folder is listed again
+        self.assertEqual(self.index.resolve('wordpad').name, 'WordPad')
+
+        (self.root / 'Accessories' / 'Paint.lnk').unlink()
+        self.touch_dir(self.root / 'Accessories')
+        self.index.refresh()
+        self.assertNotEqual(getattr(self.index.resolve('paint'), 'name', None), 'Paint')
+
+        reloaded = AppIndex(roots=[str(self.root)], index_path=self.index.index_path, registered=lambda: [])
+        self.assertEqual(reloaded.resolve('wordpad').name, 'WordPad')
+
+    def test_miss_refreshes_once(self):
+        self.index.ensure_loaded()
+        self.shortcut('Blender.lnk')
+        self.touch_dir(self.root)
+        self.assertEqual(self.index.resolve('blender').name, 'Blender')
+
+        self.shortcut('Gimp.lnk')
+        self.touch_dir(self.root)
+        # A second miss inside the interval does not rescan
+        self.assertNotEqual(getattr(self.index.resolve('gimp'), 'name', None), 'Gimp')
+        self.index._miss_refreshed = time.monotonic() - app_index.MISS_REFRESH_INTERVAL
+        self.assertEqual(self.index.resolve('gimp').name, 'Gimp')
+
+
+if __name__ == '__main__':
+    unittest.main()
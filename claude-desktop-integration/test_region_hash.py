@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Region Hash Tests
+Verify-Region verdicts on synthetic screens (python -m pytest test_region_hash.py, or run directly)
+"""
+
+import unittest
+
+from PIL import Image, ImageDraw
+
+from region_hash import THRESHOLD, RegionVerifier, fingerprint, similarity
+
+
+def screen(width, height):
+    """A plain desktop-like scene: rows of menu text, a text field and an empty checkbox"""
+    image = Image.new('RGB', (width, height), (240, 240, 240))
+    draw = ImageDraw.Draw(image)
+    for y in range(0, height, 40):
+        draw.text((20, y + 5), 'File Edit View Window Help lorem ipsum dolor', fill=(30, 30, 30))
+    draw.rectangle((100, 100, 500, 130), outline=(0, 0, 0), fill=(255, 255, 255))
+    draw.rectangle((300, 300, 313, 313), outline=(0, 0, 0), fill=(255, 255, 255))
+    return image
+
+
+def typed(image):
+    image = image.copy()
+    ImageDraw.Draw(image).text((105, 110), 'hello world', fill=(0, 0, 0))
+    return image
+
+
+def checked(image):
+    image = image.copy()
+    ImageDraw.Draw(image).line((302, 306, 306, 311, 312, 301), fill=(0, 0, 0), width=2)
+    return image
+
+
+def score(before, after, region=None):
+    region = region or (0, 0) + before.size
+    return similarity(fingerprint(before.crop(region)), fingerprint(after.crop(region)))
+
+
+class SimilarityTest(unittest.TestCase):
+    def test_identical_is_unchanged(self):
+        image = screen(1920, 1080)
+        self.assertEqual(score(image, image.copy()), 1.0)
+
+    def test_small_changes_fall_below_threshold(self):
+        full = screen(1920, 1080)
+        self.assertLess(score(full, typed(full)), THRESHOLD)
+        self.assertLess(score(full, typed(full), (0, 0, 400, 400)), THRESHOLD)
+        small = screen(800, 600)
+        self.assertLess(score(small, checked(small)), THRESHOLD)
+
+    def test_caret_on_full_screen_is_unchanged(self):
+        image = screen(1920, 1080)
+        caret = image.copy()
+        ImageDraw.Draw(caret).line((110, 105, 110, 125), fill=(0, 0, 0))
+        self.assertGreaterEqual(score(image, caret), THRESHOLD)
+
+    def test_size_mismatch(self):
+        image = screen(800, 600)
+        self.assertEqual(similarity(fingerprint(image), fingerprint(image.crop((0, 0, 400, 300)))), 0.0)
+
+
+class RegionVerifierTest(unittest.TestCase):
+    def setUp(self):
+        self.current = screen(800, 600)
+        self.grabbed = []
+
+        def capture(bbox):
+            self.grabbed.append(bbox)
+            return self.current.crop(bbox)
+        self.verifier = RegionVerifier(capture=capture)
+
+    def test_previous_check_and_reference(self):
+        region = (280, 280, 330, 330)
+        first = self.verifier.verify(region, save_as='before')
+        self.assertFalse(first.changed)
+        self.assertFalse(self.verifier.verify(region).changed)
+
+        self.current = checked(self.current)
+        verdict = self.verifier.verify(region)
+        self.assertTrue(verdict.changed)
+        self.assertEqual(verdict.compared_to, 'previous check')
+        self.assertFalse(self.verifier.verify(region).changed)
+        self.assertTrue(self.verifier.verify(region, reference='before').changed)
+        # Only the rectangle itself is ever captured
+        self.assertEqual(set(self.grabbed), {region})
+
+    def test_unknown_reference(self):
+        with self.assertRaises(KeyError):
+            self.verifier.verify((0, 0, 10, 10), reference='missing')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Tool-Call Trace Recorder
+Opt-in NDJSON trace of every MCP tool call with per-phase timing
+"""
+
+import functools
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from clipboard_watch import content_hash
+
+TRACE_VERSION = 1
+
+# Arguments carrying user text (typed input, clipboard contents); traced as length and hash
+# unless WINDOWS_MCP_TRACE_TEXT=1
+REDACTED_ARGS = {'Type-Tool': ('text',), 'Clipboard-Tool': ('text',)}
+
+# pyautogui functions that sleep pyautogui.PAUSE after acting (unless called with _pause=False)
+PYAUTOGUI_PAUSED = frozenset({
+    'click', 'doubleClick', 'tripleClick', 'rightClick', 'middleClick', 'mouseDown', 'mouseUp',
+    'moveTo', 'moveRel', 'move', 'dragTo', 'dragRel', 'drag', 'scroll', 'hscroll', 'vscroll',
+    'press', 'keyDown', 'keyUp', 'hotkey', 'typewrite', 'write',
+})
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): _jsonable(item) for key, item in value.items()}
+    if isinstance(value, bytes):
+        return f'<{len(value)} bytes>'
+    return repr(value)
+
+
+def redact(text):
+    return {'redacted': len(text), 'sha256': content_hash(text)}
+
+
+def restore_args(args):
+    """Recorded arguments with redacted text replaced by filler of the same length, for replay"""
+    return {key: 'x' * value['redacted'] if isinstance(value, dict) and 'redacted' in value else value
+            for key, value in args.items()}
+
+
+def result_size(result):
+    """Characters of text (or bytes of image data) a tool result carries"""
+    if isinstance(result, str):
+        return len(result)
+    if isinstance(result, (bytes, bytearray)):
+        return len(result)
+    if isinstance(result, (list, tuple)):
+        return sum(result_size(item) for item in result)
+    data = getattr(result, 'data', None)
+    if data is not None:
+        return result_size(data)
+    return len(str(result))
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile (0.0 for no values), shared by the replay and load-test reports"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))]
+
+
+def pyautogui_pacing(pg, paused=PYAUTOGUI_PAUSED):
+    """
+    Pacing callable for instrument(): the fixed sleeps pyautogui adds inside
+    a call, i.e. pg.PAUSE after every paused function plus typewrite's
+    per-character interval. pg.PAUSE is read at call time.
+    """
+    def pacing(name, args, kwargs):
+        if name not in paused or kwargs.get('_pause', True) is False:
+            return 0.0
+        seconds = pg.PAUSE
+        if name in ('typewrite', 'write'):
+            text = args[0] if args else kwargs.get('message', '')
+            interval = args[1] if len(args) > 1 else kwargs.get('interval', 0.0)
+            seconds += len(text) * interval
+        return seconds
+    return pacing
+
+
+def uiautomation_pacing(ua):
+    """Pacing callable for instrument(): WheelUp/WheelDown sleep interval per notch plus waitTime at the end"""
+    def pacing(name, args, kwargs):
+        if name not in ('WheelUp', 'WheelDown'):
+            return 0.0
+        times = args[0] if args else kwargs.get('wheelTimes', 1)
+        interval = args[1] if len(args) > 1 else kwargs.get('interval', 0.05)
+        wait = args[2] if len(args) > 2 else kwargs.get('waitTime', ua.OPERATION_WAIT_TIME)
+        return times * interval + wait
+    return pacing
+
+
+class _Call:
+    __slots__ = ('phases', 'depth')
+
+    def __init__(self):
+        self.phases = {}
+        self.depth = 0
+
+
+class _Instrumented:
+    """Attribute proxy that times every method call of obj as a trace phase"""
+
+    def __init__(self, recorder, obj, phase, overrides, pacing):
+        object.__setattr__(self, '_recorder', recorder)
+        object.__setattr__(self, '_obj', obj)
+        object.__setattr__(self, '_phase', phase)
+        object.__setattr__(self, '_overrides', overrides)
+        object.__setattr__(self, '_pacing', pacing)
+
+    def __getattr__(self, name):
+        value = getattr(self._obj, name)
+        if not callable(value) or isinstance(value, type):
+            return value
+        phase = self._overrides.get(name, self._phase)
+        recorder, pacing = self._recorder, self._pacing
+
+        @functools.wraps(value)
+        def timed(*args, **kwargs):
+            with recorder.phase(phase, pacing(name, args, kwargs) if pacing else 0.0):
+                return value(*args, **kwargs)
+        return timed
+
+    def __setattr__(self, name, value):
+        setattr(self._obj, name, value)
+
+
+class TraceRecorder:
+    """
+    Writes one JSON line per tool call: tool name, arguments, result size,
+    wall time and the time spent in named phases (backend, input, motion,
+    pacing). Disabled unless a path is given or WINDOWS_MCP_TRACE is set, in
+    which case phase() and instrument() cost nothing.
+
+    Every function decorated with tool() is also registered in self.tools so
+    a replay can call it by its MCP name. Text typed or copied (REDACTED_ARGS)
+    is recorded only as its length and hash unless keep_text is set.
+    """
+
+    def __init__(self, path=None, sink=None, meta=None, keep_text=None):
+        self.path = path if path is not None else os.environ.get('WINDOWS_MCP_TRACE')
+        self.sink = sink
+        self.enabled = bool(self.path or sink is not None)
+        self.tools = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._file = None
+        self.meta = meta or {}
+        self.keep_text = keep_text if keep_text is not None else os.environ.get('WINDOWS_MCP_TRACE_TEXT') == '1'
+
+    def _write(self, record):
+        line = json.dumps(record, separators=(',', ':'), ensure_ascii=False)
+        with self._lock:
+            if self.sink is not None:
+                self.sink.append(record)
+                return
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+                header = {'type': 'header', 'version': TRACE_VERSION, 'pid': os.getpid(),
+                          'started': datetime.now(timezone.utc).isoformat(), **self.meta}
+                self._file.write(json.dumps(header, separators=(',', ':')) + '\n')
+            self._file.write(line + '\n')
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    @contextmanager
+    def phase(self, name, pacing=0.0):
+        """
+        Attribute the enclosed time to a phase of the current tool call;
+        up to `pacing` seconds of it are known fixed sleeps and go to 'pacing'
+        """
+        call = getattr(self._local, 'call', None)
+        if not self.enabled or call is None or call.depth:
+            # Nested phases are counted once, by the outermost one
+            yield
+            return
+        call.depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            call.depth -= 1
+            elapsed = time.perf_counter() - start
+            paced = min(elapsed, pacing)
+            call.phases[name] = call.phases.get(name, 0.0) + elapsed - paced
+            if paced:
+                call.phases['pacing'] = call.phases.get('pacing', 0.0) + paced
+
+    def instrument(self, obj, phase, overrides=None, pacing=None):
+        """
+        Proxy obj so its method calls count towards phase (obj itself when
+        disabled). pacing(name, args, kwargs) returns the seconds a call
+        sleeps internally, which are booked as 'pacing' instead.
+        """
+        if not self.enabled:
+            return obj
+        return _Instrumented(self, obj, phase, overrides or {}, pacing)
+
+    def tool(self, name):
+        """Decorator recording each call of a (synchronous) tool function"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                call = self._local.call = _Call()
+                start = time.perf_counter()
+                error, result = None, None
+                try:
+                    result = fn(*args, **kwargs)
+                    return result
+                except Exception as e:
+                    error = f'{type(e).__name__}: {e}'
+                    raise
+                finally:
+                    wall = time.perf_counter() - start
+                    self._local.call = None
+                    phases = {key: round(value * 1000, 3) for key, value in call.phases.items()}
+                    phases['other'] = round(max(0.0, wall * 1000 - sum(phases.values())), 3)
+                    arguments = dict(zip(fn.__code__.co_varnames, args)) | kwargs
+                    if not self.keep_text:
+                        for key in REDACTED_ARGS.get(name, ()):
+                            if isinstance(arguments.get(key), str):
+                                arguments[key] = redact(arguments[key])
+                    self._write({
+                        'type': 'call',
+                        'ts': time.time(),
+                        'tool': name,
+                        'args': _jsonable(arguments),
+                        'result_size': result_size(result) if error is None else 0,
+                        'wall_ms': round(wall * 1000, 3),
+                        'phases': phases,
+                        'error': error,
+                    })
+            self.tools[name] = wrapper
+            return wrapper
+        return decorator
+
+
+def load_trace(path):
+    """Call records of an NDJSON trace, skipping headers"""
+    records = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                if record.get('type') == 'call':
+                    records.append(record)
+    return records
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Trace Replay Profiler
+Re-runs a recorded tool-call trace against the fake or real backend and summarizes latency
+
+Usage:
+    python trace_replay.py summary session.ndjson [other.ndjson]
+    python trace_replay.py replay session.ndjson --backend fake --out replay.ndjson
+    python trace_replay.py folded session.ndjson > session.folded
+"""
+
+import argparse
+import os
+import time
+from collections import defaultdict
+
+from tool_trace import TraceRecorder, load_trace, percentile, restore_args
+
+BAR_WIDTH = 40
+
+
+def aggregate(records):
+    """tool -> {'walls': [...], 'phases': {phase: total_ms}, 'bytes': total}"""
+    tools = defaultdict(lambda: {'walls': [], 'phases': defaultdict(float), 'bytes': 0, 'errors': 0})
+    for record in records:
+        entry = tools[record['tool']]
+        entry['walls'].append(record['wall_ms'])
+        entry['bytes'] += record.get('result_size', 0)
+        entry['errors'] += bool(record.get('error'))
+        for phase, ms in record.get('phases', {}).items():
+            entry['phases'][phase] += ms
+    return tools
+
+
+def folded(records):
+    """Flame-graph folded stacks: 'tool;phase total_ms' (feed to flamegraph.pl or speedscope)"""
+    lines = []
+    for tool, entry in sorted(aggregate(records).items()):
+        for phase, ms in sorted(entry['phases'].items()):
+            if ms > 0:
+                lines.append(f'{tool};{phase} {int(round(ms))}')
+    return '\n'.join(lines)
+
+
+def summary(records, baseline=None):
+    """Flame-style text summary: one bar per tool split by phase, slowest first"""
+    tools = aggregate(records)
+    base = aggregate(baseline) if baseline else {}
+    total = sum(sum(entry['walls']) for entry in tools.values()) or 1.0
+    phases = sorted({phase for entry in tools.values() for phase in entry['phases']})
+    glyphs = {phase: glyph for phase, glyph in zip(phases, '#=%*+~-.:o')}
+
+    lines = [f"{len(records)} calls, {total / 1000:.2f}s total tool time",
+             'legend: ' + ' '.join(f'{glyph}={phase}' for phase, glyph in glyphs.items()),
+             f"{'tool':<16} {'calls':>5} {'total_ms':>10} {'p50_ms':>8} {'p95_ms':>8} {'kB_out':>8}"
+             + ('  delta_vs_base' if baseline else '')]
+    for tool, entry in sorted(tools.items(), key=lambda item: -sum(item[1]['walls'])):
+        walls = entry['walls']
+        tool_total = sum(walls)
+        line = (f"{tool:<16} {len(walls):>5} {tool_total:>10.1f} {percentile(walls, 0.5):>8.1f} "
+                f"{percentile(walls, 0.95):>8.1f} {entry['bytes'] / 1000:>8.1f}")
+        if baseline:
+            before = base.get(tool)
+            if before and before['walls']:
+                mean, base_mean = tool_total / len(walls), sum(before['walls']) / len(before['walls'])
+                line += f"  {(mean - base_mean) / base_mean * 100:+.1f}% mean"
+            else:
+                line += '  (new)'
+        bar = ''.join(glyphs[phase] * int(round(ms / total * BAR_WIDTH))
+                      for phase, ms in sorted(entry['phases'].items()))
+        lines.append(line)
+        lines.append(f"{'':<16} |{bar}")
+    return '\n'.join(lines)
+
+
+def backend_tools(backend, out, scale):
+    if backend == 'real':
+        # main.py builds its TraceRecorder from the environment at import time
+        os.environ['WINDOWS_MCP_TRACE'] = out
+        import main
+        return main.tracer.tools, main.tracer
+    from fake_backend import FakeBackend
+    fake = FakeBackend(tracer=TraceRecorder(path=out, meta={'backend': 'fake'}), scale=scale)
+    return fake.tools, fake.tracer
+
+
+def replay(records, backend='fake', out='replay.ndjson', scale=1.0, keep_gaps=False):
+    """Call every recorded tool again in order; returns the new trace's call records"""
+    if os.path.exists(out):
+        os.remove(out)
+    tools, tracer = backend_tools(backend, out, scale)
+    # A partial replay would compare against a baseline with different calls, so refuse it up front
+    missing = sorted({record['tool'] for record in records} - set(tools))
+    if missing:
+        tracer.close()
+        raise ValueError(f"Not available on the {backend} backend: {', '.join(missing)}")
+    previous = None
+    for record in records:
+        if keep_gaps and previous is not None:
+            time.sleep(max(0.0, record['ts'] - previous['ts'] - previous['wall_ms'] / 1000))
+        previous = record
+        try:
+            tools[record['tool']](**restore_args(record['args']))
+        except Exception as e:
+            print(f"⚠️ {record['tool']} failed during replay: {e}")
+    tracer.close()
+    return load_trace(out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Summarize or replay windows-mcp tool traces')
+    commands = parser.add_subparsers(dest='command', required=True)
+    summarize = commands.add_parser('summary')
+    summarize.add_argument('trace')
+    summarize.add_argument('baseline', nargs='?')
+    fold = commands.add_parser('folded')
+    fold.add_argument('trace')
+    rerun = commands.add_parser('replay')
+    rerun.add_argument('trace')
+    rerun.add_argument('--backend', choices=('fake', 'real'), default='fake')
+    rerun.add_argument('--out', default='replay.ndjson')
+    rerun.add_argument('--scale', type=float, default=1.0, help='fake backend latency multiplier')
+    rerun.add_argument('--keep-gaps', action='store_true', help='sleep for the think time between calls')
+    args = parser.parse_args()
+
+    if args.command == 'summary':
+        baseline = load_trace(args.baseline) if args.baseline else None
+        print(summary(load_trace(args.trace), baseline))
+    elif args.command == 'folded':
+        print(folded(load_trace(args.trace)))
+    else:
+        original = load_trace(args.trace)
+        replayed = replay(original, args.backend, args.out, args.scale, args.keep_gaps)
+        print(f"🔁 Replayed {len(replayed)} calls on the {args.backend} backend -> {args.out}\n")
+        print(summary(replayed, original))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Compact UI Tree Storage
+Struct-of-arrays element storage with interned strings, streamed formatters and a copy-free TreeState view
+"""
+
+import io
+import sys
+from array import array
+from itertools import islice
+
+CHUNK_SIZE = 1024
+
+
+class StringTable:
+    """Interns strings and hands out small integer ids for them"""
+
+    __slots__ = ('_ids', 'values')
+
+    def __init__(self):
+        self._ids = {}
+        self.values = []
+
+    def add(self, value):
+        value = value or ''
+        index = self._ids.get(value)
+        if index is None:
+            index = len(self.values)
+            value = sys.intern(value)
+            self._ids[value] = index
+            self.values.append(value)
+        return index
+
+    def __len__(self):
+        return len(self.values)
+
+
+class CompactTree:
+    """
+    Column storage for interactive, informative and scrollable elements.
+
+    Every text field (app name, control type, element name, shortcut) is stored
+    as an index into a shared StringTable, coordinates live in typed arrays, so a
+    100k element tree costs a few bytes per column instead of a dataclass each.
+    """
+
+    __slots__ = (
+        'strings',
+        'i_app', 'i_type', 'i_name', 'i_shortcut', 'i_x', 'i_y',
+        't_app', 't_name',
+        's_app', 's_type', 's_name', 's_x', 's_y', 's_flags',
+    )
+
+    HORIZONTAL = 1
+    VERTICAL = 2
+
+    def __init__(self):
+        self.strings = StringTable()
+        self.i_app, self.i_type, self.i_name, self.i_shortcut = array('I'), array('I'), array('I'), array('I')
+        self.i_x, self.i_y = array('i'), array('i')
+        self.t_app, self.t_name = array('I'), array('I')
+        self.s_app, self.s_type, self.s_name = array('I'), array('I'), array('I')
+        self.s_x, self.s_y = array('i'), array('i')
+        self.s_flags = array('B')
+
+    # Building
+
+    def add_interactive(self, app_name, control_type, name, shortcut, x, y):
+        add = self.strings.add
+        self.i_app.append(add(app_name))
+        self.i_type.append(add(control_type))
+        self.i_name.append(add(name))
+        self.i_shortcut.append(add(shortcut))
+        self.i_x.append(int(x))
+        self.i_y.append(int(y))
+
+    def add_informative(self, app_name, name):
+        add = self.strings.add
+        self.t_app.append(add(app_name))
+        self.t_name.append(add(name))
+
+    def add_scrollable(self, app_name, control_type, name, x, y, horizontal=False, vertical=False):
+        add = self.strings.add
+        self.s_app.append(add(app_name))
+        self.s_type.append(add(control_type))
+        self.s_name.append(add(name))
+        self.s_x.append(int(x))
+        self.s_y.append(int(y))
+        self.s_flags.append((self.HORIZONTAL if horizontal else 0) | (self.VERTICAL if vertical else 0))
+
+    @classmethod
+    def from_tree_state(cls, tree_state):
+        """Build compact storage from a src.desktop TreeState"""
+        tree = cls()
+        for node in tree_state.interactive_nodes:
+            tree.add_interactive(node.app_name, node.control_type, node.name,
+                                 node.shortcut, node.center.x, node.center.y)
+        for node in tree_state.informative_nodes:
+            tree.add_informative(node.app_name, node.name)
+        for node in tree_state.scrollable_nodes:
+            tree.add_scrollable(node.app_name, node.control_type, node.name,
+                                node.center.x, node.center.y,
+                                node.horizontal_scrollable, node.vertical_scrollable)
+        return tree
+
+    # Rows, in the shape the encoders read
+
+    def iter_interactive(self):
+        """(app, control type, name, shortcut, x, y) per interactive element"""
+        return zip(self._column(self.i_app), self._column(self.i_type), self._column(self.i_name),
+                   self._column(self.i_shortcut), self.i_x, self.i_y)
+
+    def iter_informative(self):
+        """(app, name) per informative element"""
+        return zip(self._column(self.t_app), self._column(self.t_name))
+
+    def iter_scrollable(self):
+        """(app, control type, name, x, y, horizontal, vertical) per scrollable element"""
+        for app, control_type, name, x, y, flags in zip(
+                self._column(self.s_app), self._column(self.s_type), self._column(self.s_name),
+                self.s_x, self.s_y, self.s_flags):
+            yield app, control_type, name, x, y, bool(flags & self.HORIZONTAL), bool(flags & self.VERTICAL)
+
+    # Sizes
+
+    @property
+    def interactive_count(self):
+        return len(self.i_name)
+
+    @property
+    def informative_count(self):
+        return len(self.t_name)
+
+    @property
+    def scrollable_count(self):
+        return len(self.s_name)
+
+    def nbytes(self):
+        """Approximate memory held by the columns and the string table"""
+        columns = sum(getattr(self, slot).buffer_info()[1] * getattr(self, slot).itemsize
+                      for slot in self.__slots__ if slot != 'strings')
+        strings = sum(sys.getsizeof(value) for value in self.strings.values)
+        return columns + strings + sys.getsizeof(self.strings.values) + sys.getsizeof(self.strings._ids)
+
+    # Streamed formatting
+
+    def _column(self, ids):
+        return map(self.strings.values.__getitem__, ids)
+
+    def iter_interactive_lines(self):
+        rows = zip(self._column(self.i_app), self._column(self.i_type), self._column(self.i_name),
+                   self._column(self.i_shortcut), self.i_x, self.i_y)
+        for index, (app, control_type, name, shortcut, x, y) in enumerate(rows):
+            yield (f'Label: {index} App Name: {app} ControlType: {control_type} Control Name: {name} '
+                   f'Shortcut: {shortcut} Cordinates: ({x},{y})')
+
+    def iter_informative_lines(self):
+        for app, name in zip(self._column(self.t_app), self._column(self.t_name)):
+            yield f'App Name: {app} Name: {name}'
+
+    def iter_scrollable_lines(self):
+        rows = zip(self._column(self.s_app), self._column(self.s_type), self._column(self.s_name),
+                   self.s_x, self.s_y, self.s_flags)
+        for index, (app, control_type, name, x, y, flags) in enumerate(rows, len(self.i_name)):
+            yield (f'Label: {index} App Name: {app} ControlType: {control_type} Control Name: {name} '
+                   f'Cordinates: ({x},{y}) '
+                   f'Horizontal Scrollable: {bool(flags & self.HORIZONTAL)} '
+                   f'Vertical Scrollable: {bool(flags & self.VERTICAL)}')
+
+    @staticmethod
+    def write_lines(lines, out, chunk_size=CHUNK_SIZE):
+        """Write lines to a text stream in bounded chunks instead of one big list"""
+        lines = iter(lines)
+        separator = ''
+        while True:
+            chunk = list(islice(lines, chunk_size))
+            if not chunk:
+                break
+            out.write(separator)
+            out.write('\n'.join(chunk))
+            separator = '\n'
+
+    def interactive_elements_to_string(self):
+        out = io.StringIO()
+        self.write_lines(self.iter_interactive_lines(), out)
+        return out.getvalue()
+
+    def informative_elements_to_string(self):
+        out = io.StringIO()
+        self.write_lines(self.iter_informative_lines(), out)
+        return out.getvalue()
+
+    def scrollable_elements_to_string(self):
+        out = io.StringIO()
+        self.write_lines(self.iter_scrollable_lines(), out)
+        return out.getvalue()
+
+
+class TreeStateView:
+    """
+    The CompactTree row interface read straight from a src.desktop TreeState.
+
+    State-Tool formats the snapshot it already has through this view instead
+    of converting it, so no second copy of a large tree is built per call.
+    Verbose text comes from the TreeState's own formatters.
+    """
+
+    __slots__ = ('tree_state',)
+
+    def __init__(self, tree_state):
+        self.tree_state = tree_state
+
+    @property
+    def interactive_count(self):
+        return len(self.tree_state.interactive_nodes)
+
+    @property
+    def informative_count(self):
+        return len(self.tree_state.informative_nodes)
+
+    @property
+    def scrollable_count(self):
+        return len(self.tree_state.scrollable_nodes)
+
+    def iter_interactive(self):
+        for node in self.tree_state.interactive_nodes:
+            yield node.app_name, node.control_type, node.name, node.shortcut, node.center.x, node.center.y
+
+    def iter_informative(self):
+        for node in self.tree_state.informative_nodes:
+            yield node.app_name, node.name
+
+    def iter_scrollable(self):
+        for node in self.tree_state.scrollable_nodes:
+            yield (node.app_name, node.control_type, node.name, node.center.x, node.center.y,
+                   node.horizontal_scrollable, node.vertical_scrollable)
+
+    def interactive_elements_to_string(self):
+        return self.tree_state.interactive_elements_to_string()
+
+    def informative_elements_to_string(self):
+        return self.tree_state.informative_elements_to_string()
+
+    def scrollable_elements_to_string(self):
+        return self.tree_state.scrollable_elements_to_string()
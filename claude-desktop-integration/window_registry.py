@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Window Registry
+Tracks top-level window create/destroy/retitle events with a title index and new-window waits
+"""
+
+import asyncio
+import os
+import threading
+import time
+from dataclasses import dataclass
+from difflib import get_close_matches
+
+POLL_INTERVAL = 0.25
+
+
+@dataclass(frozen=True)
+class WindowInfo:
+    handle: int
+    title: str
+
+
+def enumerate_windows():
+    """Visible titled top-level windows as (handle, title) pairs"""
+    import pygetwindow as gw
+    return [(window._hWnd, window.title) for window in gw.getAllWindows() if window.visible and window.title]
+
+
+def normalize(title):
+    return ' '.join(title.lower().split())
+
+
+class WindowRegistry:
+    """
+    Live handle -> title map with a normalized title -> handles index.
+
+    On Windows a SetWinEventHook thread applies show/hide/destroy/name-change
+    events as they happen. Elsewhere, or if the hook cannot be installed,
+    the registry diffs cheap window enumerations, either from a background
+    poller (start()) or on demand before each lookup.
+    """
+
+    def __init__(self, enumerate_windows=enumerate_windows, poll_interval=POLL_INTERVAL):
+        self.enumerate_windows = enumerate_windows
+        self.poll_interval = poll_interval
+        self.windows = {}
+        self.titles = {}
+        self.mode = 'on-demand'
+        self._condition = threading.Condition()
+        self._listeners = []
+        self._thread = None
+        self._stop = threading.Event()
+        self._hook = None
+        self.poll()
+
+    # Index maintenance
+
+    def _set(self, handle, title):
+        """Apply one change; returns the event name or None. Caller holds the condition."""
+        old = self.windows.get(handle)
+        if old == title:
+            return None
+        if old is not None:
+            handles = self.titles.get(normalize(old))
+            if handles:
+                handles.discard(handle)
+                if not handles:
+                    del self.titles[normalize(old)]
+        if title is None:
+            del self.windows[handle]
+            return 'destroyed'
+        self.windows[handle] = title
+        self.titles.setdefault(normalize(title), set()).add(handle)
+        return 'created' if old is None else 'retitled'
+
+    def apply(self, handle, title):
+        """Record that handle now has title (None when it went away) and wake waiters"""
+        with self._condition:
+            event = self._set(handle, title)
+            if event:
+                self._condition.notify_all()
+        if event:
+            for listener in list(self._listeners):
+                listener(event, WindowInfo(handle, title or ''))
+        return event
+
+    def poll(self):
+        """Diff a fresh enumeration against the registry in O(n + m)"""
+        current = dict(self.enumerate_windows())
+        events = []
+        for handle in [handle for handle in self.windows if handle not in current]:
+            events.append((self.apply(handle, None), handle))
+        for handle, title in current.items():
+            event = self.apply(handle, title)
+            if event:
+                events.append((event, handle))
+        return events
+
+    def subscribe(self, listener):
+        """listener(event, WindowInfo) for 'created', 'destroyed' and 'retitled'"""
+        self._listeners.append(listener)
+
+    def _sync(self):
+        if self.mode == 'on-demand':
+            self.poll()
+
+    # Lookup
+
+    def snapshot(self):
+        self._sync()
+        with self._condition:
+            return dict(self.windows)
+
+    def find_all(self, pattern, limit=5):
+        """Windows matching pattern: exact title, then substring, then fuzzy"""
+        self._sync()
+        query = normalize(pattern)
+        with self._condition:
+            titles = dict(self.titles)
+            windows = dict(self.windows)
+        ranked = []
+        if query in titles:
+            ranked.append(query)
+        ranked.extend(sorted((title for title in titles if query in title and title != query), key=len))
+        if len(ranked) < limit:
+            ranked.extend(title for title in get_close_matches(query, list(titles), n=limit, cutoff=0.6) if title not in ranked)
+        matches = []
+        for title in ranked:
+            matches.extend(WindowInfo(handle, windows[handle]) for handle in sorted(titles[title]))
+        return matches[:limit]
+
+    def find(self, pattern):
+        matches = self.find_all(pattern, limit=1)
+        return matches[0] if matches else None
+
+    # Waiting
+
+    def wait_for_new_window_blocking(self, pattern=None, timeout=10.0, baseline=None, new_only=False):
+        """
+        Block until a window that is not in baseline (default: the current
+        windows) appears, or a baseline window gets a new title, optionally
+        matching pattern. With new_only, retitled baseline windows (a chat
+        or document switching its caption) don't count. Returns its
+        WindowInfo or None on timeout.
+        """
+        baseline = dict(self.snapshot() if baseline is None else baseline)
+        query = normalize(pattern) if pattern else None
+        deadline = time.monotonic() + timeout
+
+        def new_window():
+            for handle, title in self.windows.items():
+                if new_only and handle in baseline:
+                    continue
+                if baseline.get(handle) != title and (query is None or query in normalize(title)):
+                    return WindowInfo(handle, title)
+            return None
+
+        while True:
+            with self._condition:
+                match = new_window()
+                remaining = deadline - time.monotonic()
+                if match or remaining <= 0:
+                    return match
+                if self.mode != 'on-demand':
+                    self._condition.wait(remaining)
+                    continue
+            time.sleep(min(self.poll_interval, remaining))
+            self.poll()
+
+    async def wait_for_new_window(self, pattern=None, timeout=10.0, baseline=None, new_only=False):
+        """Awaitable wait_for_new_window_blocking"""
+        if baseline is None:
+            baseline = self.snapshot()
+        return await asyncio.to_thread(self.wait_for_new_window_blocking, pattern, timeout, baseline, new_only)
+
+    # Background tracking
+
+    def start(self):
+        """Track windows in the background: WinEvent hook on Windows, polling elsewhere"""
+        if self._thread:
+            return self.mode
+        self._stop.clear()
+        ready = threading.Event()
+        target = self._run_hook if os.name == 'nt' else self._run_poller
+        self._thread = threading.Thread(target=target, args=(ready,), name='window-registry', daemon=True)
+        self._thread.start()
+        ready.wait(5)
+        return self.mode
+
+    def stop(self):
+        self._stop.set()
+        if self._hook:
+            self._hook.stop()
+        if self._thread:
+            self._thread.join(timeout=2)
+        self._thread = None
+        self.mode = 'on-demand'
+
+    def _run_poller(self, ready):
+        self.mode = 'polling'
+        ready.set()
+        while not self._stop.wait(self.poll_interval):
+            self.poll()
+
+    def _run_hook(self, ready):
+        try:
+            self._hook = WinEventHook(self)
+        except OSError:
+            self._run_poller(ready)
+            return
+        self.mode = 'events'
+        self.poll()  # Catch anything that changed before the hook was installed
+        ready.set()
+        self._hook.run()
+
+
+class WinEventHook:
+    """Out-of-context SetWinEventHook feeding a WindowRegistry; run() pumps messages"""
+
+    EVENT_OBJECT_DESTROY = 0x8001
+    EVENT_OBJECT_SHOW = 0x8002
+    EVENT_OBJECT_HIDE = 0x8003
+    EVENT_OBJECT_NAMECHANGE = 0x800C
+    OBJID_WINDOW = 0
+    GA_ROOT = 2
+    WM_QUIT = 0x0012
+
+    def __init__(self, registry):
+        import ctypes
+        from ctypes import wintypes
+
+        self.ctypes, self.wintypes = ctypes, wintypes
+        self.user32 = ctypes.windll.user32
+        self.kernel32 = ctypes.windll.kernel32
+        self.registry = registry
+        self.thread_id = self.kernel32.GetCurrentThreadId()
+        prototype = ctypes.WINFUNCTYPE(None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                                       wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD)
+        self.user32.SetWinEventHook.restype = wintypes.HANDLE
+        self._callback = prototype(self._on_event)  # Keep a reference or the hook crashes
+        self.handle = self.user32.SetWinEventHook(self.EVENT_OBJECT_DESTROY, self.EVENT_OBJECT_NAMECHANGE,
+                                                  None, self._callback, 0, 0, 0)
+        if not self.handle:
+            raise OSError('SetWinEventHook failed')
+
+    def _title(self, hwnd):
+        length = self.user32.GetWindowTextLengthW(hwnd)
+        buffer = self.ctypes.create_unicode_buffer(length + 1)
+        self.user32.GetWindowTextW(hwnd, buffer, length + 1)
+        return buffer.value
+
+    def _on_event(self, hook, event, hwnd, id_object, id_child, thread, time_ms):
+        if id_object != self.OBJID_WINDOW or id_child != 0 or not hwnd:
+            return
+        if event in (self.EVENT_OBJECT_DESTROY, self.EVENT_OBJECT_HIDE):
+            if hwnd in self.registry.windows:
+                self.registry.apply(hwnd, None)
+            return
+        if event not in (self.EVENT_OBJECT_SHOW, self.EVENT_OBJECT_NAMECHANGE):
+            return
+        if self.user32.GetAncestor(hwnd, self.GA_ROOT) != hwnd:
+            return
+        title = self._title(hwnd)
+        if self.user32.IsWindowVisible(hwnd) and title:
+            self.registry.apply(hwnd, title)
+        elif hwnd in self.registry.windows:
+            self.registry.apply(hwnd, None)
+
+    def run(self):
+        msg = self.wintypes.MSG()
+        while self.user32.GetMessageW(self.ctypes.byref(msg), None, 0, 0) > 0:
+            self.user32.TranslateMessage(self.ctypes.byref(msg))
+            self.user32.DispatchMessageW(self.ctypes.byref(msg))
+        self.user32.UnhookWinEvent(self.handle)
+
+    def stop(self):
+        self.user32.PostThreadMessageW(self.thread_id, self.WM_QUIT, 0, 0)